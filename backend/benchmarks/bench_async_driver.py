@@ -0,0 +1,68 @@
+"""
+Concurrency benchmark: blocking pymongo calls on the event loop vs. the `AsyncCollection` layer.
+
+A fake collection stands in for MongoDB; each `find_one` blocks its thread for `--query-ms`
+(like a slow query waiting on the network). N requests are fired concurrently and the
+throughput of both paths is printed.
+
+Usage (from the backend directory):
+    python -m benchmarks.bench_async_driver --concurrency 50 --query-ms 50
+"""
+import argparse
+import asyncio
+import time
+
+import anyio
+
+from src.config.database import AsyncCollection
+
+
+class SlowCollection:
+    """A stand-in pymongo collection whose queries block for a fixed time."""
+
+    def __init__(self, query_seconds: float):
+        self.query_seconds = query_seconds
+
+    def find_one(self, *args, **kwargs):
+        time.sleep(self.query_seconds)
+        return {"book_id": "BOOK"}
+
+
+async def run_blocking(collection: SlowCollection, concurrency: int) -> float:
+    async def handler():
+        return collection.find_one({"book_id": "BOOK"})
+
+    started = time.perf_counter()
+    await asyncio.gather(*(handler() for _ in range(concurrency)))
+    return time.perf_counter() - started
+
+
+async def run_async(collection: SlowCollection, concurrency: int, pool_size: int) -> float:
+    async_collection = AsyncCollection(collection, anyio.CapacityLimiter(pool_size))
+
+    async def handler():
+        return await async_collection.find_one({"book_id": "BOOK"})
+
+    started = time.perf_counter()
+    await asyncio.gather(*(handler() for _ in range(concurrency)))
+    return time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--query-ms", type=float, default=50.0)
+    parser.add_argument("--pool-size", type=int, default=50)
+    args = parser.parse_args()
+
+    collection = SlowCollection(args.query_ms / 1000)
+    blocking_seconds = asyncio.run(run_blocking(collection, args.concurrency))
+    async_seconds = asyncio.run(run_async(collection, args.concurrency, args.pool_size))
+
+    print(f"{args.concurrency} concurrent queries of {args.query_ms:.0f} ms each")
+    print(f"  blocking on the loop : {blocking_seconds:7.3f} s  {args.concurrency / blocking_seconds:8.1f} req/s")
+    print(f"  AsyncCollection      : {async_seconds:7.3f} s  {args.concurrency / async_seconds:8.1f} req/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+"""
+Email delivery benchmark: one FastMail session per message (the old `send_email` path) vs. the outbox worker
+sending over pooled SMTP connections.
+
+Both paths deliver the same rendered account-verification emails to a local aiosmtpd sink. The outbox is an
+in-memory stand-in with the same claim/mark interface as `EmailOutboxServices`, so only delivery is measured.
+Emails per second, per-email latency percentiles (enqueue to accepted by the sink) and SMTP sessions
+opened are printed. `--connect-delay` adds a sleep to every new session to model TLS and AUTH round trips.
+
+Requires aiosmtpd (`pip install aiosmtpd`).
+
+Usage (from the backend directory):
+    python -m benchmarks.bench_email_delivery --emails 500 --concurrency 1 4 16 --connect-delay 0.05
+"""
+import argparse
+import asyncio
+import socket
+import statistics
+import time
+
+from aiosmtpd.controller import Controller
+from fastapi_mail import ConnectionConfig, FastMail, MessageSchema, MessageType
+
+from src.config.email_config import SMTPConnectionPool, conf
+from src.config.env_setting import Settings
+from src.services.email_delivery_worker import EmailDeliveryWorker
+
+
+CONTEXT = {"app_name": "Books", "name": "Test User", "activate_url": "http://localhost:3000/activate/abc"}
+
+
+class Sink:
+    """Accepts every message and records when it arrived."""
+
+    def __init__(self, connect_delay: float):
+        self.connect_delay = connect_delay
+        self.received = {}
+        self.sessions = 0
+
+    async def handle_EHLO(self, server, session, envelope, hostname, responses):
+        self.sessions += 1
+        await asyncio.sleep(self.connect_delay)
+        session.host_name = hostname
+        return responses
+
+    async def handle_DATA(self, server, session, envelope):
+        subject = next(line for line in envelope.content.decode().splitlines() if line.startswith("Subject:"))
+        self.received[subject.split()[-1]] = time.perf_counter()
+        return "250 OK"
+
+
+class InMemoryOutbox:
+    """The `EmailOutboxServices` interface over a list."""
+
+    def __init__(self):
+        self.queue = []
+        self.enqueued_at = {}
+
+    def enqueue(self, index: int):
+        message_id = str(index)
+        self.enqueued_at[message_id] = time.perf_counter()
+        self.queue.append({
+            "message_id": message_id, "recipients": ["reader@example.com"], "subject": f"Verify {message_id}",
+            "template_name": "account-verification.html", "context": CONTEXT, "attempts": 1,
+        })
+
+    async def claim_next(self):
+        return self.queue.pop(0) if self.queue else None
+
+    async def mark_sent(self, message: dict):
+        pass
+
+    async def mark_failed(self, message: dict, error: str, permanent: bool = False) -> str:
+        print(f"  delivery failed: {error}")
+        return "failed"
+
+
+def mail_config(port: int) -> ConnectionConfig:
+    return ConnectionConfig(
+        MAIL_USERNAME="", MAIL_PASSWORD="", MAIL_FROM="noreply@example.com", MAIL_FROM_NAME="Books",
+        MAIL_PORT=port, MAIL_SERVER="127.0.0.1", MAIL_STARTTLS=False, MAIL_SSL_TLS=False,
+        USE_CREDENTIALS=False, VALIDATE_CERTS=False,
+        TEMPLATE_FOLDER=conf.TEMPLATE_FOLDER,
+    )
+
+
+async def run_fastmail(config: ConnectionConfig, emails: int, concurrency: int, enqueued_at: dict):
+    """The old path: a new FastMail and SMTP session for every message, `concurrency` at a time."""
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def send(index: int):
+        async with semaphore:
+            message = MessageSchema(subject=f"Verify {index}", recipients=["reader@example.com"], template_body=CONTEXT, subtype=MessageType.html)
+            await FastMail(config).send_message(message, template_name="account-verification.html")
+
+    for index in range(emails):
+        enqueued_at[str(index)] = time.perf_counter()
+    await asyncio.gather(*(send(index) for index in range(emails)))
+
+
+async def run_worker(config: ConnectionConfig, emails: int, concurrency: int, enqueued_at: dict):
+    """The outbox worker: `concurrency` consumers sharing as many pooled SMTP sessions."""
+    settings = Settings()
+    settings.EMAIL_DELIVERY_CONCURRENCY = concurrency
+    outbox = InMemoryOutbox()
+    worker = EmailDeliveryWorker(settings, outbox, SMTPConnectionPool(config, max_size=concurrency))
+
+    worker.start()
+    for index in range(emails):
+        outbox.enqueue(index)
+    worker.notify()
+    while worker.sent + worker.failed < emails:
+        await asyncio.sleep(0.005)
+    await worker.stop()
+    enqueued_at.update(outbox.enqueued_at)
+
+
+def report(name: str, sink: Sink, enqueued_at: dict, started: float):
+    elapsed = max(sink.received.values()) - started
+    latencies = sorted((sink.received[message_id] - enqueued_at[message_id]) * 1000 for message_id in sink.received)
+    quantiles = statistics.quantiles(latencies, n=100)
+    print(
+        f"  {name:22s} {len(sink.received) / elapsed:9.1f} emails/s   p50 {quantiles[49]:8.1f} ms   "
+        f"p99 {quantiles[98]:8.1f} ms   sessions {sink.sessions}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--emails", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 16])
+    parser.add_argument("--connect-delay", type=float, default=0.05, help="Seconds added to every new SMTP session.")
+    args = parser.parse_args()
+
+    for concurrency in args.concurrency:
+        print(f"{args.emails} emails, concurrency {concurrency}")
+        for name, runner in (("FastMail per message", run_fastmail), ("outbox worker (pooled)", run_worker)):
+            with socket.socket() as probe:
+                probe.bind(("127.0.0.1", 0))
+                port = probe.getsockname()[1]
+            sink = Sink(args.connect_delay)
+            controller = Controller(sink, hostname="127.0.0.1", port=port)
+            controller.start()
+            try:
+                enqueued_at = {}
+                started = time.perf_counter()
+                asyncio.run(runner(mail_config(port), args.emails, concurrency, enqueued_at))
+                report(name, sink, enqueued_at, started)
+            finally:
+                controller.stop()
+
+
+if __name__ == "__main__":
+    main()
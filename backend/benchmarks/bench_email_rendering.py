@@ -0,0 +1,81 @@
+"""
+Email rendering benchmark: fastapi-mail's per-message environment vs. a cached Jinja environment vs. the
+pre-rendered segments of `EmailTemplateRenderer`.
+
+Each template is rendered for a stream of distinct users (different `name` and `activate_url`/`login_url`,
+same `app_name`), the way a signup burst renders them. Renders per second are printed per template.
+
+Usage (from the backend directory):
+    python -m benchmarks.bench_email_rendering --renders 20000
+"""
+import argparse
+import tempfile
+import time
+
+from src.config.email_config import conf
+from src.utils.email_template_renderer import EmailTemplateRenderer
+
+
+TEMPLATES = {
+    "account-verification.html": {"app_name": "Books"},
+    "account-verification-confirmation.html": {"app_name": "Books"},
+    "password-reset.html": {"app_name": "Books"},
+    "password-reset-confirmation.html": {"app_name": "Books", "support_team_email": "help@example.com"},
+}
+
+
+def make_contexts(static_context: dict, count: int) -> list:
+    return [
+        {
+            **static_context,
+            "name": f"User {index}",
+            "activate_url": f"http://localhost:3000/activate/{index:020d}",
+            "login_url": "http://localhost:3000/login",
+        }
+        for index in range(count)
+    ]
+
+
+def render_fastapi_mail(template_name: str, context: dict) -> str:
+    # What FastMail.send_message does for every message
+    return conf.template_engine().get_template(template_name).render(**context)
+
+
+def make_cached_environment():
+    environment = conf.template_engine()
+    return lambda template_name, context: environment.get_template(template_name).render(**context)
+
+
+def make_segments_renderer(cache_dir: str):
+    renderer = EmailTemplateRenderer(conf.TEMPLATE_FOLDER, cache_dir)
+    renderer.load()
+    return renderer.render
+
+
+def measure(render, template_name: str, contexts: list) -> float:
+    render(template_name, contexts[0])
+    started = time.perf_counter()
+    for context in contexts:
+        render(template_name, context)
+    return len(contexts) / (time.perf_counter() - started)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--renders", type=int, default=20000, help="Renders per template and strategy.")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        strategies = (
+            ("fastapi-mail (env per message)", render_fastapi_mail, max(args.renders // 50, 100)),
+            ("cached Jinja environment", make_cached_environment(), args.renders),
+            ("pre-rendered segments", make_segments_renderer(cache_dir), args.renders),
+        )
+        for template_name, static_context in TEMPLATES.items():
+            print(template_name)
+            for name, render, renders in strategies:
+                print(f"  {name:32s} {measure(render, template_name, make_contexts(static_context, renders)):12,.0f} renders/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+ID generation benchmark: `generate_unique_key` (20 `secrets.choice` calls per ID) against the sortable IDs of
+`src.utils.id_generator`, one at a time and in batches.
+
+With --uri it also measures insert throughput into a large collection with a unique `book_id` index, once with
+random keys and once with sortable keys. Sortable keys always land on the right edge of the index B-tree, so the
+working set stays small as the collection grows; random keys touch pages all over the index. The difference
+shows once the index no longer fits in the WiredTiger cache, so use a large --documents (or a small
+`--wiredTigerCacheSizeGB` on the server). The scratch database is dropped afterwards.
+
+The insert part requires a MongoDB server (not a mock):
+    docker run --rm -p 27017:27017 mongo:7
+
+Usage (from the backend directory):
+    python -m benchmarks.bench_id_generation --count 100000
+    python -m benchmarks.bench_id_generation --uri mongodb://localhost:27017 --documents 2000000
+"""
+import argparse
+import time
+
+from pymongo import ASCENDING, MongoClient
+
+from src.utils.generate_unique_key import generate_unique_key
+from src.utils.id_generator import SortableIdGenerator
+
+
+def rate(label: str, count: int, generate) -> float:
+    started = time.perf_counter()
+    generate(count)
+    elapsed = time.perf_counter() - started
+    print(f"{label:28s} {count / elapsed:12,.0f} ids/s  ({elapsed / count * 1e6:6.2f} us/id)")
+    return elapsed
+
+
+def bench_generation(count: int, batch_size: int):
+    generator = SortableIdGenerator()
+
+    def batched(total: int):
+        for start in range(0, total, batch_size):
+            generator.generate_batch(min(batch_size, total - start))
+
+    rate("generate_unique_key", count, lambda total: [generate_unique_key() for _ in range(total)])
+    rate("sortable generate", count, lambda total: [generator.generate() for _ in range(total)])
+    rate(f"sortable batch of {batch_size}", count, batched)
+
+
+def bench_inserts(uri: str, db_name: str, documents: int, batch_size: int):
+    generator = SortableIdGenerator()
+    strategies = (
+        ("random keys", lambda count: [generate_unique_key() for _ in range(count)]),
+        ("sortable keys", generator.generate_batch),
+    )
+    client = MongoClient(uri)
+    try:
+        for label, make_ids in strategies:
+            client.drop_database(db_name)
+            collection = client[db_name]["books"]
+            collection.create_index([("book_id", ASCENDING)], unique=True)
+
+            print(f"{label}: inserting {documents:,d} documents in batches of {batch_size}")
+            started = last_report = time.perf_counter()
+            for start in range(0, documents, batch_size):
+                ids = make_ids(min(batch_size, documents - start))
+                collection.insert_many([{"book_id": book_id, "user_id": "BENCHUSER00000000001"} for book_id in ids], ordered=False)
+                now = time.perf_counter()
+                if now - last_report >= 10:
+                    print(f"  {start + len(ids):12,d} documents  {(start + len(ids)) / (now - started):10,.0f} docs/s overall")
+                    last_report = now
+            elapsed = time.perf_counter() - started
+            index_size = client[db_name].command("collstats", "books")["indexSizes"]["book_id_1"]
+            print(f"{label:14s} {documents / elapsed:10,.0f} docs/s  book_id index {index_size / 2**20:8.1f} MiB")
+    finally:
+        client.drop_database(db_name)
+        client.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--count", type=int, default=100000, help="IDs generated per strategy.")
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--uri", help="Also benchmark inserts against this MongoDB.")
+    parser.add_argument("--db", default="books_store_bench_ids")
+    parser.add_argument("--documents", type=int, default=1000000, help="Documents inserted per strategy.")
+    args = parser.parse_args()
+
+    bench_generation(args.count, args.batch_size)
+    if args.uri:
+        bench_inserts(args.uri, args.db, args.documents, args.batch_size)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+Serialization benchmark for book listings: stdlib JSONResponse vs. ORJSONResponse vs. pydantic-core.
+
+For each list size the full `/all-books` response body is built from stored documents (including the
+`all_books_data` copy) and encoded; time per response and body size are printed.
+
+Usage (from the backend directory):
+    python -m benchmarks.bench_json_encoding --sizes 10 1000 50000
+"""
+import argparse
+import time
+
+from fastapi.responses import JSONResponse, ORJSONResponse
+
+from src.schemas.book_schema import BookListResponse
+from src.serializers.book_serializer import all_books_data
+
+
+def make_books(count: int) -> list:
+    return [
+        {
+            "_id": f"object-id-{index}",
+            "user_id": "QSGFEHJ4875YKFBKJHFK",
+            "book_id": f"BOOK{index:016d}",
+            "category": "Fiction",
+            "book_title": f"The Book Number {index}",
+            "book_author": "Jane Author",
+            "book_price": 10.5 + index % 100,
+            "publisher": "Publisher House",
+            "published_date": "2020-01-01",
+            "page_count": 100 + index % 500,
+            "language": "English",
+            "book_rating": 4.5,
+            "book_image": f"https://example.com/images/{index}.png",
+            "created_at": "2024-01-01 00:00:00.000000",
+            "updated_at": "2024-01-01 00:00:00.000000",
+        }
+        for index in range(count)
+    ]
+
+
+def encode_stdlib(books: list) -> bytes:
+    content = {"status": "success", "message": "All the books fetched successfully.", "books": all_books_data(books), "has_more": False, "next_cursor": None}
+    return JSONResponse(content=content).body
+
+
+def encode_orjson(books: list) -> bytes:
+    content = {"status": "success", "message": "All the books fetched successfully.", "books": all_books_data(books), "has_more": False, "next_cursor": None}
+    return ORJSONResponse(content=content).body
+
+
+def encode_pydantic(books: list) -> bytes:
+    response = BookListResponse(status="success", message="All the books fetched successfully.", books=all_books_data(books), has_more=False)
+    return response.model_dump_json().encode("utf-8")
+
+
+def measure(encoder, books: list, repeat: int):
+    started = time.perf_counter()
+    for _ in range(repeat):
+        body = encoder(books)
+    return (time.perf_counter() - started) / repeat * 1000, len(body)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 1000, 50000])
+    args = parser.parse_args()
+
+    for size in args.sizes:
+        books = make_books(size)
+        repeat = max(3, 20000 // size)
+        print(f"{size} books")
+        for name, encoder in (("JSONResponse (stdlib)", encode_stdlib), ("ORJSONResponse", encode_orjson), ("pydantic model_dump_json", encode_pydantic)):
+            milliseconds, size_bytes = measure(encoder, books, repeat)
+            print(f"  {name:26s} {milliseconds:10.3f} ms   {size_bytes:12,d} bytes")
+
+
+if __name__ == "__main__":
+    main()
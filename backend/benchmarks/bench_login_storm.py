@@ -0,0 +1,65 @@
+"""
+Book-read latency during a login storm: bcrypt on the event loop vs. the password hashing pool.
+
+A "book read" is simulated as a coroutine that awaits a 5 ms I/O wait; its latency is measured while
+`--logins` bcrypt verifications run concurrently, first inline on the event loop (the old behaviour)
+and then through `PasswordManager.verify_password_async`.
+
+Usage (from the backend directory):
+    python -m benchmarks.bench_login_storm --logins 40 --rounds 10 --workers 4
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+import bcrypt
+
+from src.config.security import PasswordManager, PasswordHashingPool
+import src.config.security as security
+
+
+async def book_reads(stop: asyncio.Event) -> list:
+    samples = []
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(0.005)
+        samples.append((time.perf_counter() - started) * 1000)
+    return samples
+
+
+async def storm(verify, logins: int, password: str, hashed_password: str) -> list:
+    stop = asyncio.Event()
+    reader = asyncio.create_task(book_reads(stop))
+    await asyncio.sleep(0.02)
+    await asyncio.gather(*(verify(password, hashed_password) for _ in range(logins)))
+    stop.set()
+    return await reader
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--logins", type=int, default=40)
+    parser.add_argument("--rounds", type=int, default=10, help="bcrypt cost factor used for the test hash")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--executor", choices=["thread", "process"], default="thread")
+    args = parser.parse_args()
+
+    password = "StrongP@ssw0rd"
+    hashed_password = bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt(rounds=args.rounds)).decode("utf-8")
+
+    async def inline_verify(password, hashed_password):
+        return PasswordManager.verify_password(password, hashed_password)
+
+    security.password_hashing_pool = PasswordHashingPool(args.executor, args.workers)
+    inline_samples = asyncio.run(storm(inline_verify, args.logins, password, hashed_password))
+    pooled_samples = asyncio.run(storm(PasswordManager.verify_password_async, args.logins, password, hashed_password))
+
+    for name, samples in (("bcrypt on the event loop", inline_samples), ("password hashing pool", pooled_samples)):
+        print(f"{name:26s} book reads {len(samples):5d}   p50 {statistics.median(samples):8.2f} ms   max {max(samples):8.2f} ms")
+    print(f"pool stats: {security.password_hashing_pool.stats()}")
+    security.password_hashing_pool.shutdown()
+
+
+if __name__ == "__main__":
+    main()
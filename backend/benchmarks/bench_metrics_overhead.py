@@ -0,0 +1,113 @@
+"""
+Per-request cost of the metrics subsystem.
+
+Calls a minimal FastAPI app in-process over ASGI (no sockets, so the difference is the instrumentation itself),
+once bare and once wrapped in `MetricsMiddleware`, and times the per-event cost of the MongoDB command listener
+and of a JWT timing observation. Exits non-zero when the middleware plus one listened MongoDB command exceed
+--budget-us microseconds per request, so it can gate a CI job.
+
+Usage (from the backend directory):
+    python -m benchmarks.bench_metrics_overhead --requests 20000 --budget-us 50
+"""
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from datetime import timedelta
+
+from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
+from pymongo.monitoring import CommandStartedEvent, CommandSucceededEvent
+
+from src.config.metrics import JWT_DURATION, MetricsMiddleware, MongoCommandMetrics
+
+
+def make_app(instrumented: bool):
+    app = FastAPI(default_response_class=ORJSONResponse)
+
+    @app.get("/api/v1/book/one-book/{book_id}")
+    async def one_book(book_id: str):
+        return {"book_id": book_id}
+
+    return MetricsMiddleware(app) if instrumented else app
+
+
+async def call(app, path: str):
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET", "scheme": "http",
+        "path": path, "raw_path": path.encode(), "query_string": b"", "root_path": "", "headers": [],
+        "client": ("127.0.0.1", 12345), "server": ("127.0.0.1", 8000),
+    }
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        pass
+
+    await app(scope, receive, send)
+
+
+async def time_requests(app, count: int) -> float:
+    for index in range(200):
+        await call(app, f"/api/v1/book/one-book/WARMUP{index}")
+    started = time.perf_counter()
+    for index in range(count):
+        await call(app, f"/api/v1/book/one-book/BOOK{index}")
+    return (time.perf_counter() - started) / count * 1e6
+
+
+def time_listener(count: int) -> float:
+    listener = MongoCommandMetrics()
+    command = {"find": "books", "filter": {"user_id": "USER"}}
+    started_events = [CommandStartedEvent(command, "db", index, ("localhost", 27017), index) for index in range(count)]
+    succeeded_events = [CommandSucceededEvent(timedelta(microseconds=800), {"ok": 1}, "find", index, ("localhost", 27017), index) for index in range(count)]
+    started = time.perf_counter()
+    for started_event, succeeded_event in zip(started_events, succeeded_events):
+        listener.started(started_event)
+        listener.succeeded(succeeded_event)
+    return (time.perf_counter() - started) / count * 1e6
+
+
+def time_observation(count: int) -> float:
+    started = time.perf_counter()
+    for _ in range(count):
+        with JWT_DURATION.labels("decode").time():
+            pass
+    return (time.perf_counter() - started) / count * 1e6
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per variant; the median is reported.")
+    parser.add_argument("--budget-us", type=float, default=50.0, help="Allowed overhead per request in microseconds.")
+    args = parser.parse_args()
+
+    bare, instrumented = make_app(False), make_app(True)
+    bare_runs, instrumented_runs = [], []
+    for _ in range(args.repeat):
+        # Interleaved so drift (CPU frequency, GC) hits both variants alike
+        bare_runs.append(asyncio.run(time_requests(bare, args.requests)))
+        instrumented_runs.append(asyncio.run(time_requests(instrumented, args.requests)))
+    bare_us, instrumented_us = statistics.median(bare_runs), statistics.median(instrumented_runs)
+    middleware_us = instrumented_us - bare_us
+    listener_us = time_listener(args.requests)
+    observation_us = time_observation(args.requests)
+
+    print(f"request without metrics   {bare_us:8.2f} us")
+    print(f"request with metrics      {instrumented_us:8.2f} us  (+{middleware_us:.2f} us, {middleware_us / bare_us * 100:+.1f}%)")
+    print(f"mongo command listener    {listener_us:8.2f} us per command")
+    print(f"histogram observation     {observation_us:8.2f} us per timed block")
+
+    overhead_us = middleware_us + listener_us
+    print(f"overhead per request      {overhead_us:8.2f} us (middleware + one MongoDB command), budget {args.budget_us:.0f} us")
+    if overhead_us > args.budget_us:
+        print("Over budget.")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
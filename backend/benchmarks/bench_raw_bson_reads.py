@@ -0,0 +1,86 @@
+"""
+Book read benchmark: decoded dicts (`bson.decode` + `all_books_data` + orjson) vs. raw BSON straight to JSON.
+
+Both paths start from the BSON bytes the driver receives for a page of projected books. For each page
+size the time per page, pages per second and the peak memory allocated while building one body
+(tracemalloc) are printed.
+
+Usage (from the backend directory):
+    python -m benchmarks.bench_raw_bson_reads --sizes 1 100 500
+"""
+import argparse
+import time
+import tracemalloc
+
+import bson
+import orjson
+from bson.raw_bson import RawBSONDocument
+
+from src.serializers.book_serializer import all_books_data
+from src.serializers.raw_book_serializer import raw_books_json
+
+
+def make_raw_books(count: int) -> list:
+    return [
+        bson.encode({
+            "user_id": "QSGFEHJ4875YKFBKJHFK",
+            "book_id": f"BOOK{index:016d}",
+            "category": "Fiction",
+            "book_title": f"The Book Number {index}",
+            "book_author": "Jane Author",
+            "book_price": 10.5 + index % 100,
+            "publisher": "Publisher House",
+            "published_date": "2020-01-01",
+            "page_count": 100 + index % 500,
+            "language": "English",
+            "book_rating": 4.5,
+            "book_image": f"https://example.com/images/{index}.png",
+            "created_at": "2024-01-01 00:00:00.000000",
+            "updated_at": "2024-01-01 00:00:00.000000",
+        })
+        for index in range(count)
+    ]
+
+
+def decoded_path(raw_books: list) -> bytes:
+    return orjson.dumps(all_books_data([bson.decode(raw) for raw in raw_books]))
+
+
+def raw_path(raw_books: list) -> bytes:
+    return raw_books_json([RawBSONDocument(raw) for raw in raw_books])
+
+
+def measure_time(builder, raw_books: list, repeat: int) -> float:
+    started = time.perf_counter()
+    for _ in range(repeat):
+        builder(raw_books)
+    return (time.perf_counter() - started) / repeat * 1000
+
+
+def measure_peak_allocation(builder, raw_books: list) -> int:
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    builder(raw_books)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 100, 500])
+    args = parser.parse_args()
+
+    for size in args.sizes:
+        raw_books = make_raw_books(size)
+        assert decoded_path(raw_books) == raw_path(raw_books)
+        repeat = max(3, 50000 // size)
+        print(f"{size} books per page")
+        for name, builder in (("decoded dicts", decoded_path), ("raw BSON", raw_path)):
+            milliseconds = measure_time(builder, raw_books, repeat)
+            peak_bytes = measure_peak_allocation(builder, raw_books)
+            print(f"  {name:14s} {milliseconds:9.3f} ms/page {1000 / milliseconds:12,.0f} pages/s   peak {peak_bytes:12,d} bytes")
+
+
+if __name__ == "__main__":
+    main()
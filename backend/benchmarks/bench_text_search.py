@@ -0,0 +1,122 @@
+"""
+Text search latency benchmark for `/search` at a large per-user catalog.
+
+Seeds a scratch database on a local MongoDB with `--books` books for one user (plus a second user with
+the same amount, so scoping by user_id is exercised), reconciles the declared indexes and times the
+query `BookController.search_books` runs for a rare word, a common word and a multi-word search,
+on the first page and on a deep page. The scratch database is dropped afterwards unless --keep is given.
+
+Requires a MongoDB server (not a mock):
+    docker run --rm -p 27017:27017 mongo:7
+
+Usage (from the backend directory):
+    python -m benchmarks.bench_text_search --uri mongodb://localhost:27017 --books 100000
+"""
+import argparse
+import random
+import statistics
+import time
+
+from pymongo import ASCENDING, MongoClient
+
+from src.config.database_indexes import IndexManager
+from src.controllers.book_controller import BOOK_PROJECTION
+
+
+USER_ID = "BENCHUSER00000000001"
+OTHER_USER_ID = "BENCHUSER00000000002"
+WORDS = [f"word{index}" for index in range(2000)]
+AUTHORS = [f"Author {index}" for index in range(500)]
+PUBLISHERS = [f"Publisher {index}" for index in range(50)]
+
+
+def make_book(user_id: str, index: int, rng: random.Random) -> dict:
+    # Zipf-like word choice: a few words are very common, most are rare
+    title = " ".join(WORDS[min(int(rng.paretovariate(1.0)) - 1, len(WORDS) - 1)] for _ in range(4))
+    return {
+        "user_id": user_id,
+        "book_id": f"{user_id[-1]}BOOK{index:015d}",
+        "category": "Fiction",
+        "book_title": title,
+        "book_author": rng.choice(AUTHORS),
+        "book_price": 10.5,
+        "publisher": rng.choice(PUBLISHERS),
+        "published_date": "2020-01-01",
+        "page_count": 100,
+        "language": "English",
+        "book_rating": 4.5,
+        "book_image": "https://example.com/image.png",
+        "created_at": "2024-01-01 00:00:00",
+        "updated_at": "2024-01-01 00:00:00",
+    }
+
+
+def seed(collection, count: int):
+    rng = random.Random(42)
+    for user_id in (USER_ID, OTHER_USER_ID):
+        batch = []
+        for index in range(count):
+            batch.append(make_book(user_id, index, rng))
+            if len(batch) == 5000:
+                collection.insert_many(batch, ordered=False)
+                batch = []
+        if batch:
+            collection.insert_many(batch, ordered=False)
+
+
+def search(collection, terms: str, limit: int, offset: int) -> list:
+    score = {"$meta": "textScore"}
+    cursor = collection.find(
+        {"user_id": USER_ID, "$text": {"$search": terms}},
+        {**BOOK_PROJECTION, "score": score},
+    ).sort([("score", score), ("book_id", ASCENDING)]).skip(offset).limit(limit + 1)
+    return list(cursor)
+
+
+def percentile(samples: list, fraction: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--uri", default="mongodb://localhost:27017")
+    parser.add_argument("--db", default="books_store_bench_search")
+    parser.add_argument("--books", type=int, default=100000, help="Books per user.")
+    parser.add_argument("--limit", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("--keep", action="store_true", help="Keep the seeded database for another run.")
+    args = parser.parse_args()
+
+    client = MongoClient(args.uri)
+    db = client[args.db]
+    collection = db["books"]
+    try:
+        if collection.estimated_document_count() != args.books * 2:
+            collection.drop()
+            print(f"Seeding {args.books:,d} books per user...")
+            seed(collection, args.books)
+        IndexManager(db).ensure_indexes()
+
+        for label, terms in (("rare word", WORDS[1500]), ("common word", WORDS[0]), ("multi-word", f"{WORDS[3]} {WORDS[40]}")):
+            matches = collection.count_documents({"user_id": USER_ID, "$text": {"$search": terms}})
+            for offset in (0, 10 * args.limit):
+                search(collection, terms, args.limit, offset)
+                samples = []
+                for _ in range(args.repeat):
+                    started = time.perf_counter()
+                    search(collection, terms, args.limit, offset)
+                    samples.append((time.perf_counter() - started) * 1000)
+                print(
+                    f"{label:12s} matches={matches:7,d} offset={offset:5d}  "
+                    f"p50={statistics.median(samples):8.2f} ms  p95={percentile(samples, 0.95):8.2f} ms  "
+                    f"p99={percentile(samples, 0.99):8.2f} ms"
+                )
+    finally:
+        if not args.keep:
+            client.drop_database(args.db)
+        client.close()
+
+
+if __name__ == "__main__":
+    main()
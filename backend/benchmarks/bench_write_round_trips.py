@@ -0,0 +1,118 @@
+"""
+Write-latency benchmark: read-after-write vs. single-round-trip writes in BookController.
+
+A fake collection stands in for MongoDB and charges a simulated network round trip (with jitter)
+per call. The old write paths (insert_one + find_one, update_one + find_one) are timed against the
+current `BookController.add_book` / `update_book`, and p50/p99 latencies are printed with the number of
+round trips per write. Both sides include the `book_stats` upsert every write now makes.
+
+Usage (from the backend directory):
+    python -m benchmarks.bench_write_round_trips --requests 500 --rtt-ms 1.0
+"""
+import argparse
+import random
+import statistics
+import time
+
+import anyio
+from unittest.mock import patch, MagicMock
+
+from src.config.database import AsyncCollection
+from src.controllers.book_controller import BookController
+
+
+class RoundTripCollection:
+    """A stand-in pymongo collection that sleeps one simulated round trip per call."""
+
+    def __init__(self, rtt_seconds: float):
+        self.rtt_seconds = rtt_seconds
+        self.book = None
+        self.round_trips = 0
+
+    def _round_trip(self):
+        self.round_trips += 1
+        time.sleep(random.uniform(0.5, 1.5) * self.rtt_seconds)
+
+    def insert_one(self, document):
+        self._round_trip()
+        self.book = dict(document)
+        return MagicMock(inserted_id="object-id")
+
+    def update_one(self, query, update, **kwargs):
+        self._round_trip()
+        return MagicMock(modified_count=1)
+
+    def find_one(self, query, *args, **kwargs):
+        self._round_trip()
+        return self.book
+
+    def find_one_and_update(self, query, update, **kwargs):
+        self._round_trip()
+        self.book.update(update["$set"])
+        return self.book
+
+
+def percentile(samples: list, fraction: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+async def time_calls(collection: RoundTripCollection, call, requests: int) -> tuple:
+    samples = []
+    round_trips_before = collection.round_trips
+    for _ in range(requests):
+        started = time.perf_counter()
+        await call()
+        samples.append((time.perf_counter() - started) * 1000)
+    return samples, (collection.round_trips - round_trips_before) / requests
+
+
+async def run(requests: int, rtt_seconds: float):
+    collection = RoundTripCollection(rtt_seconds)
+    async_collection = AsyncCollection(collection, anyio.CapacityLimiter(4))
+    payload = {"book_title": "Title", "book_price": 10.0}
+
+    async def stats_upsert():
+        await async_collection.update_one({"user_id": "USER"}, {"$inc": {"book_count": 1}}, upsert=True)
+
+    async def old_add():
+        await async_collection.insert_one({"book_id": "BOOK", **payload})
+        await stats_upsert()
+        await async_collection.find_one({"book_id": "BOOK"})
+
+    async def old_update():
+        await async_collection.update_one({"book_id": "BOOK"}, {"$set": payload})
+        await stats_upsert()
+        await async_collection.find_one({"book_id": "BOOK"})
+
+    with patch.object(BookController, "_get_collection", return_value=async_collection), \
+         patch.object(BookController, "_start_connection"):
+        controller = BookController()
+        await controller.add_book(payload, "USER")
+
+        results = {
+            "add_book (insert + find_one)": await time_calls(collection, old_add, requests),
+            "add_book (insert only)": await time_calls(collection, lambda: controller.add_book(dict(payload), "USER"), requests),
+            "update_book (update + find_one)": await time_calls(collection, old_update, requests),
+            "update_book (find_one_and_update)": await time_calls(
+                collection, lambda: controller.update_book(dict(payload), "USER", "BOOK"), requests,
+            ),
+        }
+
+    for name, (samples, round_trips) in results.items():
+        print(
+            f"{name:36s} p50 {statistics.median(samples):6.2f} ms   p99 {percentile(samples, 0.99):6.2f} ms   "
+            f"{round_trips:.1f} round trips"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--rtt-ms", type=float, default=1.0)
+    args = parser.parse_args()
+    anyio.run(run, args.requests, args.rtt_ms / 1000)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""
+Compare two `loadtest.run` reports route by route: throughput and p50/p95/p99 latency, with the relative change.
+
+Exits non-zero if any route's p95 got slower by more than `--fail-above` percent, so it can gate a CI job.
+
+Usage (from the backend directory):
+    python -m loadtest.compare baseline.json candidate.json --fail-above 10
+"""
+import argparse
+import json
+import sys
+
+
+METRICS = (("throughput_rps", "req/s"), ("p50", "p50 ms"), ("p95", "p95 ms"), ("p99", "p99 ms"))
+
+
+def metric(summary: dict, name: str) -> float:
+    return summary[name] if name == "throughput_rps" else summary["latency_ms"][name]
+
+
+def change(before: float, after: float) -> float:
+    return (after - before) / before * 100 if before else 0.0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("baseline")
+    parser.add_argument("candidate")
+    parser.add_argument("--fail-above", type=float, help="Fail if a route's p95 grew by more than this many percent.")
+    args = parser.parse_args()
+
+    with open(args.baseline) as baseline_file, open(args.candidate) as candidate_file:
+        baseline, candidate = json.load(baseline_file), json.load(candidate_file)
+    print(f"baseline  {baseline['meta']['commit'][:12]}  {baseline['meta']['started_at']}")
+    print(f"candidate {candidate['meta']['commit'][:12]}  {candidate['meta']['started_at']}")
+
+    regressions = []
+    routes = {"(total)": (baseline["total"], candidate["total"])}
+    for route in sorted(set(baseline["routes"]) & set(candidate["routes"])):
+        routes[route] = (baseline["routes"][route], candidate["routes"][route])
+
+    for route, (before, after) in routes.items():
+        print(route)
+        for name, label in METRICS:
+            old, new = metric(before, name), metric(after, name)
+            print(f"  {label:7s} {old:12.2f} -> {new:12.2f}  ({change(old, new):+7.1f}%)")
+        if args.fail_above is not None and change(metric(before, "p95"), metric(after, "p95")) > args.fail_above:
+            regressions.append(route)
+
+    for route in sorted(set(baseline["routes"]) ^ set(candidate["routes"])):
+        print(f"{route}: only in {'baseline' if route in baseline['routes'] else 'candidate'}")
+
+    if regressions:
+        print(f"p95 regressed by more than {args.fail_above}% on: {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,183 @@
+"""
+The processes a load test runs against: a throwaway `mongod`, a local SMTP sink and the app under uvicorn.
+"""
+import email
+import os
+import re
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from email import policy
+from pathlib import Path
+
+import httpx
+from aiosmtpd.controller import Controller
+from pymongo import MongoClient
+
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+# The links the app mails out, e.g. ".../user-auth/account-verify?token=...&email=..."
+_LINK_PATTERN = re.compile(r'href="([^"]*/user-auth/(account-verify|reset-password)\?token=([^"&]+)&(?:amp;)?email=([^"&]+))"')
+
+
+def free_port() -> int:
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        return probe.getsockname()[1]
+
+
+def wait_until(check, timeout: float, what: str):
+    """
+    Poll `check` until it returns a truthy value, or raise after `timeout` seconds.
+    """
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        result = check()
+        if result:
+            return result
+        time.sleep(0.1)
+    raise TimeoutError(f"Timed out after {timeout:.0f}s waiting for {what}.")
+
+
+class MongodProcess:
+    """
+    A `mongod` on a free port with its data in a temporary directory, removed on `stop`.
+    """
+
+    def __init__(self, binary: str = "mongod"):
+        self.binary = shutil.which(binary)
+        if self.binary is None:
+            raise RuntimeError(f"'{binary}' was not found on PATH; install MongoDB or pass --mongo-uri.")
+        self.port = free_port()
+        self.uri = f"mongodb://127.0.0.1:{self.port}"
+        self.dbpath = tempfile.mkdtemp(prefix="books-loadtest-mongo-")
+        self.process = None
+
+    def start(self):
+        self.process = subprocess.Popen(
+            [self.binary, "--dbpath", self.dbpath, "--port", str(self.port), "--bind_ip", "127.0.0.1", "--quiet"],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.STDOUT,
+        )
+        client = MongoClient(self.uri, serverSelectionTimeoutMS=500)
+        try:
+            wait_until(lambda: self._ping(client), 30, "mongod to accept connections")
+        finally:
+            client.close()
+
+    def _ping(self, client: MongoClient) -> bool:
+        if self.process.poll() is not None:
+            raise RuntimeError(f"mongod exited with code {self.process.returncode}.")
+        try:
+            client.admin.command("ping")
+            return True
+        except Exception:
+            return False
+
+    def stop(self):
+        if self.process is not None and self.process.poll() is None:
+            self.process.terminate()
+            try:
+                self.process.wait(timeout=15)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+        shutil.rmtree(self.dbpath, ignore_errors=True)
+
+
+class SMTPSink:
+    """
+    An in-process SMTP server that accepts every email and keeps the account links it contains, per recipient.
+    """
+
+    def __init__(self):
+        self.port = free_port()
+        self.received = 0
+        self._links = {}
+        self._condition = threading.Condition()
+        self._controller = Controller(self, hostname="127.0.0.1", port=self.port)
+
+    async def handle_DATA(self, server, session, envelope):
+        message = email.message_from_bytes(envelope.original_content or envelope.content, policy=policy.default)
+        body = message.get_body(("html", "plain"))
+        html = body.get_content() if body is not None else ""
+        with self._condition:
+            self.received += 1
+            for _, kind, token, recipient in _LINK_PATTERN.findall(html):
+                self._links.setdefault((recipient, kind), []).append(token)
+            self._condition.notify_all()
+        return "250 OK"
+
+    def start(self):
+        self._controller.start()
+
+    def stop(self):
+        self._controller.stop()
+
+    def wait_for_token(self, recipient: str, kind: str = "account-verify", timeout: float = 30) -> str:
+        """
+        Block until an email with a link of this kind reached the recipient, and return the link's token.
+        """
+        deadline = time.monotonic() + timeout
+        with self._condition:
+            while not self._links.get((recipient, kind)):
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise TimeoutError(f"No {kind} email reached {recipient} within {timeout:.0f}s.")
+                self._condition.wait(remaining)
+            return self._links[(recipient, kind)].pop(0)
+
+
+class AppServer:
+    """
+    `main:app` under uvicorn in a subprocess, pointed at the given MongoDB and SMTP sink.
+    """
+
+    def __init__(self, mongo_uri: str, db_name: str, smtp_port: int, workers: int = 1, extra_env: dict = None):
+        self.port = free_port()
+        self.base_url = f"http://127.0.0.1:{self.port}"
+        self.workers = workers
+        self.env = {
+            **os.environ,
+            "MONGO_URI": mongo_uri,
+            "DB_NAME": db_name,
+            "MAIL_SERVER": "127.0.0.1",
+            "MAIL_PORT": str(smtp_port),
+            "MAIL_FROM": "noreply@example.com",
+            "MAIL_STARTTLS": "False",
+            "MAIL_SSL_TLS": "False",
+            "USE_CREDENTIALS": "False",
+            "VALIDATE_CERTS": "False",
+            "EMAIL_OUTBOX_POLL_INTERVAL_SECONDS": "0.2",
+            **(extra_env or {}),
+        }
+        self.process = None
+
+    def start(self):
+        self.process = subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "main:app", "--host", "127.0.0.1", "--port", str(self.port),
+             "--workers", str(self.workers), "--log-level", "warning", "--no-access-log"],
+            cwd=BACKEND_DIR,
+            env=self.env,
+        )
+        wait_until(self._healthy, 60, "the app to report healthy")
+
+    def _healthy(self) -> bool:
+        if self.process.poll() is not None:
+            raise RuntimeError(f"uvicorn exited with code {self.process.returncode}.")
+        try:
+            return httpx.get(f"{self.base_url}/health", timeout=1).status_code == 200
+        except httpx.HTTPError:
+            return False
+
+    def stop(self):
+        if self.process is not None and self.process.poll() is None:
+            self.process.terminate()
+            try:
+                self.process.wait(timeout=15)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
@@ -0,0 +1,89 @@
+"""
+Latency samples per route and the JSON report built from them.
+"""
+import math
+import platform
+import subprocess
+from collections import Counter, defaultdict
+from datetime import datetime
+
+from loadtest.environment import BACKEND_DIR
+
+
+def percentile(sorted_samples: list, q: float) -> float:
+    """
+    Nearest-rank percentile of an ascending list (`q` between 0 and 100).
+    """
+    if not sorted_samples:
+        return 0.0
+    rank = max(math.ceil(q / 100 * len(sorted_samples)), 1)
+    return sorted_samples[rank - 1]
+
+
+class Recorder:
+    """
+    Collects one latency sample per request, keyed by the route template (e.g. "GET /api/v1/book/one-book/{book_id}").
+
+    Samples recorded while `recording` is False (setup and warm-up) are dropped.
+    """
+
+    def __init__(self):
+        self.recording = False
+        self.latencies = defaultdict(list)
+        self.statuses = defaultdict(Counter)
+        self.errors = Counter()
+
+    def record(self, route: str, status_code: int, milliseconds: float, ok: bool):
+        if not self.recording:
+            return
+        self.latencies[route].append(milliseconds)
+        self.statuses[route][str(status_code)] += 1
+        if not ok:
+            self.errors[route] += 1
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], cwd=BACKEND_DIR, capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def route_summary(samples: list, statuses: Counter, errors: int, elapsed: float) -> dict:
+    ordered = sorted(samples)
+    return {
+        "requests": len(ordered),
+        "errors": errors,
+        "throughput_rps": round(len(ordered) / elapsed, 2) if elapsed else 0.0,
+        "latency_ms": {
+            "mean": round(sum(ordered) / len(ordered), 3) if ordered else 0.0,
+            "p50": round(percentile(ordered, 50), 3),
+            "p95": round(percentile(ordered, 95), 3),
+            "p99": round(percentile(ordered, 99), 3),
+            "max": round(ordered[-1], 3) if ordered else 0.0,
+        },
+        "status_codes": dict(sorted(statuses.items())),
+    }
+
+
+def build_report(recorder: Recorder, started_at: datetime, elapsed: float, settings: dict) -> dict:
+    """
+    Summarize the recorded samples: throughput and latency percentiles per route and over all routes.
+    """
+    all_samples = [sample for samples in recorder.latencies.values() for sample in samples]
+    all_statuses = sum(recorder.statuses.values(), Counter())
+    return {
+        "meta": {
+            "commit": git_commit(),
+            "started_at": started_at.isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "duration_seconds": round(elapsed, 3),
+            "settings": settings,
+        },
+        "total": route_summary(all_samples, all_statuses, sum(recorder.errors.values()), elapsed),
+        "routes": {
+            route: route_summary(samples, recorder.statuses[route], recorder.errors[route], elapsed)
+            for route, samples in sorted(recorder.latencies.items())
+        },
+    }
@@ -0,0 +1,91 @@
+"""
+End-to-end load test of `main:app`: boots the app under uvicorn against a throwaway `mongod` and a local SMTP
+sink, drives a request mix with concurrent virtual users and writes throughput and p50/p95/p99 latency per route
+as JSON (including the git commit, so runs can be compared between commits with `loadtest.compare`).
+
+Workloads: "auth" (signup + email verification, login, token refresh), "books" (list, filtered list, get, add,
+update, delete, search, stats over a seeded catalog) and "mixed" (both).
+
+Requires `mongod` on PATH (or `--mongo-uri` pointing at a disposable server) and aiosmtpd.
+
+Usage (from the backend directory):
+    python -m loadtest.run --workload mixed --users 20 --duration 60 --catalog-size 1000 --output results.json
+"""
+import argparse
+import asyncio
+import json
+import sys
+from datetime import datetime, timezone
+
+from pymongo import MongoClient
+
+from loadtest.environment import AppServer, MongodProcess, SMTPSink
+from loadtest.report import build_report
+from loadtest.workloads import WORKLOADS, run_workload
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workload", choices=sorted(WORKLOADS), default="mixed")
+    parser.add_argument("--users", type=int, default=20, help="Concurrent virtual users.")
+    parser.add_argument("--duration", type=float, default=60, help="Measured seconds.")
+    parser.add_argument("--warmup", type=float, default=10, help="Seconds run before measuring.")
+    parser.add_argument("--catalog-size", type=int, default=1000, help="Books seeded per virtual user.")
+    parser.add_argument("--page-size", type=int, default=50)
+    parser.add_argument("--batch-size", type=int, default=500, help="Books per bulk request while seeding.")
+    parser.add_argument("--app-workers", type=int, default=1, help="uvicorn worker processes.")
+    parser.add_argument("--bcrypt-rounds", type=int, help="Override BCRYPT_ROUNDS for the app.")
+    parser.add_argument("--mongo-uri", help="Use this MongoDB instead of starting mongod; the test database is dropped afterwards.")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--output", help="Write the JSON report here instead of stdout.")
+    args = parser.parse_args()
+
+    started_at = datetime.now(timezone.utc)
+    db_name = f"loadtest_{started_at:%Y%m%d%H%M%S}"
+    extra_env = {"BCRYPT_ROUNDS": str(args.bcrypt_rounds)} if args.bcrypt_rounds else {}
+
+    try:
+        mongod = None if args.mongo_uri else MongodProcess()
+    except RuntimeError as e:
+        print(e)
+        return 2
+    sink = SMTPSink()
+    app = None
+    try:
+        if mongod is not None:
+            mongod.start()
+        mongo_uri = args.mongo_uri or mongod.uri
+        sink.start()
+        app = AppServer(mongo_uri, db_name, sink.port, args.app_workers, extra_env)
+        app.start()
+
+        recorder, elapsed = asyncio.run(run_workload(
+            app.base_url, sink, args.workload, args.users, args.duration, args.warmup,
+            args.catalog_size, args.page_size, args.batch_size, args.seed,
+        ))
+    finally:
+        if app is not None:
+            app.stop()
+        sink.stop()
+        if mongod is not None:
+            mongod.stop()
+        elif args.mongo_uri:
+            client = MongoClient(args.mongo_uri)
+            client.drop_database(db_name)
+            client.close()
+
+    settings = {key: value for key, value in vars(args).items() if key not in ("output", "mongo_uri")}
+    report = build_report(recorder, started_at, elapsed, settings)
+    report["meta"]["emails_received"] = sink.received
+    report = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as output:
+            output.write(report + "\n")
+        print(f"Report written to {args.output}")
+    else:
+        print(report)
+    return 0 if recorder.latencies else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,218 @@
+"""
+Virtual users and the request mixes they run.
+
+Each virtual user signs up, verifies its account through the link mailed to the SMTP sink, logs in and seeds its
+own catalog before the measured phase. It then picks operations at random according to the workload's weights
+until the run ends. Listing clients keep the ETags they were given and send them back, like a browser would.
+"""
+import asyncio
+import itertools
+import random
+import time
+
+import httpx
+
+from loadtest.report import Recorder
+
+
+PASSWORD = "LoadT3st!Passw0rd"
+LANGUAGES = ("English", "French", "German", "Spanish", "Hindi")
+TITLE_WORDS = ("river", "shadow", "garden", "empire", "winter", "silent", "journey", "glass", "ember", "harbor")
+
+USER_API = "/api/v1/user"
+BOOK_API = "/api/v1/book"
+
+# Relative weight of each operation in the measured phase
+WORKLOADS = {
+    "auth": {"signup_verify": 1, "login": 4, "refresh": 5},
+    "books": {"list": 40, "list_filtered": 10, "get": 25, "add": 8, "update": 8, "delete": 4, "search": 3, "stats": 2},
+    "mixed": {
+        "signup_verify": 1, "login": 3, "refresh": 4,
+        "list": 30, "list_filtered": 8, "get": 20, "add": 8, "update": 8, "delete": 4, "search": 3, "stats": 2,
+    },
+}
+
+
+def make_book(rng: random.Random) -> dict:
+    words = rng.sample(TITLE_WORDS, 3)
+    return {
+        "category": "Fiction",
+        "book_title": " ".join(word.capitalize() for word in words),
+        "book_author": f"Author {rng.randint(1, 500)}",
+        "book_price": round(rng.uniform(1, 100), 2),
+        "publisher": f"Publisher {rng.randint(1, 50)}",
+        "published_date": f"{rng.randint(1950, 2024)}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+        "page_count": rng.randint(50, 1200),
+        "language": rng.choice(LANGUAGES),
+        "book_rating": round(rng.uniform(1, 5), 1),
+        "book_image": "https://example.com/cover.png",
+    }
+
+
+class VirtualUser:
+    """
+    One simulated client with its own account, tokens and catalog.
+    """
+
+    _emails = itertools.count(1)
+
+    def __init__(self, client: httpx.AsyncClient, recorder: Recorder, sink, run_id: str, rng: random.Random):
+        self.client = client
+        self.recorder = recorder
+        self.sink = sink
+        self.run_id = run_id
+        self.rng = rng
+        self.email = None
+        self.access_token = None
+        self.refresh_token = None
+        self.book_ids = []
+        self.etags = {}
+        self.list_cursor = None
+        self.page_size = 50
+
+    def _new_email(self) -> str:
+        return f"lt-{self.run_id}-{next(self._emails)}@example.com"
+
+    async def request(self, method: str, route: str, path: str, token: str = None, **kwargs) -> httpx.Response:
+        """
+        Send one request and record its latency under `route` (the path template).
+        """
+        headers = kwargs.pop("headers", {})
+        if token:
+            headers["Authorization"] = f"Bearer {token}"
+        started = time.perf_counter()
+        response = await self.client.request(method, path, headers=headers, **kwargs)
+        milliseconds = (time.perf_counter() - started) * 1000
+        self.recorder.record(f"{method} {route}", response.status_code, milliseconds, response.status_code < 400)
+        return response
+
+    # Accounts
+    async def signup_and_verify(self, email: str):
+        response = await self.request("POST", f"{USER_API}/signup", f"{USER_API}/signup", json={"name": "Load Test", "email": email, "password": PASSWORD})
+        response.raise_for_status()
+        token = await asyncio.to_thread(self.sink.wait_for_token, email)
+        route = f"{USER_API}/user-account-verification/{{token}}/{{email}}"
+        response = await self.request("POST", route, f"{USER_API}/user-account-verification/{token}/{email}")
+        response.raise_for_status()
+
+    async def login(self):
+        response = await self.request("POST", f"{USER_API}/login", f"{USER_API}/login", json={"email": self.email, "password": PASSWORD})
+        response.raise_for_status()
+        body = response.json()
+        self.access_token, self.refresh_token = body["jwt_access_token"], body["jwt_refresh_token"]
+
+    async def refresh(self):
+        response = await self.request("POST", f"{USER_API}/renew-access-token", f"{USER_API}/renew-access-token", token=self.refresh_token)
+        if response.status_code == 200:
+            body = response.json()
+            self.access_token, self.refresh_token = body["jwt_access_token"], body["jwt_refresh_token"]
+
+    async def setup(self, catalog_size: int, batch_size: int):
+        """
+        Create, verify and log in the account, then seed `catalog_size` books in bulk requests.
+        """
+        self.email = self._new_email()
+        await self.signup_and_verify(self.email)
+        await self.login()
+        for start in range(0, catalog_size, batch_size):
+            books = [make_book(self.rng) for _ in range(min(batch_size, catalog_size - start))]
+            response = await self.request("POST", f"{BOOK_API}/bulk/add-books", f"{BOOK_API}/bulk/add-books", token=self.access_token, json={"books": books})
+            response.raise_for_status()
+            self.book_ids.extend(result["book"]["book_id"] for result in response.json()["results"] if result["status"] == "created")
+
+    # Operations of the measured phase
+    async def op_signup_verify(self):
+        await self.signup_and_verify(self._new_email())
+
+    async def op_login(self):
+        await self.login()
+
+    async def op_refresh(self):
+        await self.refresh()
+
+    async def _conditional_get(self, route: str, path: str, params: dict) -> httpx.Response:
+        key = (path, tuple(sorted(params.items())))
+        headers = {"If-None-Match": self.etags[key]} if key in self.etags else {}
+        response = await self.request("GET", route, path, token=self.access_token, params=params, headers=headers)
+        if "etag" in response.headers:
+            self.etags[key] = response.headers["etag"]
+        return response
+
+    async def op_list(self):
+        params = {"limit": self.page_size, **({"after": self.list_cursor} if self.list_cursor else {})}
+        response = await self._conditional_get(f"{BOOK_API}/all-books", f"{BOOK_API}/all-books", params)
+        if response.status_code == 200:
+            self.list_cursor = response.json().get("next_cursor")
+
+    async def op_list_filtered(self):
+        params = {"limit": self.page_size, "language": self.rng.choice(LANGUAGES), "sort_by": "book_rating", "order": "desc"}
+        await self._conditional_get(f"{BOOK_API}/all-books (filtered)", f"{BOOK_API}/all-books", params)
+
+    async def op_get(self):
+        if self.book_ids:
+            book_id = self.rng.choice(self.book_ids)
+            await self._conditional_get(f"{BOOK_API}/one-book/{{book_id}}", f"{BOOK_API}/one-book/{book_id}", {})
+
+    async def op_add(self):
+        response = await self.request("POST", f"{BOOK_API}/add-book", f"{BOOK_API}/add-book", token=self.access_token, json=make_book(self.rng))
+        if response.status_code == 201:
+            self.book_ids.append(response.json()["book"]["book_id"])
+
+    async def op_update(self):
+        if self.book_ids:
+            book_id = self.rng.choice(self.book_ids)
+            await self.request("PUT", f"{BOOK_API}/update-book/{{book_id}}", f"{BOOK_API}/update-book/{book_id}", token=self.access_token, json=make_book(self.rng))
+
+    async def op_delete(self):
+        if self.book_ids:
+            book_id = self.book_ids.pop(self.rng.randrange(len(self.book_ids)))
+            await self.request("DELETE", f"{BOOK_API}/delete-book/{{book_id}}", f"{BOOK_API}/delete-book/{book_id}", token=self.access_token)
+
+    async def op_search(self):
+        params = {"q": self.rng.choice(TITLE_WORDS), "limit": self.page_size}
+        await self.request("GET", f"{BOOK_API}/search", f"{BOOK_API}/search", token=self.access_token, params=params)
+
+    async def op_stats(self):
+        await self.request("GET", f"{BOOK_API}/stats", f"{BOOK_API}/stats", token=self.access_token)
+
+    async def run(self, weights: dict, page_size: int, stop_at: float):
+        """
+        Run randomly chosen operations until `stop_at` (a `time.monotonic()` deadline).
+        """
+        self.page_size = page_size
+        operations = list(weights)
+        cumulative = list(itertools.accumulate(weights.values()))
+        while time.monotonic() < stop_at:
+            operation = self.rng.choices(operations, cum_weights=cumulative)[0]
+            try:
+                await getattr(self, f"op_{operation}")()
+            except httpx.HTTPStatusError:
+                # Already recorded as an error response
+                pass
+            except (httpx.HTTPError, TimeoutError) as e:
+                self.recorder.record(f"{operation} (no response)", 0, 0.0, False)
+                print(f"{operation} failed: {e!r}")
+
+
+async def run_workload(base_url: str, sink, workload: str, users: int, duration: float, warmup: float,
+                       catalog_size: int, page_size: int, batch_size: int, seed: int) -> tuple:
+    """
+    Set the virtual users up, then run the workload for `warmup + duration` seconds, recording only after the warm-up.
+
+    Returns:
+        tuple: The `Recorder` and the measured time in seconds.
+    """
+    recorder = Recorder()
+    run_id = f"{int(time.time())}-{seed}"
+    limits = httpx.Limits(max_connections=users, max_keepalive_connections=users)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client:
+        virtual_users = [VirtualUser(client, recorder, sink, run_id, random.Random(seed + index)) for index in range(users)]
+        await asyncio.gather(*(user.setup(catalog_size, batch_size) for user in virtual_users))
+
+        stop_at = time.monotonic() + warmup + duration
+        runners = asyncio.gather(*(user.run(WORKLOADS[workload], page_size, stop_at) for user in virtual_users))
+        await asyncio.sleep(warmup)
+        recorder.recording = True
+        measured_from = time.monotonic()
+        await runners
+        return recorder, time.monotonic() - measured_from
@@ -1,11 +1,49 @@
 import uvicorn
 
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Response, status
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
+from src.config.database import MongoDBConnection
+from src.config.database_indexes import IndexManager
+from src.config.env_setting import Settings
+from src.config.security import password_hashing_pool
+from src.config.response_cache import response_cache
+from src.config.session_cache import session_cache
+from src.config.jwt_token import verified_token_cache
+from src.config.metrics import MetricsMiddleware, render_metrics, stats_collector
+from src.config.email_config import email_template_renderer
+from src.services.email_delivery_worker import email_delivery_worker
 from src.routes.user_route import user_router
 from src.routes.book_route import book_router
 
-app = FastAPI()
+
+Config = Settings()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Create the shared MongoDB connection pool, reconcile indexes, compile the email templates and start the email
+    delivery worker on startup, stop the worker and close the pools on shutdown.
+    """
+    client = MongoDBConnection.create_client_pool(Config.MONGO_URI, Config)
+    if Config.MONGO_ENSURE_INDEXES_ON_STARTUP:
+        try:
+            IndexManager(client[Config.DB_NAME], Config).ensure_indexes()
+        except Exception as e:
+            print(f"Skipping index reconciliation, MongoDB is not reachable: {e}")
+    email_template_renderer.load()
+    if Config.EMAIL_DELIVERY_ENABLED:
+        email_delivery_worker.start()
+    yield
+    await email_delivery_worker.stop()
+    await response_cache.close()
+    password_hashing_pool.shutdown()
+    MongoDBConnection.close_client_pool()
+
+
+app = FastAPI(lifespan=lifespan, default_response_class=ORJSONResponse)
 
 # CORS
 origins = [
@@ -19,8 +57,18 @@ app.add_middleware(
     allow_credentials=True, # Allow cookies
     allow_methods=["*"], # Allow all methods
     allow_headers=["*"], # Allow all headers
+    expose_headers=["ETag"], # Let clients read the validator for conditional requests
 )
 
+if Config.METRICS_ENABLED:
+    # Outermost, so the recorded latency covers every other middleware
+    app.add_middleware(MetricsMiddleware)
+    stats_collector.register("response_cache", response_cache.stats)
+    stats_collector.register("session_cache", session_cache.stats)
+    stats_collector.register("jwt_verify_cache", verified_token_cache.stats)
+    stats_collector.register("password_hashing_pool", password_hashing_pool.stats)
+    stats_collector.register("email_delivery_worker", email_delivery_worker.stats)
+
 app.include_router(user_router, prefix="/api/v1/user", tags=["User"])
 app.include_router(book_router, prefix="/api/v1/book", tags=["Book"])
 
@@ -30,5 +78,26 @@ def root():
     return {"message": "Welcome to FastAPI CRUD Appication!"}
 
 
+@app.get("/health", tags=["Root"])
+def health():
+    """
+    Readiness probe backed by the cached MongoDB health check.
+    """
+    if MongoDBConnection.check_health():
+        return {"status": "ok", "database": "up"}
+    return ORJSONResponse(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, content={"status": "unavailable", "database": "down"})
+
+
+@app.get("/metrics", tags=["Root"], include_in_schema=False)
+def metrics():
+    """
+    Prometheus scrape endpoint (text exposition format). Each worker process reports its own figures.
+    """
+    if not Config.METRICS_ENABLED:
+        return ORJSONResponse(status_code=status.HTTP_404_NOT_FOUND, content={"detail": "Not Found"})
+    body, content_type = render_metrics()
+    return Response(content=body, media_type=content_type)
+
+
 if __name__ == "__main__":
     uvicorn.run(app, host="127.0.0.1", port=8000)
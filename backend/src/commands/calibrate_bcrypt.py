@@ -0,0 +1,55 @@
+"""
+Suggest a bcrypt cost factor (BCRYPT_ROUNDS) for the current machine.
+
+Measures the time to hash a password at increasing cost factors and suggests the highest cost whose
+median hash time stays within the target latency.
+
+Usage (from the backend directory):
+    python -m src.commands.calibrate_bcrypt --target-ms 250
+"""
+import argparse
+import statistics
+import sys
+import time
+
+from src.config.security import PasswordManager
+
+
+def measure_hash_ms(rounds: int, samples: int) -> float:
+    """
+    Return the median time in milliseconds to hash a password at `rounds`.
+    """
+    timings = []
+    for _ in range(samples):
+        started = time.perf_counter()
+        PasswordManager.encode_and_hash_password("Calibrate@1234", rounds)
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Suggest a bcrypt cost factor for a target hash latency.")
+    parser.add_argument("--target-ms", type=float, default=250.0, help="Target time for one hash in milliseconds.")
+    parser.add_argument("--samples", type=int, default=3, help="Hashes measured per cost factor.")
+    parser.add_argument("--min-rounds", type=int, default=10)
+    parser.add_argument("--max-rounds", type=int, default=16)
+    args = parser.parse_args()
+
+    suggested_rounds = None
+    for rounds in range(args.min_rounds, args.max_rounds + 1):
+        hash_ms = measure_hash_ms(rounds, args.samples)
+        print(f"cost {rounds:2d}: {hash_ms:8.1f} ms")
+        if hash_ms > args.target_ms:
+            break
+        suggested_rounds = rounds
+
+    if suggested_rounds is None:
+        print(f"Even cost {args.min_rounds} exceeds {args.target_ms:.0f} ms on this machine.")
+        return 1
+
+    print(f"Suggested: BCRYPT_ROUNDS={suggested_rounds}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
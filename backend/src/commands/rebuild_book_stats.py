@@ -0,0 +1,37 @@
+"""
+Rebuild the per-user book statistics from the books collection.
+
+The stats documents are normally kept up to date with `$inc` deltas on every book mutation. This job
+recomputes them with a `$group` aggregation to repair any drift (e.g. a crash between a book write and
+its stats update), and resets the stats of users who no longer have books. Catalog versions are bumped,
+never reset, so cached listings are revalidated.
+
+Usage (from the backend directory):
+    python -m src.commands.rebuild_book_stats [--user-id USER_ID]
+"""
+import argparse
+import sys
+
+from src.config.database import MongoDBConnection
+from src.config.env_setting import Settings
+from src.services.book_stats_services import BookStatsServices
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Recompute the per-user book statistics from the books.")
+    parser.add_argument("--user-id", help="Only rebuild the stats of this user.")
+    args = parser.parse_args()
+
+    config = Settings()
+    mongo_db_connection = MongoDBConnection(config.MONGO_URI, config.DB_NAME)
+    try:
+        mongo_db_connection.start_connection()
+        written = BookStatsServices().rebuild(mongo_db_connection.db, args.user_id)
+        print(f"Rebuilt stats for {written} user(s).")
+        return 0
+    finally:
+        MongoDBConnection.close_client_pool()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
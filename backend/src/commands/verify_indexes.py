@@ -0,0 +1,46 @@
+"""
+Verify that every controller query is index-backed.
+
+Reconciles the declared indexes (unless --skip-ensure is given), runs explain() on each query in
+`CONTROLLER_QUERIES` and exits with status 1 if any of them falls back to a COLLSCAN.
+
+Usage (from the backend directory):
+    python -m src.commands.verify_indexes
+"""
+import argparse
+import sys
+
+from src.config.database import MongoDBConnection
+from src.config.database_indexes import IndexManager
+from src.config.env_setting import Settings
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Explain every controller query and fail on collection scans.")
+    parser.add_argument("--skip-ensure", action="store_true", help="Do not reconcile indexes before explaining.")
+    args = parser.parse_args()
+
+    config = Settings()
+    mongo_db_connection = MongoDBConnection(config.MONGO_URI, config.DB_NAME)
+    try:
+        mongo_db_connection.start_connection()
+        index_manager = IndexManager(mongo_db_connection.db, config)
+
+        if not args.skip_ensure:
+            for collection_name, report in index_manager.ensure_indexes().items():
+                print(f"{collection_name}: {report}")
+
+        failed = False
+        for result in index_manager.explain_queries():
+            if result["collscan_stages"]:
+                failed = True
+                print(f"COLLSCAN  {result['name']}")
+            else:
+                print(f"ok        {result['name']}")
+        return 1 if failed else 0
+    finally:
+        MongoDBConnection.close_client_pool()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,15 +1,162 @@
+import threading
+import time
+import functools
+
+import anyio
 from pymongo import MongoClient
 from pymongo.server_api import ServerApi
 
+from src.config.env_setting import Settings
+from src.config.metrics import mongo_command_metrics
+
+
+class AsyncCursor:
+    """
+    An awaitable wrapper around a pymongo cursor.
+
+    Cursor modifiers (`sort`, `limit`, ...) are applied directly since they do no I/O. Every call that
+    talks to the server runs in a worker thread so the event loop is never blocked.
+    """
+
+    def __init__(self, cursor, limiter: anyio.CapacityLimiter):
+        self.cursor = cursor
+        self.limiter = limiter
+        self._batch_size = 100
+
+    async def _run(self, func, *args, **kwargs):
+        return await anyio.to_thread.run_sync(functools.partial(func, *args, **kwargs), limiter=self.limiter)
+
+    def sort(self, *args, **kwargs):
+        self.cursor = self.cursor.sort(*args, **kwargs)
+        return self
+
+    def skip(self, skip: int):
+        self.cursor = self.cursor.skip(skip)
+        return self
+
+    def limit(self, limit: int):
+        self.cursor = self.cursor.limit(limit)
+        return self
+
+    def batch_size(self, batch_size: int):
+        self._batch_size = batch_size
+        self.cursor = self.cursor.batch_size(batch_size)
+        return self
+
+    def _next_batch(self) -> list:
+        """
+        Pull up to `batch_size` documents from the underlying cursor (runs in a worker thread).
+        """
+        batch = []
+        for document in self.cursor:
+            batch.append(document)
+            if len(batch) >= self._batch_size:
+                break
+        return batch
+
+    async def to_list(self, length: int = None) -> list:
+        """
+        Exhaust the cursor (or read up to `length` documents) into a list.
+        """
+        if length is not None:
+            self.cursor = self.cursor.limit(length)
+        return await self._run(list, self.cursor)
+
+    async def explain(self) -> dict:
+        return await self._run(self.cursor.explain)
+
+    async def close(self):
+        await self._run(self.cursor.close)
+
+    async def __aiter__(self):
+        """
+        Iterate the cursor one batch per worker-thread round trip.
+        """
+        try:
+            while True:
+                batch = await self._run(self._next_batch)
+                if not batch:
+                    break
+                for document in batch:
+                    yield document
+        finally:
+            await self.close()
+
+
+class AsyncCollection:
+    """
+    An awaitable facade over a pymongo collection.
+
+    Each driver call runs in a worker thread; the number of threads is capped by a shared
+    `CapacityLimiter` sized to the connection pool, so threads never queue for a connection.
+    """
+
+    def __init__(self, collection, limiter: anyio.CapacityLimiter):
+        self.collection = collection
+        self.limiter = limiter
+
+    @property
+    def name(self) -> str:
+        return self.collection.name
+
+    async def _run(self, func, *args, **kwargs):
+        return await anyio.to_thread.run_sync(functools.partial(func, *args, **kwargs), limiter=self.limiter)
+
+    def with_options(self, **kwargs):
+        return AsyncCollection(self.collection.with_options(**kwargs), self.limiter)
+
+    def find(self, *args, **kwargs) -> AsyncCursor:
+        return AsyncCursor(self.collection.find(*args, **kwargs), self.limiter)
+
+    async def find_one(self, *args, **kwargs):
+        return await self._run(self.collection.find_one, *args, **kwargs)
+
+    async def insert_one(self, *args, **kwargs):
+        return await self._run(self.collection.insert_one, *args, **kwargs)
+
+    async def insert_many(self, *args, **kwargs):
+        return await self._run(self.collection.insert_many, *args, **kwargs)
+
+    async def update_one(self, *args, **kwargs):
+        return await self._run(self.collection.update_one, *args, **kwargs)
+
+    async def update_many(self, *args, **kwargs):
+        return await self._run(self.collection.update_many, *args, **kwargs)
+
+    async def delete_one(self, *args, **kwargs):
+        return await self._run(self.collection.delete_one, *args, **kwargs)
+
+    async def delete_many(self, *args, **kwargs):
+        return await self._run(self.collection.delete_many, *args, **kwargs)
+
+    async def find_one_and_update(self, *args, **kwargs):
+        return await self._run(self.collection.find_one_and_update, *args, **kwargs)
+
+    async def find_one_and_delete(self, *args, **kwargs):
+        return await self._run(self.collection.find_one_and_delete, *args, **kwargs)
+
+    async def bulk_write(self, *args, **kwargs):
+        return await self._run(self.collection.bulk_write, *args, **kwargs)
+
+    async def count_documents(self, *args, **kwargs):
+        return await self._run(self.collection.count_documents, *args, **kwargs)
+
+    async def aggregate(self, *args, **kwargs) -> list:
+        return await self._run(lambda: list(self.collection.aggregate(*args, **kwargs)))
+
 
 class MongoDBConnection:
     """
     A class to manage MongoDB connections and handle collection retrieval.
 
+    All instances share one process-wide `MongoClient` (and therefore one connection pool per worker).
+    The pool is created once by `create_client_pool` (called from the FastAPI lifespan hook in `main.py`)
+    and closed by `close_client_pool` on shutdown.
+
     Attributes:
         MONGO_URI (str): The URI for connecting to the MongoDB server.
         DB_NAME (str): The name of the database to connect to.
-        client (MongoClient): The MongoDB client instance.
+        client (MongoClient): The shared MongoDB client instance.
         db (Database): The database instance.
         user_collection (Collection): The users collection.
         refresh_token_collection (Collection): The refresh tokens collection.
@@ -18,6 +165,12 @@ class MongoDBConnection:
         book_collection (Collection): The books collection.
     """
 
+    _shared_client = None
+    _shared_client_lock = threading.Lock()
+    _health_check_interval = 0.0
+    _healthy_at = None
+    _thread_limiter = None
+
     def __init__(self, MONGO_URI: str, DB_NAME: str):
         """
         Initialize the MongoDBConnection instance.
@@ -31,7 +184,7 @@ class MongoDBConnection:
         """
         if not MONGO_URI:
             raise ValueError("MONGO_URI environment variable is not set or is empty.")
-        
+
         self.MONGO_URI = MONGO_URI
         self.DB_NAME = DB_NAME
         self.client = None
@@ -44,27 +197,110 @@ class MongoDBConnection:
         self.user_email_verification_token_collection = None
         self.book_collection = None
 
+    @classmethod
+    def create_client_pool(cls, MONGO_URI: str, config: Settings = None) -> MongoClient:
+        """
+        Create the process-wide MongoDB client if it does not exist yet.
+
+        The client is created lazily by the driver (no connection or ping happens here), the pool
+        limits are taken from `Settings`. With `METRICS_ENABLED` the command latency listener is attached.
+
+        Args:
+            MONGO_URI (str): The URI for connecting to MongoDB.
+            config (Settings): Settings providing the pool limits. Defaults to a fresh `Settings()`.
+
+        Returns:
+            MongoClient: The shared MongoDB client.
+
+        Raises:
+            RuntimeError: If the client cannot be created.
+        """
+        if cls._shared_client is not None:
+            return cls._shared_client
+
+        config = config or Settings()
+        with cls._shared_client_lock:
+            if cls._shared_client is None:
+                try:
+                    cls._thread_limiter = anyio.CapacityLimiter(config.MONGO_MAX_POOL_SIZE)
+                    cls._health_check_interval = config.MONGO_HEALTH_CHECK_INTERVAL_SECONDS
+                    cls._shared_client = MongoClient(
+                        MONGO_URI,
+                        server_api=ServerApi('1'),
+                        maxPoolSize=config.MONGO_MAX_POOL_SIZE,
+                        minPoolSize=config.MONGO_MIN_POOL_SIZE,
+                        maxIdleTimeMS=config.MONGO_MAX_IDLE_TIME_MS,
+                        waitQueueTimeoutMS=config.MONGO_WAIT_QUEUE_TIMEOUT_MS,
+                        event_listeners=[mongo_command_metrics] if config.METRICS_ENABLED else [],
+                    )
+                except Exception as e:
+                    raise RuntimeError(f"Failed to create MongoDB client: {e}")
+        return cls._shared_client
+
+    @classmethod
+    def close_client_pool(cls):
+        """
+        Close the process-wide MongoDB client and its connection pool.
+        """
+        with cls._shared_client_lock:
+            if cls._shared_client is not None:
+                cls._shared_client.close()
+                cls._shared_client = None
+                cls._healthy_at = None
+                print("MongoDB connection pool closed.")
+
+    @classmethod
+    def check_health(cls, force: bool = False) -> bool:
+        """
+        Ping the MongoDB server.
+
+        A successful ping is trusted for `MONGO_HEALTH_CHECK_INTERVAL_SECONDS`, read when the client pool is
+        created. Failures are not cached, so every check after a failure pings again and sees the recovery at once.
+
+        Args:
+            force (bool): Skip the cached result and ping the server.
+
+        Returns:
+            bool: True if the server answered the ping, False otherwise.
+        """
+        if cls._shared_client is None:
+            return False
+
+        now = time.monotonic()
+        if not force and cls._healthy_at is not None and now - cls._healthy_at < cls._health_check_interval:
+            return True
+
+        try:
+            cls._shared_client.admin.command('ping')
+        except Exception as e:
+            print(f"MongoDB health check failed: {e}")
+            cls._healthy_at = None
+            return False
+        cls._healthy_at = now
+        return True
+
     def start_connection(self):
         """
-        Establish a connection to the MongoDB database and initialize collections.
+        Attach this instance to the shared MongoDB client and initialize collections.
+
+        The shared client is created on first use if the lifespan hook has not created it yet.
 
         Raises:
             RuntimeError: If the connection to MongoDB fails.
         """
+        if self.db is not None and self.client is self._shared_client:
+            return
+
         try:
-            self.client = MongoClient(self.MONGO_URI, server_api=ServerApi('1'))
+            self.client = self.create_client_pool(self.MONGO_URI)
             self.db = self.client[self.DB_NAME]
-            
+
             # Initialize collections
             self.user_collection = self.db["users"]
             self.refresh_token_collection = self.db["refresh_tokens"]
             self.user_session_collection = self.db["user_sessions"]
             self.user_email_verification_token_collection = self.db["user_email_verification_tokens"]
             self.book_collection = self.db["books"]
-            
-            # Test the connection
-            self.client.admin.command('ping')
-            print(f"Successfully connected to MongoDB database: {self.DB_NAME}")
         except Exception as e:
             raise RuntimeError(f"Failed to connect to MongoDB: {e}")
 
@@ -81,15 +317,28 @@ class MongoDBConnection:
         Raises:
             RuntimeError: If the database connection is not initialized.
         """
-        if not self.db:
+        if self.db is None:
             raise RuntimeError("Database connection is not initialized. Call `start_connection` first.")
-        
+
         return self.db[collection_name]
 
+    def get_async_collection(self, collection_name: str) -> AsyncCollection:
+        """
+        Retrieve a collection wrapped for use from async code.
+
+        Args:
+            collection_name (str): The name of the collection to retrieve.
+
+        Returns:
+            AsyncCollection: The requested MongoDB collection with awaitable methods.
+        """
+        return AsyncCollection(self.get_collection(collection_name), self._thread_limiter)
+
     def close_connection(self):
         """
-        Close the connection to the MongoDB database.
+        Release this instance's use of the shared client.
+
+        The pooled connections stay open for the next request; they are only closed by
+        `close_client_pool` when the application shuts down.
         """
-        if self.client:
-            self.client.close()
-            print("MongoDB connection closed.")
+        return None
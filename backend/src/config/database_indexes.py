@@ -0,0 +1,344 @@
+from datetime import datetime, timedelta, timezone
+
+from pymongo import ASCENDING, TEXT, IndexModel
+from pymongo.errors import DuplicateKeyError, OperationFailure
+
+from src.config.env_setting import Settings
+
+
+# Every query the controllers and dependencies run, with sample values, so `verify_indexes` can explain them.
+CONTROLLER_QUERIES = [
+    {"name": "signup/login: user by email", "collection": "users", "filter": {"email": "user@example.com"}},
+    {"name": "verify/reset: user by id and email", "collection": "users", "filter": {"user_id": "USER", "email": "user@example.com"}},
+    {"name": "get_all_books: first page", "collection": "books", "filter": {"user_id": "USER"}, "sort": [("book_id", 1)], "limit": 101},
+    {"name": "get_all_books: next page", "collection": "books", "filter": {"user_id": "USER", "book_id": {"$gt": "BOOK"}}, "sort": [("book_id", 1)], "limit": 101},
+    {
+        "name": "get_all_books: filtered and sorted",
+        "collection": "books",
+        "filter": {"user_id": "USER", "category": "Fiction", "book_price": {"$gte": 5, "$lte": 50}},
+        "sort": [("book_rating", -1), ("book_id", -1)],
+        "limit": 101,
+    },
+    {
+        "name": "search_books: text search",
+        "collection": "books",
+        "filter": {"user_id": "USER", "$text": {"$search": "title"}},
+        "projection": {"_id": 0, "book_id": 1, "score": {"$meta": "textScore"}},
+        "sort": [("score", {"$meta": "textScore"}), ("book_id", 1)],
+        "limit": 101,
+    },
+    {"name": "get/update/delete book", "collection": "books", "filter": {"user_id": "USER", "book_id": "BOOK"}},
+    {"name": "get_book_stats: stats by user", "collection": "book_stats", "filter": {"user_id": "USER"}},
+    {"name": "token validation: session by id", "collection": "user_sessions", "filter": {"session_id": "SESSION"}},
+    {"name": "logout: session by user and id", "collection": "user_sessions", "filter": {"user_id": "USER", "session_id": "SESSION"}},
+    {"name": "refresh/logout: refresh token by user", "collection": "refresh_tokens", "filter": {"user_id": "USER", "email": "user@example.com"}},
+    {
+        "name": "email delivery: claim next due email",
+        "collection": "email_outbox",
+        "filter": {
+            "status": {"$in": ["pending", "sending"]},
+            "next_attempt_at": {"$lte": datetime(2024, 1, 1, tzinfo=timezone.utc)},
+            "attempts": {"$lt": 5},
+        },
+        "sort": [("next_attempt_at", 1)],
+    },
+    {
+        "name": "email delivery: fail expired leases",
+        "collection": "email_outbox",
+        "filter": {"status": "sending", "next_attempt_at": {"$lte": datetime(2024, 1, 1, tzinfo=timezone.utc)}, "attempts": {"$gte": 5}},
+    },
+    {"name": "email delivery: mark sent/failed", "collection": "email_outbox", "filter": {"message_id": "MESSAGE"}},
+]
+
+# Book listing filters matched by equality, and the fields a listing can be sorted on (besides book_id)
+BOOK_EQUALITY_FILTERS = ("category", "language")
+BOOK_SORT_FIELDS = ("book_price", "book_rating", "created_at")
+
+# Relative weight of each searchable field in the text score
+BOOK_TEXT_WEIGHTS = {"book_title": 10, "book_author": 5, "publisher": 1}
+# By default the server reads each document's `language` field as its text-search language and rejects writes
+# whose value it does not support (e.g. "Hindi"), so point the override at a field books never have
+BOOK_TEXT_LANGUAGE_OVERRIDE = "text_language"
+BOOK_TEXT_DEFAULT_LANGUAGE = "english"
+
+# A rebuild is claimed in this collection so concurrently starting workers do not rebuild the same index;
+# a claim left behind by a worker that died mid-rebuild can be taken over once it expires
+INDEX_REBUILD_LOCKS_COLLECTION = "index_rebuilds"
+INDEX_REBUILD_LOCK_SECONDS = 60 * 60
+# Suffix of the index serving queries while an index is rebuilt under its own name
+INDEX_REBUILD_BRIDGE_SUFFIX = "_rebuild"
+# Server error returned when dropping an index that is already gone
+INDEX_NOT_FOUND = 27
+
+
+def find_stages(plan, stage_name: str) -> list:
+    """
+    Walk an explain() plan and return every stage with the given name.
+
+    :param plan: The explain output (or any nested part of it).
+    :param stage_name: The stage to look for, e.g. "COLLSCAN" or "SORT".
+    :return: The list of matching stage documents found.
+    """
+    found = []
+    if isinstance(plan, dict):
+        if plan.get("stage") == stage_name:
+            found.append(plan)
+        for value in plan.values():
+            found.extend(find_stages(value, stage_name))
+    elif isinstance(plan, list):
+        for value in plan:
+            found.extend(find_stages(value, stage_name))
+    return found
+
+
+def find_collscan_stages(plan) -> list:
+    """
+    Walk an explain() plan and return every stage that scans a whole collection.
+    """
+    return find_stages(plan, "COLLSCAN")
+
+
+class IndexManager:
+    """
+    A class to declare the indexes the application queries need and reconcile them with the database.
+    """
+
+    def __init__(self, db, config: Settings = None):
+        self.db = db
+        self.config = config or Settings()
+
+    def index_definitions(self) -> dict:
+        """
+        Return the declared indexes, keyed by collection name.
+        """
+        session_ttl_seconds = self.config.USER_SESSION_EXPIRY_MINUTES * 60
+        refresh_token_ttl_seconds = self.config.JWT_REFRESH_EXPIRY_DAYS * 24 * 60 * 60
+        email_outbox_ttl_seconds = self.config.EMAIL_OUTBOX_RETENTION_DAYS * 24 * 60 * 60
+
+        return {
+            "users": [
+                IndexModel([("email", ASCENDING)], name="users_email_unique", unique=True),
+                IndexModel([("user_id", ASCENDING)], name="users_user_id_unique", unique=True),
+            ],
+            "books": [
+                IndexModel([("user_id", ASCENDING), ("book_id", ASCENDING)], name="books_user_id_book_id_unique", unique=True),
+                IndexModel([("book_id", ASCENDING)], name="books_book_id_unique", unique=True),
+                *self._book_listing_indexes(),
+                # Prefixed with user_id so every search only touches one user's books
+                IndexModel(
+                    [("user_id", ASCENDING), ("book_title", TEXT), ("book_author", TEXT), ("publisher", TEXT)],
+                    name="books_user_id_text",
+                    weights=BOOK_TEXT_WEIGHTS,
+                    default_language=BOOK_TEXT_DEFAULT_LANGUAGE,
+                    language_override=BOOK_TEXT_LANGUAGE_OVERRIDE,
+                ),
+            ],
+            "book_stats": [
+                IndexModel([("user_id", ASCENDING)], name="book_stats_user_id_unique", unique=True),
+            ],
+            "user_sessions": [
+                IndexModel([("session_id", ASCENDING)], name="user_sessions_session_id_unique", unique=True),
+                IndexModel([("created_at", ASCENDING)], name="user_sessions_created_at_ttl", expireAfterSeconds=session_ttl_seconds),
+            ],
+            "refresh_tokens": [
+                IndexModel([("user_id", ASCENDING), ("email", ASCENDING)], name="refresh_tokens_user_id_email"),
+                IndexModel([("created_at", ASCENDING)], name="refresh_tokens_created_at_ttl", expireAfterSeconds=refresh_token_ttl_seconds),
+            ],
+            "email_outbox": [
+                IndexModel([("status", ASCENDING), ("next_attempt_at", ASCENDING)], name="email_outbox_status_next_attempt_at"),
+                IndexModel([("message_id", ASCENDING)], name="email_outbox_message_id_unique", unique=True),
+                # Only sent emails have `sent_at`, so pending and failed ones are kept
+                IndexModel([("sent_at", ASCENDING)], name="email_outbox_sent_at_ttl", expireAfterSeconds=email_outbox_ttl_seconds),
+            ],
+        }
+
+    @staticmethod
+    def _book_listing_indexes() -> list:
+        """
+        Return the compound indexes behind the filtered and sorted book listings.
+
+        Keys follow equality, sort, then the `book_id` tie-breaker, so every filter/sort combination of
+        `get_all_books` walks one index in order (forwards or backwards) and never sorts in memory.
+        Range filters on price, rating and published date are applied on the same index scan.
+        """
+        indexes = []
+        for equality_field in (None, *BOOK_EQUALITY_FILTERS):
+            prefix = [("user_id", ASCENDING)] + ([(equality_field, ASCENDING)] if equality_field else [])
+            sort_fields = BOOK_SORT_FIELDS if equality_field is None else ("book_id", *BOOK_SORT_FIELDS)
+            for sort_field in sort_fields:
+                keys = prefix + [(sort_field, ASCENDING)] + ([("book_id", ASCENDING)] if sort_field != "book_id" else [])
+                indexes.append(IndexModel(keys, name="books_" + "_".join(field for field, _ in keys)))
+        return indexes
+
+    @staticmethod
+    def _needs_rebuild(declared: dict, existing: dict) -> bool:
+        """
+        Check whether an existing index differs from its declaration in anything but the TTL.
+        """
+        declared_key = list(declared["key"].items())
+        existing_key = list(existing.get("key", []))
+        if TEXT in declared["key"].values():
+            # The server stores text fields as `_fts`/`_ftsx` keys plus a weights map, so compare those instead
+            declared_weights = declared.get("weights") or {field: 1 for field, kind in declared_key if kind == TEXT}
+            if dict(existing.get("weights", {})) != declared_weights:
+                return True
+            for option, server_default in (("default_language", "english"), ("language_override", "language")):
+                if existing.get(option, server_default) != declared.get(option, server_default):
+                    return True
+            declared_key = [(field, kind) for field, kind in declared_key if kind != TEXT]
+            existing_key = [(field, kind) for field, kind in existing_key if field not in ("_fts", "_ftsx")]
+        if existing_key != declared_key:
+            return True
+        return bool(existing.get("unique", False)) != bool(declared.get("unique", False))
+
+    @staticmethod
+    def _index_model_from_info(name: str, info: dict) -> IndexModel:
+        """
+        Turn an entry of `index_information()` back into an index declaration, e.g. to restore a dropped index.
+        """
+        options = {option: value for option, value in info.items() if option not in ("key", "v", "ns", "weights", "textIndexVersion")}
+        keys = list(info["key"])
+        if any(field == "_fts" for field, _ in keys):
+            # Text indexes are reported as `_fts`/`_ftsx` keys; the text fields themselves are in the weights
+            text_keys = [(field, TEXT) for field in info.get("weights", {})]
+            position = next(index for index, (field, _) in enumerate(keys) if field == "_fts")
+            keys = keys[:position] + text_keys + [(field, kind) for field, kind in keys[position:] if field not in ("_fts", "_ftsx")]
+            options["weights"] = dict(info.get("weights", {}))
+        return IndexModel(keys, name=name, **options)
+
+    def _acquire_rebuild_lock(self, lock_id: str) -> bool:
+        now = datetime.now(timezone.utc)
+        try:
+            self.db[INDEX_REBUILD_LOCKS_COLLECTION].update_one(
+                {"_id": lock_id, "expires_at": {"$lte": now}},
+                {"$set": {"expires_at": now + timedelta(seconds=INDEX_REBUILD_LOCK_SECONDS)}},
+                upsert=True,
+            )
+        except DuplicateKeyError:
+            return False
+        return True
+
+    @staticmethod
+    def _drop_index(collection, name: str):
+        try:
+            collection.drop_index(name)
+        except OperationFailure as e:
+            if e.code != INDEX_NOT_FOUND:
+                raise
+
+    def _rebuild_index(self, collection_name: str, index_model: IndexModel) -> str:
+        """
+        Replace an index whose declaration changed, without leaving its queries unindexed while it is rebuilt.
+
+        An index cannot be renamed, so the replacement must be built under the old name. A bridge index with the
+        declared keys plus `_id` is built first and serves the same queries until the replacement exists; if the
+        bridge cannot be built the old index is kept. If the replacement then fails (e.g. duplicates blocking a
+        unique index) the old index is restored. A collection has at most one text index, so a text index gets no
+        bridge and text search is unavailable while it is rebuilt.
+
+        The rebuild is claimed in `index_rebuilds` first, so when several workers start together only one of them
+        rebuilds the index and the others leave it alone.
+
+        :return: "rebuilt", "unchanged" (already rebuilt by another worker), "in_progress" or "failed".
+        """
+        collection = self.db[collection_name]
+        declared = index_model.document
+        name = declared["name"]
+        lock_id = f"{collection_name}.{name}"
+        if not self._acquire_rebuild_lock(lock_id):
+            return "in_progress"
+
+        try:
+            # Another worker may have finished the rebuild between our first look and the lock
+            existing = collection.index_information().get(name)
+            if existing is not None and not self._needs_rebuild(declared, existing):
+                return "unchanged"
+
+            bridge_name = None
+            if TEXT not in declared["key"].values():
+                bridge_name = name + INDEX_REBUILD_BRIDGE_SUFFIX
+                collection.create_indexes([IndexModel([*declared["key"].items(), ("_id", ASCENDING)], name=bridge_name)])
+
+            if existing is not None:
+                self._drop_index(collection, name)
+            try:
+                collection.create_indexes([index_model])
+            except OperationFailure as e:
+                print(f"Failed to rebuild index '{name}' on '{collection_name}', restoring the previous one: {e}")
+                if existing is not None:
+                    collection.create_indexes([self._index_model_from_info(name, existing)])
+                if bridge_name:
+                    self._drop_index(collection, bridge_name)
+                return "failed"
+
+            if bridge_name:
+                self._drop_index(collection, bridge_name)
+            return "rebuilt"
+        except OperationFailure as e:
+            print(f"Failed to rebuild index '{name}' on '{collection_name}', keeping the previous one: {e}")
+            return "failed"
+        finally:
+            self.db[INDEX_REBUILD_LOCKS_COLLECTION].delete_one({"_id": lock_id})
+
+    def _reconcile_collection(self, collection_name: str, index_models: list) -> dict:
+        """
+        Create missing indexes, update changed TTLs in place and rebuild indexes whose keys or options changed.
+
+        A rebuild another worker is running is reported as "in_progress", one that could not complete as "failed".
+        """
+        collection = self.db[collection_name]
+        existing_indexes = collection.index_information()
+        report = {"created": [], "updated": [], "rebuilt": [], "unchanged": [], "in_progress": [], "failed": []}
+
+        for index_model in index_models:
+            declared = index_model.document
+            name = declared["name"]
+            existing = existing_indexes.get(name)
+
+            if existing is None:
+                collection.create_indexes([index_model])
+                report["created"].append(name)
+            elif self._needs_rebuild(declared, existing):
+                report[self._rebuild_index(collection_name, index_model)].append(name)
+            elif existing.get("expireAfterSeconds") != declared.get("expireAfterSeconds"):
+                self.db.command("collMod", collection_name, index={"name": name, "expireAfterSeconds": declared["expireAfterSeconds"]})
+                report["updated"].append(name)
+            else:
+                report["unchanged"].append(name)
+
+        return report
+
+    def ensure_indexes(self) -> dict:
+        """
+        Reconcile every declared index with the database.
+
+        A failure on one index (for example duplicate emails blocking a unique index) is reported
+        and does not stop the remaining collections from being reconciled.
+
+        :return: A per-collection report of what was created, updated, rebuilt or left unchanged.
+        """
+        reports = {}
+        for collection_name, index_models in self.index_definitions().items():
+            try:
+                reports[collection_name] = self._reconcile_collection(collection_name, index_models)
+            except OperationFailure as e:
+                print(f"Failed to reconcile indexes for '{collection_name}': {e}")
+                reports[collection_name] = {"error": str(e)}
+        return reports
+
+    def explain_queries(self, queries: list = None) -> list:
+        """
+        Run explain() on each query and collect the ones that fall back to a collection scan.
+
+        :param queries: The queries to explain. Defaults to `CONTROLLER_QUERIES`.
+        :return: One result per query with its name and the COLLSCAN stages found (empty when index-backed).
+        """
+        results = []
+        for query in queries or CONTROLLER_QUERIES:
+            cursor = self.db[query["collection"]].find(query["filter"], query.get("projection"))
+            if query.get("sort"):
+                cursor = cursor.sort(query["sort"])
+            explain_output = cursor.limit(query.get("limit", 1)).explain()
+            winning_plan = explain_output.get("queryPlanner", {}).get("winningPlan", explain_output)
+            results.append({"name": query["name"], "collscan_stages": find_collscan_stages(winning_plan)})
+        return results
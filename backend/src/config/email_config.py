@@ -1,11 +1,18 @@
 import os
+import asyncio
 
+import aiosmtplib
+
+from email.message import EmailMessage
+from email.utils import make_msgid
 from fastapi import HTTPException, status
 from pathlib import Path
 from fastapi_mail import FastMail, MessageSchema, MessageType, ConnectionConfig
-from fastapi.background import BackgroundTasks
+from jinja2 import TemplateNotFound
+from pydantic import SecretStr
 
 from src.config.env_setting import Settings
+from src.utils.email_template_renderer import EmailTemplateRenderer
 
 
 # Load environment settings
@@ -28,43 +35,169 @@ conf = ConnectionConfig(
 )
 
 
-async def send_email(
-    recipients: list, subject: str, context: dict, template_name: str, background_tasks: BackgroundTasks
-):
+# Templates are compiled once and their static parts pre-rendered, instead of per message
+email_template_renderer = EmailTemplateRenderer(conf.TEMPLATE_FOLDER, Config.EMAIL_TEMPLATE_BYTECODE_CACHE_DIR or None)
+
+# Connect, login and send, twice when a dropped pooled session is replaced
+SMTP_SEND_STEPS = 6
+
+
+def render_email(template_name: str, context: dict) -> str:
     """
-    Send an email using the provided template and context.
+    Render an email template with its context, producing the same HTML as FastMail.
 
     Args:
-        recipients (list): List of recipient email addresses.
-        subject (str): Subject of the email.
-        context (dict): Context data for the email template.
         template_name (str): Name of the email template.
-        background_tasks (BackgroundTasks): Background task manager to send the email asynchronously.
+        context (dict): Context data for the email template.
 
     Returns:
-        bool: True if the email is sent successfully.
+        str: The rendered HTML body.
+    """
+    return email_template_renderer.render(template_name, context)
 
-    Raises:
-        HTTPException: If the email fails to send.
+
+def build_email_message(recipients: list, subject: str, html: str, message_id: str = None, config: ConnectionConfig = conf) -> EmailMessage:
     """
-    message = MessageSchema(
-        subject=subject,
-        recipients=recipients,
-        template_body=context,
-        subtype=MessageType.html,
-    )
+    Build a MIME message for an already rendered HTML body.
 
-    fm = FastMail(conf)
-    try:
-        background_tasks.add_task(fm.send_message, message, template_name=template_name)
-        print("Email has been sent successfully!")
+    Args:
+        recipients (list): List of recipient email addresses.
+        subject (str): Subject of the email.
+        html (str): Rendered HTML body.
+        message_id (str): Outbox id. The Message-ID header is derived from it alone, so every retry of the same
+            message carries the same header and receivers can deduplicate it.
+        config (ConnectionConfig): Sender settings.
+
+    Returns:
+        EmailMessage: The message, ready for `SMTPConnectionPool.send`.
+    """
+    message = EmailMessage()
+    message["From"] = f"{config.MAIL_FROM_NAME} <{config.MAIL_FROM}>" if config.MAIL_FROM_NAME else config.MAIL_FROM
+    message["To"] = ", ".join(recipients)
+    message["Subject"] = subject
+    domain = config.MAIL_FROM.rpartition("@")[2]
+    message["Message-ID"] = f"<{message_id}@{domain}>" if message_id else make_msgid(domain=domain)
+    message.set_content(html, subtype="html")
+    return message
+
+
+def is_permanent_email_failure(error: Exception) -> bool:
+    """
+    Check whether retrying a failed delivery is pointless (rejected recipients, 5xx replies, missing template).
+    """
+    if isinstance(error, (aiosmtplib.SMTPRecipientsRefused, TemplateNotFound)):
         return True
-    except Exception as e:
-        print(f"Error sending email: {str(e)}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to send email: {str(e)}",
+    return isinstance(error, aiosmtplib.SMTPResponseException) and error.code >= 500
+
+
+def smtp_send_deadline(config: ConnectionConfig = conf) -> float:
+    """
+    Return the longest a pooled send may take, in seconds.
+
+    Connecting (with its TLS handshake), logging in and sending are each bounded by the configured SMTP
+    `TIMEOUT`, and a dropped session is replaced and the message sent again once, so a send makes at most
+    `SMTP_SEND_STEPS` such steps.
+    """
+    return SMTP_SEND_STEPS * config.TIMEOUT
+
+
+class SMTPConnectionPool:
+    """
+    A bounded pool of authenticated SMTP sessions shared by all deliveries.
+
+    At most `max_size` messages are sent at once. A session is returned to the pool after a successful
+    send and reused by the next message, so the TCP, TLS and AUTH handshakes are paid once per session
+    instead of once per email. A session that fails or whose send is cancelled is closed; a reused session that turns out to have
+    been dropped by the server is replaced and the message is sent again once.
+    """
+
+    def __init__(self, config: ConnectionConfig = conf, max_size: int = 4):
+        self.config = config
+        self.max_size = max_size
+        self._idle = []
+        self._semaphore = asyncio.Semaphore(max_size)
+        self.connections_opened = 0
+        self.messages_sent = 0
+
+    async def _connect(self) -> aiosmtplib.SMTP:
+        smtp = aiosmtplib.SMTP(
+            hostname=self.config.MAIL_SERVER,
+            port=self.config.MAIL_PORT,
+            use_tls=self.config.MAIL_SSL_TLS,
+            start_tls=self.config.MAIL_STARTTLS,
+            validate_certs=self.config.VALIDATE_CERTS,
+            timeout=self.config.TIMEOUT,
         )
+        try:
+            await smtp.connect()
+            if self.config.USE_CREDENTIALS:
+                # fastapi-mail 1.4 declares the password as a plain str, later versions as a SecretStr
+                password = self.config.MAIL_PASSWORD
+                await smtp.login(self.config.MAIL_USERNAME, password.get_secret_value() if isinstance(password, SecretStr) else password)
+        except BaseException:
+            # Also on cancellation (e.g. the worker's send deadline), so a half-open session is not leaked
+            await self._discard(smtp)
+            raise
+        self.connections_opened += 1
+        return smtp
+
+    @staticmethod
+    async def _discard(smtp: aiosmtplib.SMTP):
+        try:
+            smtp.close()
+        except Exception:
+            pass
+
+    async def send(self, message: EmailMessage):
+        """
+        Send one message on a pooled session.
+
+        Raises:
+            aiosmtplib.SMTPException: If the server refuses the message or cannot be reached.
+        """
+        async with self._semaphore:
+            smtp = self._idle.pop() if self._idle else None
+            reused = smtp is not None and smtp.is_connected
+            if not reused:
+                smtp = await self._connect()
+
+            try:
+                try:
+                    await smtp.send_message(message)
+                except aiosmtplib.SMTPServerDisconnected:
+                    if not reused:
+                        raise
+                    await self._discard(smtp)
+                    smtp = await self._connect()
+                    await smtp.send_message(message)
+            except BaseException:
+                # Cancellation (e.g. the worker's send deadline) is a BaseException and leaves the session mid-command,
+                # so it is closed like any failure instead of being leaked or returned to the pool
+                await self._discard(smtp)
+                raise
+
+            self.messages_sent += 1
+            self._idle.append(smtp)
+
+    async def close(self):
+        """
+        Close every idle session.
+        """
+        while self._idle:
+            smtp = self._idle.pop()
+            try:
+                await smtp.quit()
+            except Exception:
+                await self._discard(smtp)
+
+    def stats(self) -> dict:
+        return {
+            "max_size": self.max_size,
+            "idle_connections": len(self._idle),
+            "connections_opened": self.connections_opened,
+            "messages_sent": self.messages_sent,
+        }
+
 
 async def test_fastmail():
     """
@@ -18,12 +18,27 @@ class Settings(BaseSettings):
     Attributes:
         MONGO_URI (str): MongoDB connection URI.
         DB_NAME (str): MongoDB database name.
+        MONGO_MAX_POOL_SIZE (int): Maximum number of pooled connections per worker.
+        MONGO_MIN_POOL_SIZE (int): Minimum number of pooled connections kept open per worker.
+        MONGO_MAX_IDLE_TIME_MS (int): Time a pooled connection may stay idle before it is closed.
+        MONGO_WAIT_QUEUE_TIMEOUT_MS (int): Time a request waits for a free pooled connection.
+        MONGO_HEALTH_CHECK_INTERVAL_SECONDS (int): How long a successful health probe is cached.
+        MONGO_ENSURE_INDEXES_ON_STARTUP (bool): Whether to reconcile the declared indexes on startup.
         JWT_ALGORITHM (str): Algorithm used for JWT tokens.
         JWT_ACCESS_SECRET_KEY (str): Secret key for signing access JWT tokens.
         JWT_ACCESS_EXPIRY_MINUTES (int): Expiry time for access JWT tokens in minutes.
         JWT_REFRESH_SECRET_KEY (str): Secret key for signing refresh JWT tokens.
         JWT_REFRESH_EXPIRY_DAYS (int): Expiry time for refresh JWT tokens in days.
+        JWT_VERIFY_CACHE_ENABLED (bool): Whether verified token payloads are cached until they expire.
+        JWT_VERIFY_CACHE_MAX_SIZE (int): Maximum number of cached verified tokens per worker.
         USER_SESSION_EXPIRY_MINUTES (int): Expiry time for user sessions in minutes.
+        SESSION_CACHE_ENABLED (bool): Whether validated sessions are cached in memory.
+        SESSION_CACHE_MAX_SIZE (int): Maximum number of cached sessions per worker.
+        SESSION_CACHE_TTL_SECONDS (int): Lifetime of a cached session, capped at 10% of the access token expiry.
+        BCRYPT_ROUNDS (int): bcrypt cost factor for new hashes; older hashes are rehashed on login.
+        PASSWORD_HASH_EXECUTOR (str): Worker pool used for bcrypt, "thread" or "process".
+        PASSWORD_HASH_MAX_WORKERS (int): Number of bcrypt operations allowed to run at once.
+        PASSWORD_HASH_MAX_QUEUE (int): Number of bcrypt operations allowed to wait for a worker (0 = unbounded).
         MAIL_USERNAME (str): Email service username.
         MAIL_PASSWORD (str): Email service password.
         MAIL_FROM (str): Sender email address.
@@ -34,6 +49,27 @@ class Settings(BaseSettings):
         MAIL_SSL_TLS (bool): Whether to use SSL/TLS for email.
         USE_CREDENTIALS (bool): Whether to use credentials for email.
         VALIDATE_CERTS (bool): Whether to validate email server certificates.
+        EMAIL_TEMPLATE_BYTECODE_CACHE_DIR (str): Directory for compiled email templates; defaults to the system temp directory.
+        EMAIL_DELIVERY_ENABLED (bool): Run the email outbox delivery worker in this process.
+        EMAIL_DELIVERY_CONCURRENCY (int): Emails sent at once, which is also the number of pooled SMTP connections.
+        EMAIL_MAX_ATTEMPTS (int): Delivery attempts before an email is marked as failed.
+        EMAIL_RETRY_BASE_SECONDS (int): Delay before the first retry; it doubles on every further attempt.
+        EMAIL_RETRY_MAX_SECONDS (int): Longest delay between two delivery attempts.
+        EMAIL_OUTBOX_POLL_INTERVAL_SECONDS (float): How often idle delivery workers check the outbox for due emails.
+        EMAIL_OUTBOX_LEASE_MARGIN_SECONDS (int): How long a claimed email stays reserved beyond the longest possible SMTP send (6 x the SMTP timeout) before another worker may retry it.
+        EMAIL_OUTBOX_RETENTION_DAYS (int): How long sent emails are kept in the outbox.
+        BOOK_PAGE_DEFAULT_LIMIT (int): Page size used when `/all-books` is called without a limit.
+        BOOK_PAGE_MAX_LIMIT (int): Largest page size a client may request from `/all-books`.
+        BOOK_EXPORT_BATCH_SIZE (int): Documents fetched per cursor batch by the NDJSON export.
+        BOOK_BULK_MAX_BATCH_SIZE (int): Largest number of items accepted by one bulk book request.
+        BOOK_RAW_BSON_READS (bool): Serve book reads from raw BSON straight to JSON, skipping dict decoding.
+        RESPONSE_CACHE_BACKEND (str): Book read response cache, "memory" (per worker), "redis" (shared) or "none".
+        RESPONSE_CACHE_URL (str): Redis URL used by the "redis" response cache backend.
+        RESPONSE_CACHE_MAX_ENTRIES (int): Maximum number of cached responses per worker ("memory" backend).
+        RESPONSE_CACHE_MAX_BYTES (int): Maximum total size of cached response bodies per worker ("memory" backend).
+        RESPONSE_CACHE_TTL_SECONDS (int): Lifetime of a cached response if it is not invalidated earlier.
+        ID_STRATEGY (str): How new book, user, session and outbox IDs are made: "sortable" (time-ordered) or "random".
+        METRICS_ENABLED (bool): Whether to record request and MongoDB command metrics and serve them on `/metrics`.
         FRONTEND_HOST (str): Frontend application host URL.
         APP_NAME (str): Name of the application.
     """
@@ -41,6 +77,12 @@ class Settings(BaseSettings):
     # Database settings
     MONGO_URI: str = os.getenv("MONGO_URI", "mongodb://localhost:27017")
     DB_NAME: str = os.getenv("DB_NAME", "test_db")
+    MONGO_MAX_POOL_SIZE: int = int(os.getenv("MONGO_MAX_POOL_SIZE", 50))
+    MONGO_MIN_POOL_SIZE: int = int(os.getenv("MONGO_MIN_POOL_SIZE", 0))
+    MONGO_MAX_IDLE_TIME_MS: int = int(os.getenv("MONGO_MAX_IDLE_TIME_MS", 300000))
+    MONGO_WAIT_QUEUE_TIMEOUT_MS: int = int(os.getenv("MONGO_WAIT_QUEUE_TIMEOUT_MS", 5000))
+    MONGO_HEALTH_CHECK_INTERVAL_SECONDS: int = int(os.getenv("MONGO_HEALTH_CHECK_INTERVAL_SECONDS", 10))
+    MONGO_ENSURE_INDEXES_ON_STARTUP: bool = os.getenv("MONGO_ENSURE_INDEXES_ON_STARTUP", "True").lower() == "true"
 
     # JWT settings
     JWT_ALGORITHM: str = os.getenv("JWT_ALGORITHM", "HS256")
@@ -48,8 +90,19 @@ class Settings(BaseSettings):
     JWT_ACCESS_EXPIRY_MINUTES: int = int(os.getenv("JWT_ACCESS_EXPIRY_MINUTES", 15))
     JWT_REFRESH_SECRET_KEY: str = os.getenv("JWT_REFRESH_SECRET_KEY", "default_refresh_secret")
     JWT_REFRESH_EXPIRY_DAYS: int = int(os.getenv("JWT_REFRESH_EXPIRY_DAYS", 7))
+    JWT_VERIFY_CACHE_ENABLED: bool = os.getenv("JWT_VERIFY_CACHE_ENABLED", "False").lower() == "true"
+    JWT_VERIFY_CACHE_MAX_SIZE: int = int(os.getenv("JWT_VERIFY_CACHE_MAX_SIZE", 10000))
 
     USER_SESSION_EXPIRY_MINUTES: int = int(os.getenv("USER_SESSION_EXPIRY_MINUTES", 30))
+    SESSION_CACHE_ENABLED: bool = os.getenv("SESSION_CACHE_ENABLED", "True").lower() == "true"
+    SESSION_CACHE_MAX_SIZE: int = int(os.getenv("SESSION_CACHE_MAX_SIZE", 10000))
+    SESSION_CACHE_TTL_SECONDS: int = int(os.getenv("SESSION_CACHE_TTL_SECONDS", 60))
+
+    # Password hashing settings
+    BCRYPT_ROUNDS: int = int(os.getenv("BCRYPT_ROUNDS", 12))
+    PASSWORD_HASH_EXECUTOR: str = os.getenv("PASSWORD_HASH_EXECUTOR", "thread")
+    PASSWORD_HASH_MAX_WORKERS: int = int(os.getenv("PASSWORD_HASH_MAX_WORKERS", 4))
+    PASSWORD_HASH_MAX_QUEUE: int = int(os.getenv("PASSWORD_HASH_MAX_QUEUE", 200))
 
     # Email settings
     MAIL_USERNAME: str = os.getenv("MAIL_USERNAME", "example@example.com")
@@ -63,6 +116,37 @@ class Settings(BaseSettings):
     USE_CREDENTIALS: bool = os.getenv("USE_CREDENTIALS", "True").lower() == "true"
     VALIDATE_CERTS: bool = os.getenv("VALIDATE_CERTS", "True").lower() == "true"
 
+    # Email delivery settings
+    EMAIL_TEMPLATE_BYTECODE_CACHE_DIR: str = os.getenv("EMAIL_TEMPLATE_BYTECODE_CACHE_DIR", "")
+    EMAIL_DELIVERY_ENABLED: bool = os.getenv("EMAIL_DELIVERY_ENABLED", "True").lower() == "true"
+    EMAIL_DELIVERY_CONCURRENCY: int = int(os.getenv("EMAIL_DELIVERY_CONCURRENCY", 4))
+    EMAIL_MAX_ATTEMPTS: int = int(os.getenv("EMAIL_MAX_ATTEMPTS", 5))
+    EMAIL_RETRY_BASE_SECONDS: int = int(os.getenv("EMAIL_RETRY_BASE_SECONDS", 30))
+    EMAIL_RETRY_MAX_SECONDS: int = int(os.getenv("EMAIL_RETRY_MAX_SECONDS", 3600))
+    EMAIL_OUTBOX_POLL_INTERVAL_SECONDS: float = float(os.getenv("EMAIL_OUTBOX_POLL_INTERVAL_SECONDS", 5))
+    EMAIL_OUTBOX_LEASE_MARGIN_SECONDS: int = int(os.getenv("EMAIL_OUTBOX_LEASE_MARGIN_SECONDS", 30))
+    EMAIL_OUTBOX_RETENTION_DAYS: int = int(os.getenv("EMAIL_OUTBOX_RETENTION_DAYS", 7))
+
+    # Book listing settings
+    BOOK_PAGE_DEFAULT_LIMIT: int = int(os.getenv("BOOK_PAGE_DEFAULT_LIMIT", 100))
+    BOOK_PAGE_MAX_LIMIT: int = int(os.getenv("BOOK_PAGE_MAX_LIMIT", 500))
+    BOOK_EXPORT_BATCH_SIZE: int = int(os.getenv("BOOK_EXPORT_BATCH_SIZE", 500))
+    BOOK_BULK_MAX_BATCH_SIZE: int = int(os.getenv("BOOK_BULK_MAX_BATCH_SIZE", 500))
+    BOOK_RAW_BSON_READS: bool = os.getenv("BOOK_RAW_BSON_READS", "False").lower() == "true"
+
+    # Response cache settings
+    RESPONSE_CACHE_BACKEND: str = os.getenv("RESPONSE_CACHE_BACKEND", "memory")
+    RESPONSE_CACHE_URL: str = os.getenv("RESPONSE_CACHE_URL", "redis://localhost:6379/0")
+    RESPONSE_CACHE_MAX_ENTRIES: int = int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", 10000))
+    RESPONSE_CACHE_MAX_BYTES: int = int(os.getenv("RESPONSE_CACHE_MAX_BYTES", 64 * 1024 * 1024))
+    RESPONSE_CACHE_TTL_SECONDS: int = int(os.getenv("RESPONSE_CACHE_TTL_SECONDS", 300))
+
+    # ID settings
+    ID_STRATEGY: str = os.getenv("ID_STRATEGY", "sortable")
+
+    # Metrics settings
+    METRICS_ENABLED: bool = os.getenv("METRICS_ENABLED", "True").lower() == "true"
+
     # Frontend settings
     FRONTEND_HOST: str = os.getenv("FRONTEND_HOST", "http://localhost:3000")
     APP_NAME: str = os.getenv("APP_NAME", "My FastAPI App")
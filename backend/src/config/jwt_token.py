@@ -1,9 +1,18 @@
 from fastapi import HTTPException
+import hashlib
+import time
 import jwt
 from jwt import InvalidTokenError, ExpiredSignatureError
 from datetime import datetime, timedelta, timezone
 
 from src.config.env_setting import Settings
+from src.config.metrics import JWT_DURATION
+from src.utils.ttl_cache import TTLCache
+
+
+# Verified payloads shared by every JWTManager in the process, keyed by (is_refresh, sha256(token))
+_settings = Settings()
+verified_token_cache = TTLCache(max_size=_settings.JWT_VERIFY_CACHE_MAX_SIZE, ttl_seconds=_settings.JWT_ACCESS_EXPIRY_MINUTES * 60)
 
 
 class JWTManager:
@@ -18,6 +27,7 @@ class JWTManager:
         self.access_expiry_minutes = self.config.JWT_ACCESS_EXPIRY_MINUTES
         self.refresh_secret = self.config.JWT_REFRESH_SECRET_KEY
         self.refresh_expiry_days = self.config.JWT_REFRESH_EXPIRY_DAYS
+        self.verify_cache_enabled = self.config.JWT_VERIFY_CACHE_ENABLED
 
     def create_access_token(self, payload: dict) -> str:
         """
@@ -28,7 +38,8 @@ class JWTManager:
         """
         payload["exp"] = datetime.now(timezone.utc) + timedelta(minutes=self.access_expiry_minutes)
         try:
-            return jwt.encode(payload, self.access_secret, algorithm=self.algorithm)
+            with JWT_DURATION.labels("encode").time():
+                return jwt.encode(payload, self.access_secret, algorithm=self.algorithm)
         except Exception as e:
             raise HTTPException(status_code=500, detail=f"Failed to create access token: {str(e)}")
 
@@ -41,7 +52,8 @@ class JWTManager:
         """
         payload["exp"] = datetime.now(timezone.utc) + timedelta(days=self.refresh_expiry_days)
         try:
-            return jwt.encode(payload, self.refresh_secret, algorithm=self.algorithm)
+            with JWT_DURATION.labels("encode").time():
+                return jwt.encode(payload, self.refresh_secret, algorithm=self.algorithm)
         except Exception as e:
             raise HTTPException(status_code=500, detail=f"Failed to create refresh token: {str(e)}")
 
@@ -49,13 +61,28 @@ class JWTManager:
         """
         Decode a JWT token and return the payload.
 
+        When `JWT_VERIFY_CACHE_ENABLED` is set, payloads of verified tokens are cached by token digest
+        until the token's own `exp`, so a token seen again skips the signature check.
+
         :param token: The JWT token to decode.
         :param is_refresh: Whether the token is a refresh token.
         :return: The decoded payload.
         """
         secret_key = self.refresh_secret if is_refresh else self.access_secret
+        cache_key = None
+        if self.verify_cache_enabled:
+            # Only a byte-identical token that already passed verification can hit
+            cache_key = (is_refresh, hashlib.sha256(token.encode("utf-8")).digest())
+            cached_payload = verified_token_cache.get(cache_key)
+            if cached_payload is not None and cached_payload["exp"] > time.time():
+                return dict(cached_payload)
+
         try:
-            payload = jwt.decode(token, secret_key, algorithms=[self.algorithm])
+            with JWT_DURATION.labels("decode").time():
+                payload = jwt.decode(token, secret_key, algorithms=[self.algorithm])
+            if cache_key is not None and isinstance(payload.get("exp"), (int, float)):
+                # The entry lives exactly as long as the token itself
+                verified_token_cache.set(cache_key, dict(payload), ttl_seconds=payload["exp"] - time.time())
             return payload
         except ExpiredSignatureError:
             raise HTTPException(status_code=401, detail="Token has expired!")
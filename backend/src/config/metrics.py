@@ -0,0 +1,164 @@
+import time
+
+from typing import Callable
+
+from prometheus_client import CONTENT_TYPE_LATEST, REGISTRY, Counter, Gauge, Histogram, generate_latest
+from prometheus_client.core import GaugeMetricFamily
+from pymongo import monitoring
+
+
+# Bucket boundaries in seconds, sized for what each histogram measures
+HTTP_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.075, 0.1, 0.25, 0.5, 0.75, 1.0, 2.5, 5.0, 10.0)
+MONGO_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+JWT_BUCKETS = (0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01)
+PASSWORD_HASH_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Label for requests that did not match any route, so unknown paths cannot blow up the label cardinality
+UNMATCHED_ROUTE = "unmatched"
+# The method is sent by the client, so anything but the standard methods shares one label
+HTTP_METHODS = frozenset({"GET", "HEAD", "POST", "PUT", "PATCH", "DELETE", "OPTIONS", "CONNECT", "TRACE"})
+OTHER_METHOD = "other"
+
+HTTP_REQUESTS = Counter("http_requests_total", "HTTP requests handled.", ["method", "route", "status"])
+HTTP_REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds", "Time spent handling an HTTP request.", ["method", "route"], buckets=HTTP_BUCKETS,
+)
+HTTP_REQUESTS_IN_PROGRESS = Gauge("http_requests_in_progress", "HTTP requests being handled.")
+
+MONGO_COMMAND_DURATION = Histogram(
+    "mongodb_command_duration_seconds", "Round trip of a MongoDB command as measured by the driver.",
+    ["collection", "command"], buckets=MONGO_BUCKETS,
+)
+MONGO_COMMAND_FAILURES = Counter("mongodb_command_failures_total", "MongoDB commands that failed.", ["collection", "command"])
+
+PASSWORD_HASH_DURATION = Histogram(
+    "password_hash_duration_seconds", "Time for a bcrypt hash or verification, including the wait for a pool worker.",
+    ["operation"], buckets=PASSWORD_HASH_BUCKETS,
+)
+JWT_DURATION = Histogram("jwt_duration_seconds", "Time to sign or verify a JWT.", ["operation"], buckets=JWT_BUCKETS)
+
+EMAILS_ENQUEUED = Counter("emails_enqueued_total", "Emails written to the outbox.", ["template"])
+EMAIL_DELIVERIES = Counter("email_deliveries_total", "Email delivery attempts by outcome (sent, retried, failed).", ["outcome"])
+EMAIL_DELIVERY_DURATION = Histogram("email_delivery_duration_seconds", "Time to render and send one email.", buckets=HTTP_BUCKETS)
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware recording the count, latency and in-flight number of HTTP requests.
+
+    Requests are labelled with the route's path template (e.g. "/api/v1/book/one-book/{book_id}"), read from the
+    route FastAPI stores in the scope once it has matched, never with the raw path. Methods other than the
+    standard HTTP ones are labelled "other", so clients cannot create new series either. Written as plain ASGI
+    rather than `BaseHTTPMiddleware` so it adds no task or stream per request, and the labelled series are
+    looked up once per (method, route, status) instead of on every request.
+    """
+
+    def __init__(self, app, excluded_paths: tuple = ("/metrics",)):
+        self.app = app
+        self.excluded_paths = excluded_paths
+        self._series = {}
+
+    def _get_series(self, method: str, route: str, status_code: int) -> tuple:
+        key = (method, route, status_code)
+        series = self._series.get(key)
+        if series is None:
+            series = HTTP_REQUEST_DURATION.labels(method, route), HTTP_REQUESTS.labels(method, route, str(status_code))
+            self._series[key] = series
+        return series
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] in self.excluded_paths:
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        HTTP_REQUESTS_IN_PROGRESS.inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - started
+            HTTP_REQUESTS_IN_PROGRESS.dec()
+            method = scope["method"] if scope["method"] in HTTP_METHODS else OTHER_METHOD
+            duration, requests = self._get_series(method, getattr(scope.get("route"), "path", UNMATCHED_ROUTE), status_code)
+            duration.observe(elapsed)
+            requests.inc()
+
+
+class MongoCommandMetrics(monitoring.CommandListener):
+    """
+    A pymongo command listener recording the latency of every command per collection and command name.
+
+    The collection is only part of the started event, so it is kept until the command finishes; the duration
+    is the driver's own measurement.
+    """
+
+    def __init__(self):
+        self._collections = {}
+
+    @staticmethod
+    def _key(event) -> tuple:
+        return event.connection_id, event.request_id
+
+    def started(self, event):
+        command = event.command
+        # Most commands name their collection as the command's value; getMore names it under "collection"
+        collection = command.get("collection") if event.command_name == "getMore" else command.get(event.command_name)
+        self._collections[self._key(event)] = collection if isinstance(collection, str) else ""
+
+    def succeeded(self, event):
+        collection = self._collections.pop(self._key(event), "")
+        MONGO_COMMAND_DURATION.labels(collection, event.command_name).observe(event.duration_micros / 1_000_000)
+
+    def failed(self, event):
+        collection = self._collections.pop(self._key(event), "")
+        MONGO_COMMAND_DURATION.labels(collection, event.command_name).observe(event.duration_micros / 1_000_000)
+        MONGO_COMMAND_FAILURES.labels(collection, event.command_name).inc()
+
+
+class StatsCollector:
+    """
+    Exposes the `stats()` dictionaries of the caches, pools and workers as gauges.
+
+    Each registered source becomes a family of gauges named `<name>_<key>`; booleans are exported as 0/1 and
+    non-numeric values are skipped. The sources are read at scrape time, so they cost nothing per request.
+    """
+
+    def __init__(self):
+        self._sources = {}
+
+    def register(self, name: str, stats: Callable[[], dict]):
+        """
+        Register a callable returning a dictionary of figures, e.g. `response_cache.stats`.
+        """
+        self._sources[name] = stats
+
+    def collect(self):
+        for name, stats in list(self._sources.items()):
+            try:
+                values = stats()
+            except Exception as e:
+                print(f"Failed to collect the '{name}' stats: {e}")
+                continue
+            for key, value in values.items():
+                if isinstance(value, (bool, int, float)):
+                    yield GaugeMetricFamily(f"{name}_{key}", f"{key} as reported by {name}.stats().", value=float(value))
+
+
+mongo_command_metrics = MongoCommandMetrics()
+stats_collector = StatsCollector()
+REGISTRY.register(stats_collector)
+
+
+def render_metrics() -> tuple:
+    """
+    Return the current metrics in the Prometheus text format, with its content type.
+    """
+    return generate_latest(REGISTRY), CONTENT_TYPE_LATEST
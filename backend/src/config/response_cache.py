@@ -0,0 +1,338 @@
+import itertools
+import threading
+import time
+
+from collections import OrderedDict
+from typing import Callable, NamedTuple, Optional
+
+from src.config.env_setting import Settings
+
+try:
+    import redis.asyncio as redis_asyncio
+except ImportError:  # the "redis" backend is optional
+    redis_asyncio = None
+
+
+class CachedResponse(NamedTuple):
+    """A serialized read response and its ETag."""
+    body: bytes
+    etag: str
+
+
+class InMemoryResponseCacheBackend:
+    """
+    A per-worker LRU of cached responses, bounded by entry count and total bytes, grouped by user.
+
+    Each user's keys are indexed so `invalidate_user` drops exactly that user's entries. Every invalidation
+    also moves the user to a new generation; `set` refuses entries computed before the latest invalidation,
+    so a read racing a write can't cache the pre-write response.
+
+    Generations are only kept for users with cached entries, so they are bounded like the entries. Every other
+    user is at the floor generation, which never goes down: forgetting a user raises it to that user's
+    generation, and invalidating a user without entries raises it to a new one. A response read before an
+    invalidation therefore never matches again; the price is that a floor move also refuses the in-flight
+    stores of other users without entries, which are simply not cached.
+    """
+
+    def __init__(self, max_entries: int, max_bytes: int, ttl_seconds: float):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self._entries = OrderedDict()
+        self._user_keys = {}
+        self._bytes = 0
+        self._lock = threading.Lock()
+        # Only users with cached entries; every other user is at `_floor_generation`
+        self._generations = {}
+        self._floor_generation = 0
+        self._generation_counter = itertools.count(1)
+        self.evictions = 0
+
+    @staticmethod
+    def _entry_size(key, response: CachedResponse) -> int:
+        return len(response.body) + len(response.etag) + len(key[1])
+
+    def _remove(self, key):
+        response, _ = self._entries.pop(key)
+        self._bytes -= self._entry_size(key, response)
+        user_keys = self._user_keys.get(key[0])
+        if user_keys is not None:
+            user_keys.discard(key)
+            if not user_keys:
+                del self._user_keys[key[0]]
+                self._forget_generation(key[0])
+
+    def _forget_generation(self, user_id: str):
+        generation = self._generations.pop(user_id, None)
+        if generation is not None:
+            self._floor_generation = max(self._floor_generation, generation)
+
+    async def get(self, user_id: str, key: str) -> Optional[CachedResponse]:
+        with self._lock:
+            entry = self._entries.get((user_id, key))
+            if entry is None:
+                return None
+            response, expires_at = entry
+            if expires_at <= time.monotonic():
+                self._remove((user_id, key))
+                return None
+            self._entries.move_to_end((user_id, key))
+            return response
+
+    async def generation(self, user_id: str) -> int:
+        with self._lock:
+            return self._generations.get(user_id, self._floor_generation)
+
+    async def set(self, user_id: str, key: str, response: CachedResponse, generation: int) -> bool:
+        entry_key = (user_id, key)
+        size = self._entry_size(entry_key, response)
+        if size > self.max_bytes:
+            return False
+
+        with self._lock:
+            if self._generations.get(user_id, self._floor_generation) != generation:
+                return False
+            if entry_key in self._entries:
+                self._remove(entry_key)
+            self._entries[entry_key] = (response, time.monotonic() + self.ttl_seconds)
+            self._user_keys.setdefault(user_id, set()).add(entry_key)
+            self._generations[user_id] = generation
+            self._bytes += size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+            return True
+
+    async def invalidate_user(self, user_id: str) -> int:
+        with self._lock:
+            keys = list(self._user_keys.get(user_id, ()))
+            for key in keys:
+                self._remove(key)
+            # The user has no entries left, so their new generation is a new floor
+            self._floor_generation = next(self._generation_counter)
+            return len(keys)
+
+    async def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._user_keys.clear()
+            self._bytes = 0
+            self._generations.clear()
+            self._floor_generation = next(self._generation_counter)
+
+    async def close(self):
+        pass
+
+    def stats(self) -> dict:
+        return {
+            "backend": "memory",
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "max_entries": self.max_entries,
+            "max_bytes": self.max_bytes,
+            "evictions": self.evictions,
+            "tracked_generations": len(self._generations),
+        }
+
+
+# Store only if the user's generation is still the one read before the database query
+_SET_IF_GENERATION_SCRIPT = """
+if (redis.call('GET', KEYS[2]) or '0') == ARGV[1] then
+    redis.call('HSET', KEYS[1], ARGV[2], ARGV[3])
+    redis.call('EXPIRE', KEYS[1], ARGV[4])
+    return 1
+end
+return 0
+"""
+
+
+class RedisResponseCacheBackend:
+    """
+    A shared cache of responses in Redis (or any server speaking its protocol), one hash per user.
+
+    All workers see the same entries and invalidations: `invalidate_user` deletes the user's hash and bumps
+    the user's generation in one transaction, and `set` only writes if that generation has not moved. The
+    memory bound is the server's `maxmemory` policy; each hash expires `ttl_seconds` after its last write.
+    """
+
+    def __init__(self, url: str, ttl_seconds: int, client=None, prefix: str = "books-cache"):
+        if client is None:
+            if redis_asyncio is None:
+                raise RuntimeError("The 'redis' package is required for RESPONSE_CACHE_BACKEND=redis.")
+            client = redis_asyncio.from_url(url)
+        self.client = client
+        self.ttl_seconds = ttl_seconds
+        self.prefix = prefix
+        self._set_if_generation = client.register_script(_SET_IF_GENERATION_SCRIPT)
+
+    def _entries_key(self, user_id: str) -> str:
+        return f"{self.prefix}:entries:{user_id}"
+
+    def _generation_key(self, user_id: str) -> str:
+        return f"{self.prefix}:generation:{user_id}"
+
+    async def get(self, user_id: str, key: str) -> Optional[CachedResponse]:
+        value = await self.client.hget(self._entries_key(user_id), key)
+        if value is None:
+            return None
+        etag, _, body = value.partition(b"\n")
+        return CachedResponse(body, etag.decode("ascii"))
+
+    async def generation(self, user_id: str) -> int:
+        return int(await self.client.get(self._generation_key(user_id)) or 0)
+
+    async def set(self, user_id: str, key: str, response: CachedResponse, generation: int) -> bool:
+        value = response.etag.encode("ascii") + b"\n" + response.body
+        stored = await self._set_if_generation(
+            keys=[self._entries_key(user_id), self._generation_key(user_id)],
+            args=[str(generation), key, value, self.ttl_seconds],
+        )
+        return bool(stored)
+
+    async def invalidate_user(self, user_id: str) -> int:
+        async with self.client.pipeline(transaction=True) as pipeline:
+            pipeline.delete(self._entries_key(user_id))
+            pipeline.incr(self._generation_key(user_id))
+            pipeline.expire(self._generation_key(user_id), max(self.ttl_seconds * 2, 3600))
+            deleted, _, _ = await pipeline.execute()
+        return deleted
+
+    async def clear(self):
+        async for key in self.client.scan_iter(match=f"{self.prefix}:*"):
+            await self.client.delete(key)
+
+    async def close(self):
+        await self.client.aclose()
+
+    def stats(self) -> dict:
+        return {"backend": "redis", "ttl_seconds": self.ttl_seconds}
+
+
+class ResponseCache:
+    """
+    A read-through cache of serialized book listing responses, scoped per user.
+
+    `BookController` looks responses up before querying MongoDB and stores them (body bytes and ETag)
+    afterwards; every book mutation invalidates all cached responses of that user. Backend errors are
+    logged and treated as misses, so the cache can never take the read endpoints down.
+
+    Callers include the user's `catalog_version` (bumped in MongoDB by every book mutation) in the key, so
+    an entry can only be served while the catalog is unchanged. That keeps the per-worker "memory" backend
+    correct with several workers: a write handled by another worker only invalidates there, but the next
+    read here looks up a new key. Invalidation just frees the stale entries early.
+    """
+
+    def __init__(self, config: Settings = None, backend=None):
+        config = config or Settings()
+        if backend is None and config.RESPONSE_CACHE_BACKEND == "memory":
+            backend = InMemoryResponseCacheBackend(
+                config.RESPONSE_CACHE_MAX_ENTRIES, config.RESPONSE_CACHE_MAX_BYTES, config.RESPONSE_CACHE_TTL_SECONDS
+            )
+        elif backend is None and config.RESPONSE_CACHE_BACKEND == "redis":
+            backend = RedisResponseCacheBackend(config.RESPONSE_CACHE_URL, config.RESPONSE_CACHE_TTL_SECONDS)
+        self.backend = backend
+        self.enabled = backend is not None
+        self._invalidation_listeners = []
+
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.invalidations = 0
+        self.errors = 0
+
+    async def get(self, user_id: str, key: str) -> Optional[CachedResponse]:
+        """
+        Return the cached response for this user and request key, or None.
+        """
+        if not self.enabled:
+            return None
+        try:
+            response = await self.backend.get(user_id, key)
+        except Exception as e:
+            self.errors += 1
+            print(f"Response cache read failed: {e}")
+            return None
+
+        if response is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return response
+
+    async def generation(self, user_id: str) -> Optional[int]:
+        """
+        Read the user's cache generation; pass it to `set` once the response has been built.
+        """
+        if not self.enabled:
+            return None
+        try:
+            return await self.backend.generation(user_id)
+        except Exception as e:
+            self.errors += 1
+            print(f"Response cache read failed: {e}")
+            return None
+
+    async def set(self, user_id: str, key: str, response: CachedResponse, generation: Optional[int]):
+        """
+        Cache a response unless the user was invalidated since `generation` was read.
+        """
+        if not self.enabled or generation is None:
+            return
+        try:
+            if await self.backend.set(user_id, key, response, generation):
+                self.stores += 1
+        except Exception as e:
+            self.errors += 1
+            print(f"Response cache write failed: {e}")
+
+    async def invalidate(self, user_id: str, propagate: bool = True):
+        """
+        Drop every cached response of the user and, unless `propagate` is False, notify the invalidation listeners.
+        """
+        if not self.enabled:
+            return
+        try:
+            await self.backend.invalidate_user(user_id)
+            self.invalidations += 1
+        except Exception as e:
+            self.errors += 1
+            print(f"Response cache invalidation failed for user '{user_id}': {e}")
+        if propagate:
+            for listener in self._invalidation_listeners:
+                try:
+                    listener(user_id)
+                except Exception as e:
+                    print(f"Response cache invalidation listener failed: {e}")
+
+    def add_invalidation_listener(self, listener: Callable[[str], None]):
+        """
+        Register a callback invoked with the user id on every local invalidation.
+        """
+        self._invalidation_listeners.append(listener)
+
+    async def clear(self):
+        if self.enabled:
+            await self.backend.clear()
+
+    async def close(self):
+        if self.enabled:
+            await self.backend.close()
+
+    def stats(self) -> dict:
+        """
+        Return the hit ratio and counters, plus the backend's own figures.
+        """
+        lookups = self.hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+            "stores": self.stores,
+            "invalidations": self.invalidations,
+            "errors": self.errors,
+            **(self.backend.stats() if self.enabled else {}),
+        }
+
+
+response_cache = ResponseCache()
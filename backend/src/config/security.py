@@ -1,6 +1,115 @@
+import asyncio
 import bcrypt
+import threading
+
+from concurrent.futures import Executor, ThreadPoolExecutor, ProcessPoolExecutor
+from fastapi import HTTPException, status
 from typing import Optional
 
+from src.config.env_setting import Settings
+from src.config.metrics import PASSWORD_HASH_DURATION
+
+
+class PasswordHashingPool:
+    """
+    A bounded worker pool that runs bcrypt hashing and verification off the event loop.
+
+    bcrypt releases the GIL while hashing, so a thread pool gives real parallelism; a process pool
+    can be selected instead. At most `max_workers` hashes run at once; once `max_queue` calls are
+    waiting behind them new calls are rejected with 503 instead of piling up.
+
+    Attributes:
+        executor_type (str): "thread" or "process".
+        max_workers (int): Number of hashes allowed to run concurrently.
+        max_queue (int): Number of calls allowed to wait for a worker (0 means unbounded).
+        pending (int): Calls submitted and not yet finished (running + queued).
+        max_queue_depth (int): The highest queue depth observed.
+        completed (int): Calls finished.
+        rejected (int): Calls refused because the queue was full.
+    """
+
+    def __init__(self, executor_type: str = "thread", max_workers: int = 4, max_queue: int = 0):
+        if executor_type not in ("thread", "process"):
+            raise ValueError("executor_type must be 'thread' or 'process'.")
+
+        self.executor_type = executor_type
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._executor: Optional[Executor] = None
+        self._lock = threading.Lock()
+
+        self.pending = 0
+        self.max_queue_depth = 0
+        self.completed = 0
+        self.rejected = 0
+
+    @property
+    def queue_depth(self) -> int:
+        """
+        Calls waiting for a free worker.
+        """
+        return max(0, self.pending - self.max_workers)
+
+    def _get_executor(self) -> Executor:
+        with self._lock:
+            if self._executor is None:
+                if self.executor_type == "process":
+                    self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+                else:
+                    self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="bcrypt")
+            return self._executor
+
+    async def run(self, func, *args):
+        """
+        Run `func(*args)` in the pool and await its result.
+
+        :raises HTTPException: 503 if the queue is full.
+        """
+        with self._lock:
+            if self.max_queue and self.queue_depth >= self.max_queue:
+                self.rejected += 1
+                raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="Server is busy, please try again.")
+            self.pending += 1
+            self.max_queue_depth = max(self.max_queue_depth, self.queue_depth)
+
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._get_executor(), func, *args)
+        finally:
+            with self._lock:
+                self.pending -= 1
+                self.completed += 1
+
+    def shutdown(self):
+        """
+        Stop the worker pool; it is recreated on the next call.
+        """
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False)
+                self._executor = None
+
+    def stats(self) -> dict:
+        """
+        Return the pool size and queue-depth counters.
+        """
+        return {
+            "executor_type": self.executor_type,
+            "max_workers": self.max_workers,
+            "in_flight": min(self.pending, self.max_workers),
+            "queue_depth": self.queue_depth,
+            "max_queue_depth": self.max_queue_depth,
+            "completed": self.completed,
+            "rejected": self.rejected,
+        }
+
+
+Config = Settings()
+password_hashing_pool = PasswordHashingPool(
+    executor_type=Config.PASSWORD_HASH_EXECUTOR,
+    max_workers=Config.PASSWORD_HASH_MAX_WORKERS,
+    max_queue=Config.PASSWORD_HASH_MAX_QUEUE,
+)
+
 
 class PasswordManager:
     """
@@ -8,11 +117,12 @@ class PasswordManager:
     """
 
     @staticmethod
-    def encode_and_hash_password(password: str) -> str:
+    def encode_and_hash_password(password: str, rounds: Optional[int] = None) -> str:
         """
         Hash a password using bcrypt.
 
         :param password: The password to hash.
+        :param rounds: The bcrypt cost factor. Defaults to `BCRYPT_ROUNDS` from the settings.
         :return: The hashed password as a string.
         :raises ValueError: If the password is empty or invalid.
         """
@@ -24,7 +134,7 @@ class PasswordManager:
             encoded_password = password.encode('utf-8')
 
             # Generate salt and hash the password
-            salt = bcrypt.gensalt()
+            salt = bcrypt.gensalt(rounds=rounds or Config.BCRYPT_ROUNDS)
             hashed_password = bcrypt.hashpw(encoded_password, salt)
 
             # Return the hashed password as a string
@@ -55,6 +165,55 @@ class PasswordManager:
         except Exception as e:
             raise RuntimeError(f"Error verifying password: {str(e)}")
 
+    @staticmethod
+    def get_hash_rounds(hashed_password: str) -> Optional[int]:
+        """
+        Read the bcrypt cost factor stored in a hash (e.g. 12 for "$2b$12$...").
+
+        :param hashed_password: The hashed password.
+        :return: The cost factor, or None if the hash is not a bcrypt hash.
+        """
+        try:
+            return int(hashed_password.split("$")[2])
+        except (AttributeError, IndexError, ValueError):
+            return None
+
+    @staticmethod
+    def needs_rehash(hashed_password: str, rounds: Optional[int] = None) -> bool:
+        """
+        Check whether a stored hash uses a different cost factor than the configured one.
+
+        :param hashed_password: The hashed password.
+        :param rounds: The target cost factor. Defaults to `BCRYPT_ROUNDS` from the settings.
+        :return: True if the hash should be recomputed with the target cost.
+        """
+        current_rounds = PasswordManager.get_hash_rounds(hashed_password)
+        return current_rounds is not None and current_rounds != (rounds or Config.BCRYPT_ROUNDS)
+
+    @staticmethod
+    async def encode_and_hash_password_async(password: str, rounds: Optional[int] = None) -> str:
+        """
+        Hash a password in the password hashing pool without blocking the event loop.
+
+        :param password: The password to hash.
+        :param rounds: The bcrypt cost factor. Defaults to `BCRYPT_ROUNDS` from the settings.
+        :return: The hashed password as a string.
+        """
+        with PASSWORD_HASH_DURATION.labels("hash").time():
+            return await password_hashing_pool.run(PasswordManager.encode_and_hash_password, password, rounds)
+
+    @staticmethod
+    async def verify_password_async(password: str, hashed_password: str) -> bool:
+        """
+        Verify a password in the password hashing pool without blocking the event loop.
+
+        :param password: The password to verify.
+        :param hashed_password: The hashed password to compare against.
+        :return: True if the password matches the hashed password, False otherwise.
+        """
+        with PASSWORD_HASH_DURATION.labels("verify").time():
+            return await password_hashing_pool.run(PasswordManager.verify_password, password, hashed_password)
+
     @staticmethod
     def is_password_strong_enough(password: str) -> bool:
         """
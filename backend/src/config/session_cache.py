@@ -0,0 +1,74 @@
+from typing import Callable
+
+from src.config.env_setting import Settings
+from src.utils.ttl_cache import TTLCache
+
+
+# Never trust a cached session for longer than this share of the access token lifetime
+MAX_TTL_FRACTION_OF_ACCESS_EXPIRY = 0.1
+
+
+class SessionCache:
+    """
+    An in-process LRU+TTL cache of validated user sessions, keyed by session id.
+
+    `TokenValidator` reads it before querying `user_sessions`, and `logout_user` invalidates the
+    session explicitly. Other workers can be told about an invalidation through the listeners
+    registered with `add_invalidation_listener` (e.g. a pub/sub publisher); the receiving side
+    calls `invalidate(session_id, propagate=False)`.
+    """
+
+    def __init__(self, config: Settings = None):
+        config = config or Settings()
+        self.enabled = config.SESSION_CACHE_ENABLED
+        self.ttl_seconds = min(
+            config.SESSION_CACHE_TTL_SECONDS,
+            config.JWT_ACCESS_EXPIRY_MINUTES * 60 * MAX_TTL_FRACTION_OF_ACCESS_EXPIRY,
+        )
+        self._cache = TTLCache(config.SESSION_CACHE_MAX_SIZE, self.ttl_seconds)
+        self._invalidation_listeners = []
+
+    def get(self, session_id: str):
+        """
+        Return the cached session document, or None.
+        """
+        if not self.enabled or not session_id:
+            return None
+        return self._cache.get(session_id)
+
+    def set(self, session_id: str, session: dict):
+        """
+        Cache a session document that was just validated against the database.
+        """
+        if self.enabled and session_id:
+            self._cache.set(session_id, session)
+
+    def invalidate(self, session_id: str, propagate: bool = True):
+        """
+        Drop a session from the cache and, unless `propagate` is False, notify the invalidation listeners.
+        """
+        self._cache.delete(session_id)
+        if propagate:
+            for listener in self._invalidation_listeners:
+                try:
+                    listener(session_id)
+                except Exception as e:
+                    print(f"Session invalidation listener failed: {e}")
+
+    def add_invalidation_listener(self, listener: Callable[[str], None]):
+        """
+        Register a callback invoked with the session id on every local invalidation.
+        """
+        self._invalidation_listeners.append(listener)
+
+    def clear(self):
+        self._cache.clear()
+
+    def stats(self) -> dict:
+        """
+        Return hit/miss/eviction counters.
+        """
+        return {"enabled": self.enabled, "ttl_seconds": self.ttl_seconds, **self._cache.stats()}
+
+
+session_cache = SessionCache()
@@ -1,12 +1,34 @@
+import orjson
+
 from fastapi import HTTPException, status
 from typing import List
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse, Response, StreamingResponse
 from datetime import datetime
+from pymongo import ASCENDING, DESCENDING, InsertOne, UpdateOne, DeleteOne, ReturnDocument
+from pymongo.errors import BulkWriteError
+from bson.codec_options import CodecOptions
+from bson.raw_bson import RawBSONDocument
 
 from src.config.database import MongoDBConnection
-from src.utils.generate_unique_key import generate_unique_key
+from src.utils.id_generator import new_id, new_ids
+from src.utils.pagination_cursor import encode_cursor, decode_cursor
+from src.utils.etag import make_etag, etag_matches
 from src.serializers.book_serializer import book_data, all_books_data
+from src.serializers.raw_book_serializer import raw_book_json, raw_books_json
+from src.schemas.book_schema import Book, BookQueryParams
 from src.config.env_setting import Settings
+from src.config.response_cache import response_cache, CachedResponse
+from src.services.book_stats_services import BookStatsServices, STATS_FIELDS
+
+
+# Only read the fields the API returns
+BOOK_PROJECTION = {"_id": 0, **{field: 1 for field in Book.model_fields}}
+
+# Clients may keep read responses but must revalidate them (If-None-Match) before every reuse
+READ_CACHE_CONTROL = "private, no-cache"
+
+# Leave documents as undecoded BSON bytes for the raw read path
+RAW_BSON_CODEC_OPTIONS = CodecOptions(document_class=RawBSONDocument)
 
 
 class BookController:
@@ -18,6 +40,7 @@ class BookController:
         self.Config = Settings()
         self.mongo_db_connection = MongoDBConnection(self.Config.MONGO_URI, self.Config.DB_NAME)
         self.collection_name = "books"
+        self.book_stats_services = BookStatsServices()
 
     def _start_connection(self):
         """
@@ -27,10 +50,54 @@ class BookController:
 
     def _get_collection(self, collection_name: str):
         """
-        Helper method to get MongoDB collection.
+        Helper method to get MongoDB collection with awaitable (non-blocking) methods.
+        """
+        return self.mongo_db_connection.get_async_collection(collection_name)
+
+    def _get_stats_collection(self):
+        """
+        Helper method to get the per-user book statistics collection.
+        """
+        return self._get_collection(self.book_stats_services.collection_name)
+
+    def _get_read_collection(self, collection_name: str):
+        """
+        Helper method to get the collection used by the read endpoints, returning raw BSON documents when
+        `BOOK_RAW_BSON_READS` is enabled.
+        """
+        collection = self._get_collection(collection_name)
+        if self.Config.BOOK_RAW_BSON_READS:
+            return collection.with_options(codec_options=RAW_BSON_CODEC_OPTIONS)
+        return collection
+
+    @staticmethod
+    def _raw_json_response(status_code: int, key: str, raw_json: bytes, content: dict, headers: dict = None) -> Response:
+        """
+        Helper method to build a JSON response around an already serialized value stored under `key`.
+        """
+        body = b'{"' + key.encode("utf-8") + b'":' + raw_json + b"," + orjson.dumps(content)[1:]
+        return Response(content=body, status_code=status_code, media_type="application/json", headers=headers)
+
+    @staticmethod
+    def _etag_headers(etag: str) -> dict:
+        """
+        Helper method to build the validator headers of a cacheable read.
+        """
+        return {"ETag": etag, "Cache-Control": READ_CACHE_CONTROL}
+
+    def _not_modified(self, etag: str) -> Response:
+        """
+        Helper method to answer a conditional GET whose ETag still matches, without a body.
+        """
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=self._etag_headers(etag))
+
+    def _cached_response(self, cached: CachedResponse, if_none_match: str) -> Response:
+        """
+        Helper method to answer a read from the response cache.
         """
-        # self.mongo_db_connection.start_connection()
-        return self.mongo_db_connection.get_collection(collection_name)
+        if etag_matches(if_none_match, cached.etag):
+            return self._not_modified(cached.etag)
+        return Response(content=cached.body, status_code=status.HTTP_200_OK, media_type="application/json", headers=self._etag_headers(cached.etag))
 
     def _close_connection(self):
         """
@@ -38,16 +105,13 @@ class BookController:
         """
         self.mongo_db_connection.close_connection()
 
-    async def add_book(self, data: dict, user_id: str) -> dict:
+    def _build_add_payload(self, data: dict, user_id: str, timestamp: str, book_id: str = None) -> dict:
         """
-        Add a new book for a user.
+        Helper method to build the document stored for a new book.
         """
-        unique_id = generate_unique_key()
-        timestamp = str(datetime.now())
-
-        add_payload = {
+        return {
             "user_id": user_id,
-            "book_id": unique_id,
+            "book_id": book_id or new_id(),
             "category": data.get("category"),
             "book_title": data.get("book_title"),
             "book_author": data.get("book_author"),
@@ -62,63 +126,507 @@ class BookController:
             "updated_at": timestamp,
         }
 
+    def _validate_batch_size(self, items: list):
+        """
+        Helper method to reject empty or oversized bulk requests.
+        """
+        if not items or len(items) > self.Config.BOOK_BULK_MAX_BATCH_SIZE:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"A bulk request must contain between 1 and {self.Config.BOOK_BULK_MAX_BATCH_SIZE} items.",
+            )
+
+    @staticmethod
+    def _validate_unique_book_ids(book_ids: list):
+        """
+        Helper method to reject bulk requests naming the same book more than once.
+        """
+        seen, duplicates = set(), []
+        for book_id in book_ids:
+            if book_id in seen and book_id not in duplicates:
+                duplicates.append(book_id)
+            seen.add(book_id)
+        if duplicates:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Each book may appear only once in a bulk request, repeated: {', '.join(duplicates)}.",
+            )
+
+    async def _bulk_write(self, book_collection, operations: list) -> tuple:
+        """
+        Helper method to run one unordered bulk_write.
+
+        Returns the server's counts (`nInserted`, `nMatched`, `nRemoved`, ...) and the write errors keyed by
+        operation index.
+        """
+        try:
+            result = await book_collection.bulk_write(operations, ordered=False)
+            return result.bulk_api_result, {}
+        except BulkWriteError as e:
+            return e.details, {error["index"]: error.get("errmsg", "Write failed") for error in e.details.get("writeErrors", [])}
+
+    async def _find_existing_books(self, book_collection, user_id: str, book_ids: list) -> dict:
+        """
+        Helper method to fetch which of the given books belong to the user, in one query.
+        The returned pre-images (keyed by book id) carry the fields the stats are computed from.
+        """
+        cursor = book_collection.find(
+            {"user_id": user_id, "book_id": {"$in": book_ids}},
+            {"_id": 0, **{field: 1 for field in STATS_FIELDS}},
+        )
+        return {book["book_id"]: book for book in await cursor.to_list()}
+
+    @staticmethod
+    def _bulk_response(action: str, results: list) -> ORJSONResponse:
+        """
+        Helper method to build the per-item response of a bulk endpoint.
+        """
+        failed = [result for result in results if result["status"] in ("failed", "not_found", "conflict")]
+        return ORJSONResponse(
+            status_code=status.HTTP_200_OK,
+            content={
+                "status": "partial_success" if failed else "success",
+                "message": f"{len(results) - len(failed)} of {len(results)} books {action} successfully.",
+                "results": results,
+            },
+        )
+
+    async def add_book(self, data: dict, user_id: str) -> dict:
+        """
+        Add a new book for a user.
+        """
+        add_payload = self._build_add_payload(data, user_id, str(datetime.now()))
+
         try:
             self._start_connection()
 
             book_collection = self._get_collection(self.collection_name)
-            res = book_collection.insert_one(add_payload)
+            res = await book_collection.insert_one(add_payload)
             if res.inserted_id:
-                inserted_book = book_collection.find_one({"book_id": unique_id})
-                if inserted_book:
-                    serialized_book = book_data(inserted_book)
-                    return JSONResponse(
-                        status_code=status.HTTP_201_CREATED,
-                        content={"status": "success", "message": "Book added successfully.", "book": serialized_book},
-                    )
-                raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Failed to get inserted book")
+                await self.book_stats_services.record_added(self._get_stats_collection(), user_id, [add_payload])
+                await response_cache.invalidate(user_id)
+                # The acknowledged insert stored exactly this payload, no need to read it back
+                serialized_book = book_data(add_payload)
+                return ORJSONResponse(
+                    status_code=status.HTTP_201_CREATED,
+                    content={"status": "success", "message": "Book added successfully.", "book": serialized_book},
+                )
             raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Failed to add book")
         except Exception as e:
             raise e
         finally:
             self._close_connection()
 
-    async def get_all_books(self, user_id: str) -> List[dict]:
+    async def bulk_add_books(self, items: List[dict], user_id: str) -> dict:
         """
-        Fetch all books for a user.
+        Add many books for a user with a single unordered bulk_write.
         """
+        self._validate_batch_size(items)
+        timestamp = str(datetime.now())
+        book_ids = new_ids(len(items))
+        payloads = [self._build_add_payload(data, user_id, timestamp, book_id) for data, book_id in zip(items, book_ids)]
+
         try:
             self._start_connection()
 
             book_collection = self._get_collection(self.collection_name)
-            all_books = book_collection.find({"user_id": user_id})
-            if all_books:
-                serialized_books = all_books_data(all_books)
-                return JSONResponse(
-                    status_code=status.HTTP_200_OK,
-                    content={"status": "success", "message": "All the books fetched successfully.", "books": serialized_books},
-                )
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="No books found")
+            _, errors = await self._bulk_write(book_collection, [InsertOne(payload) for payload in payloads])
+
+            results = []
+            for index, payload in enumerate(payloads):
+                if index in errors:
+                    results.append({"index": index, "status": "failed", "error": errors[index]})
+                else:
+                    results.append({"index": index, "status": "created", "book": book_data(payload)})
+
+            added_books = [payload for index, payload in enumerate(payloads) if index not in errors]
+            await self.book_stats_services.record_added(self._get_stats_collection(), user_id, added_books)
+            await response_cache.invalidate(user_id)
+            return self._bulk_response("added", results)
         except Exception as e:
             raise e
         finally:
             self._close_connection()
 
-    async def get_book_by_id(self, user_id: str, book_id: str) -> dict:
+    async def bulk_update_books(self, items: List[dict], user_id: str) -> dict:
         """
-        Fetch a specific book by ID for a user.
+        Update many books for a user with a single unordered bulk_write.
+
+        Each item carries its `book_id` next to the fields to set; a book may appear only once. Items whose book
+        does not belong to the user are reported as `not_found` without being sent to the server. The pre-images
+        read for that check are also what the stats deltas are computed from. If the server matched fewer books
+        than were sent, a concurrent delete got in between: the books that are gone are reported as `not_found`
+        and the user's stats are recomputed from the books instead.
         """
+        self._validate_batch_size(items)
+        self._validate_unique_book_ids([item["book_id"] for item in items])
+        timestamp = str(datetime.now())
+
         try:
             self._start_connection()
 
             book_collection = self._get_collection(self.collection_name)
-            book = book_collection.find_one({"user_id": user_id, "book_id": book_id})
-            if book:
+            existing_books = await self._find_existing_books(book_collection, user_id, [item["book_id"] for item in items])
+
+            operations, operation_item_indexes = [], []
+            for index, item in enumerate(items):
+                if item["book_id"] in existing_books:
+                    update_payload = {key: value for key, value in item.items() if key != "book_id"}
+                    update_payload["updated_at"] = timestamp
+                    operations.append(UpdateOne({"user_id": user_id, "book_id": item["book_id"]}, {"$set": update_payload}))
+                    operation_item_indexes.append(index)
+
+            counts, errors = await self._bulk_write(book_collection, operations) if operations else ({}, {})
+            failed_items = {operation_item_indexes[operation_index]: error for operation_index, error in errors.items()}
+            sent_book_ids = [items[index]["book_id"] for index in operation_item_indexes if index not in failed_items]
+
+            vanished_book_ids = set()
+            raced = counts.get("nMatched", 0) != len(sent_book_ids)
+            if raced:
+                still_existing = await self._find_existing_books(book_collection, user_id, sent_book_ids)
+                vanished_book_ids = set(sent_book_ids) - set(still_existing)
+
+            results, changes = [], []
+            for index, item in enumerate(items):
+                if item["book_id"] not in existing_books or item["book_id"] in vanished_book_ids:
+                    results.append({"index": index, "book_id": item["book_id"], "status": "not_found"})
+                elif index in failed_items:
+                    results.append({"index": index, "book_id": item["book_id"], "status": "failed", "error": failed_items[index]})
+                else:
+                    results.append({"index": index, "book_id": item["book_id"], "status": "updated"})
+                    before = existing_books[item["book_id"]]
+                    changes.append((before, {**before, **item}))
+
+            if raced:
+                # A vanished book may have been updated here before it was deleted, so its delta is unknown
+                await self.book_stats_services.recompute(book_collection, self._get_stats_collection(), user_id)
+            else:
+                await self.book_stats_services.record_updated(self._get_stats_collection(), user_id, changes)
+            await response_cache.invalidate(user_id)
+            return self._bulk_response("updated", results)
+        except Exception as e:
+            raise e
+        finally:
+            self._close_connection()
+
+    async def bulk_delete_books(self, book_ids: List[str], user_id: str) -> dict:
+        """
+        Delete many books for a user with a single unordered bulk_write.
+
+        A book may appear only once. Books that do not belong to the user are reported as `not_found`. If the
+        server removed fewer books than were sent, a concurrent delete got in between and it cannot be told
+        which of them this request removed: those items are reported as `conflict` (the books are gone either way)
+        and the user's stats are recomputed from the books. Only deletes the server confirmed feed the deltas.
+        """
+        self._validate_batch_size(book_ids)
+        self._validate_unique_book_ids(book_ids)
+
+        try:
+            self._start_connection()
+
+            book_collection = self._get_collection(self.collection_name)
+            existing_books = await self._find_existing_books(book_collection, user_id, book_ids)
+
+            operations, operation_item_indexes = [], []
+            for index, book_id in enumerate(book_ids):
+                if book_id in existing_books:
+                    operations.append(DeleteOne({"user_id": user_id, "book_id": book_id}))
+                    operation_item_indexes.append(index)
+
+            counts, errors = await self._bulk_write(book_collection, operations) if operations else ({}, {})
+            failed_items = {operation_item_indexes[operation_index]: error for operation_index, error in errors.items()}
+            sent_count = len(operations) - len(failed_items)
+            removed_count = counts.get("nRemoved", 0)
+            # Nothing removed means every one of them was deleted by someone else
+            outcome = "deleted" if removed_count == sent_count else ("not_found" if removed_count == 0 else "conflict")
+
+            results, deleted_books = [], []
+            for index, book_id in enumerate(book_ids):
+                if book_id not in existing_books:
+                    results.append({"index": index, "book_id": book_id, "status": "not_found"})
+                elif index in failed_items:
+                    results.append({"index": index, "book_id": book_id, "status": "failed", "error": failed_items[index]})
+                elif outcome == "conflict":
+                    results.append({"index": index, "book_id": book_id, "status": "conflict", "error": "Deleted concurrently by another request."})
+                else:
+                    results.append({"index": index, "book_id": book_id, "status": outcome})
+                    if outcome == "deleted":
+                        deleted_books.append(existing_books[book_id])
+
+            if outcome == "conflict":
+                await self.book_stats_services.recompute(book_collection, self._get_stats_collection(), user_id)
+            else:
+                await self.book_stats_services.record_deleted(self._get_stats_collection(), user_id, deleted_books)
+            await response_cache.invalidate(user_id)
+            return self._bulk_response("deleted", results)
+        except Exception as e:
+            raise e
+        finally:
+            self._close_connection()
+
+    @staticmethod
+    def _build_filter_query(user_id: str, params: BookQueryParams) -> dict:
+        """
+        Helper method to translate the listing filters into a Mongo query.
+        """
+        query = {"user_id": user_id}
+        if params.category is not None:
+            query["category"] = params.category
+        if params.language is not None:
+            query["language"] = params.language
+
+        ranges = (
+            ("book_price", params.min_price, params.max_price),
+            ("book_rating", params.min_rating, params.max_rating),
+            ("published_date",
+             params.published_from.isoformat() if params.published_from else None,
+             params.published_to.isoformat() if params.published_to else None),
+        )
+        for field, low, high in ranges:
+            condition = {}
+            if low is not None:
+                condition["$gte"] = low
+            if high is not None:
+                condition["$lte"] = high
+            if condition:
+                query[field] = condition
+        return query
+
+    @staticmethod
+    def _build_page_query(query: dict, params: BookQueryParams, after: str) -> dict:
+        """
+        Helper method to add the keyset condition of the `after` cursor to a listing query.
+
+        Pages are ordered by `(sort_by, book_id)`; the cursor holds both values of the previous page's last book.
+        """
+        position = decode_cursor(after)
+        last_book_id = position.get("book_id")
+        if not isinstance(last_book_id, str):
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid pagination cursor!")
+        if position.get("sort_by", "book_id") != params.sort_by or position.get("order", "asc") != params.order:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Pagination cursor does not match the requested sort!")
+
+        operator = "$gt" if params.order == "asc" else "$lt"
+        if params.sort_by == "book_id":
+            return {**query, "book_id": {operator: last_book_id}}
+
+        last_value = position.get("value")
+        if isinstance(last_value, bool) or not isinstance(last_value, (str, int, float)):
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid pagination cursor!")
+
+        # Bound the index scan on the sort field, then skip the ties already returned
+        sort_condition = dict(query.get(params.sort_by, {}))
+        sort_condition["$gte" if params.order == "asc" else "$lte"] = last_value
+        return {
+            **query,
+            params.sort_by: sort_condition,
+            "$or": [{params.sort_by: {operator: last_value}}, {"book_id": {operator: last_book_id}}],
+        }
+
+    @staticmethod
+    def _build_next_cursor(last_book, params: BookQueryParams) -> str:
+        """
+        Helper method to encode the keyset position after `last_book`.
+        """
+        position = {"book_id": last_book["book_id"]}
+        if params.sort_by != "book_id":
+            position.update({"sort_by": params.sort_by, "value": last_book[params.sort_by]})
+        if params.order != "asc":
+            position["order"] = params.order
+        return encode_cursor(position)
+
+    async def get_all_books(self, user_id: str, limit: int = None, after: str = None, include_total: bool = False,
+                            params: BookQueryParams = None, if_none_match: str = None) -> List[dict]:
+        """
+        Fetch one page of a user's books, optionally filtered and sorted.
+
+        Pages are keyset-paginated on `(sort_by, book_id)`: the opaque `after` cursor holds the position of the
+        previous page's last book, so every page costs the same no matter how deep the client pages. Each
+        filter/sort combination is served by one of the `books_user_id_*` compound indexes.
+
+        The ETag is derived from the user's catalog version and the request parameters. The version is read
+        before the page, so a concurrent mutation can only make the tag older than the body, never newer.
+        A matching `If-None-Match` is answered with 304 before the books are queried.
+
+        Responses are kept in the per-user `response_cache` under the catalog version they were built at, so a
+        mutation made through any worker makes them unreachable even where no invalidation arrived.
+        """
+        params = params or BookQueryParams()
+        limit = min(limit or self.Config.BOOK_PAGE_DEFAULT_LIMIT, self.Config.BOOK_PAGE_MAX_LIMIT)
+        filter_query = self._build_filter_query(user_id, params)
+        query = self._build_page_query(filter_query, params, after) if after else filter_query
+
+        direction = ASCENDING if params.order == "asc" else DESCENDING
+        sort = [("book_id", direction)]
+        if params.sort_by != "book_id":
+            sort.insert(0, (params.sort_by, direction))
+
+        try:
+            self._start_connection()
+
+            catalog_version = await self.book_stats_services.get_catalog_version(self._get_stats_collection(), user_id)
+            etag = make_etag("books", user_id, catalog_version, limit, after, include_total, params.model_dump_json())
+            if etag_matches(if_none_match, etag):
+                return self._not_modified(etag)
+
+            cache_key = make_etag("books", catalog_version, limit, after, include_total, params.model_dump_json())
+            cached = await response_cache.get(user_id, cache_key)
+            if cached:
+                return self._cached_response(cached, if_none_match)
+            cache_generation = await response_cache.generation(user_id)
+
+            book_collection = self._get_read_collection(self.collection_name)
+            # Read one extra document to know whether another page exists
+            page = await book_collection.find(query, BOOK_PROJECTION).sort(sort).to_list(limit + 1)
+            has_more = len(page) > limit
+            page = page[:limit]
+
+            content = {
+                "status": "success",
+                "message": "All the books fetched successfully.",
+                "has_more": has_more,
+                "next_cursor": self._build_next_cursor(page[-1], params) if has_more else None,
+            }
+            if include_total:
+                content["total_count"] = await book_collection.count_documents(filter_query)
+
+            if self.Config.BOOK_RAW_BSON_READS:
+                response = self._raw_json_response(status.HTTP_200_OK, "books", raw_books_json(page), content, self._etag_headers(etag))
+            else:
+                response = ORJSONResponse(status_code=status.HTTP_200_OK, content={"books": all_books_data(page), **content}, headers=self._etag_headers(etag))
+            await response_cache.set(user_id, cache_key, CachedResponse(response.body, etag), cache_generation)
+            return response
+        except Exception as e:
+            raise e
+        finally:
+            self._close_connection()
+
+    async def search_books(self, user_id: str, q: str, limit: int = None, after: str = None) -> dict:
+        """
+        Full-text search over the title, author and publisher of a user's books, most relevant first.
+
+        The search runs on the `(user_id, text)` index. Relevance is only known to the server, so pages
+        can't be keyed on it: the opaque `after` cursor holds an offset instead. Every match is scored
+        before the first page is returned anyway, so skipping ahead adds little on top of that.
+        """
+        search_terms = q.strip()
+        if not search_terms:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Search query must not be empty!")
+
+        limit = min(limit or self.Config.BOOK_PAGE_DEFAULT_LIMIT, self.Config.BOOK_PAGE_MAX_LIMIT)
+        offset = 0
+        if after:
+            offset = decode_cursor(after).get("offset")
+            if not isinstance(offset, int) or isinstance(offset, bool) or offset < 0:
+                raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid pagination cursor!")
+
+        try:
+            self._start_connection()
+
+            book_collection = self._get_collection(self.collection_name)
+            score = {"$meta": "textScore"}
+            cursor = book_collection.find(
+                {"user_id": user_id, "$text": {"$search": search_terms}},
+                {**BOOK_PROJECTION, "score": score},
+            ).sort([("score", score), ("book_id", ASCENDING)])
+            if offset:
+                cursor = cursor.skip(offset)
+            # Read one extra document to know whether another page exists
+            page = await cursor.to_list(limit + 1)
+            has_more = len(page) > limit
+            page = page[:limit]
+
+            return ORJSONResponse(
+                status_code=status.HTTP_200_OK,
+                content={
+                    "status": "success",
+                    "message": "Books searched successfully.",
+                    "books": all_books_data(page),
+                    "has_more": has_more,
+                    "next_cursor": encode_cursor({"offset": offset + limit}) if has_more else None,
+                },
+            )
+        except Exception as e:
+            raise e
+        finally:
+            self._close_connection()
+
+    async def _stream_books(self, user_id: str, batch_size: int):
+        """
+        Yield one serialized book per line straight from the Mongo cursor.
+        """
+        self._start_connection()
+
+        book_collection = self._get_collection(self.collection_name)
+        cursor = book_collection.find({"user_id": user_id}, BOOK_PROJECTION).sort("book_id", ASCENDING).batch_size(batch_size)
+        async for book in cursor:
+            yield orjson.dumps(book_data(book)) + b"\n"
+
+    async def export_books(self, user_id: str, batch_size: int = None) -> StreamingResponse:
+        """
+        Stream every book of a user as NDJSON.
+
+        Only one cursor batch is held in memory at a time, so memory stays flat regardless of catalog size.
+        """
+        batch_size = batch_size or self.Config.BOOK_EXPORT_BATCH_SIZE
+        return StreamingResponse(
+            self._stream_books(user_id, batch_size),
+            status_code=status.HTTP_200_OK,
+            media_type="application/x-ndjson",
+            headers={"Content-Disposition": 'attachment; filename="books.ndjson"'},
+        )
+
+    async def get_book_by_id(self, user_id: str, book_id: str, if_none_match: str = None) -> dict:
+        """
+        Fetch a specific book by ID for a user.
+
+        The ETag is derived from `book_id` and `updated_at`; a matching `If-None-Match` is answered with 304
+        without serializing the book. The response is not cached: a cache entry could only be trusted after
+        reading the user's catalog version, which costs the same one query as reading the book itself.
+        """
+        try:
+            self._start_connection()
+
+            book_collection = self._get_read_collection(self.collection_name)
+            book = await book_collection.find_one({"user_id": user_id, "book_id": book_id}, BOOK_PROJECTION)
+            if not book:
+                raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Book not found")
+
+            etag = make_etag("book", book["book_id"], book["updated_at"])
+            if etag_matches(if_none_match, etag):
+                return self._not_modified(etag)
+
+            if self.Config.BOOK_RAW_BSON_READS:
+                response = self._raw_json_response(
+                    status.HTTP_200_OK, "book", raw_book_json(book.raw),
+                    {"status": "success", "message": "Book fetched successfully."},
+                    self._etag_headers(etag),
+                )
+            else:
                 serialized_book = book_data(book)
-                return JSONResponse(
+                response = ORJSONResponse(
                     status_code=status.HTTP_200_OK,
                     content={"status": "success", "message": "Book fetched successfully.", "book": serialized_book},
+                    headers=self._etag_headers(etag),
                 )
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Book not found")
+            return response
+        except Exception as e:
+            raise e
+        finally:
+            self._close_connection()
+
+    async def get_book_stats(self, user_id: str) -> dict:
+        """
+        Fetch the catalog statistics of a user from their summary document (one lookup, independent of catalog size).
+        """
+        try:
+            self._start_connection()
+
+            stats = await self.book_stats_services.get_stats(self._get_stats_collection(), user_id)
+            return ORJSONResponse(
+                status_code=status.HTTP_200_OK,
+                content={"status": "success", "message": "Book statistics fetched successfully.", "stats": stats},
+            )
         except Exception as e:
             raise e
         finally:
@@ -133,18 +641,24 @@ class BookController:
 
             book_collection = self._get_collection(self.collection_name)
             update_payload["updated_at"] = str(datetime.now())
-            update_res = book_collection.update_one(
-                {"user_id": user_id, "book_id": book_id}, {"$set": update_payload}
+            # Update and read the pre-image in a single round trip: the post-image is the pre-image plus
+            # the $set fields, and the pair gives the stats deltas
+            previous_book = await book_collection.find_one_and_update(
+                {"user_id": user_id, "book_id": book_id},
+                {"$set": update_payload},
+                projection=BOOK_PROJECTION,
+                return_document=ReturnDocument.BEFORE,
             )
-            if update_res.modified_count:
-                updated_book = book_collection.find_one({"user_id": user_id, "book_id": book_id})
-                if updated_book:
-                    serialized_book = book_data(updated_book)
-                    return JSONResponse(
-                        status_code=status.HTTP_200_OK,
-                        content={"status": "success", "message": "Book updated successfully.", "book": serialized_book},
-                    )
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Book not found or no changes made")
+            if previous_book:
+                updated_book = {**previous_book, **update_payload}
+                await self.book_stats_services.record_updated(self._get_stats_collection(), user_id, [(previous_book, updated_book)])
+                await response_cache.invalidate(user_id)
+                serialized_book = book_data(updated_book)
+                return ORJSONResponse(
+                    status_code=status.HTTP_200_OK,
+                    content={"status": "success", "message": "Book updated successfully.", "book": serialized_book},
+                )
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Book not found")
         except Exception as e:
             raise e
         finally:
@@ -158,9 +672,15 @@ class BookController:
             self._start_connection()
             
             book_collection = self._get_collection(self.collection_name)
-            delete_res = book_collection.delete_one({"user_id": user_id, "book_id": book_id})
-            if delete_res.deleted_count:
-                return JSONResponse(
+            # Delete and read the removed book in one round trip, for the stats deltas
+            deleted_book = await book_collection.find_one_and_delete(
+                {"user_id": user_id, "book_id": book_id},
+                projection={"_id": 0, **{field: 1 for field in STATS_FIELDS}},
+            )
+            if deleted_book:
+                await self.book_stats_services.record_deleted(self._get_stats_collection(), user_id, [deleted_book])
+                await response_cache.invalidate(user_id)
+                return ORJSONResponse(
                     status_code=status.HTTP_200_OK,
                     content={"status": "success", "message": "Book deleted successfully."},
                 )
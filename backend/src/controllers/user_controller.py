@@ -4,13 +4,15 @@ from fastapi import HTTPException, status, BackgroundTasks
 from datetime import datetime, timezone
 
 from src.config.database import MongoDBConnection
+from src.config.session_cache import session_cache
 from src.serializers.user_serializer import individual_user_data
 from src.config.security import PasswordManager
-from src.utils.generate_unique_key import generate_unique_key
+from src.utils.id_generator import new_id
 from src.config.jwt_token import JWTManager
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 from src.config.env_setting import Settings
 from src.services.email_services import EmailServices
+from src.schemas.user_schema import AuthContext
 
 
 class UserControllersClass:
@@ -30,10 +32,9 @@ class UserControllersClass:
 
     def _get_collection(self, collection_name: str):
         """
-        Helper method to get MongoDB collection.
+        Helper method to get MongoDB collection with awaitable (non-blocking) methods.
         """
-        # self.mongo_db_connection.start_connection()
-        return self.mongo_db_connection.get_collection(collection_name)
+        return self.mongo_db_connection.get_async_collection(collection_name)
 
     def _close_connection(self):
         """
@@ -88,13 +89,13 @@ class UserControllersClass:
         if not res:
             raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Failed to send account verification email!")
         
-        return JSONResponse(status_code=status.HTTP_200_OK, content={"status": "failed", "message": "User is not verified! Please check your email and verify your account.", "user": individual_user_data(fetched_user)})
+        return ORJSONResponse(status_code=status.HTTP_200_OK, content={"status": "failed", "message": "User is not verified! Please check your email and verify your account.", "user": individual_user_data(fetched_user)})
     
     async def _handle_login_success(self, fetched_user):
         """
         Handle the successful login and generate JWT access and refresh tokens.
         """
-        session_id = generate_unique_key()
+        session_id = new_id()
 
         # Create JWT tokens
         jwt_payload = {"user_id": fetched_user["user_id"], "email": fetched_user["email"], "session_id": session_id}
@@ -102,10 +103,10 @@ class UserControllersClass:
         jwt_refresh_token = self.jwt_manager.create_refresh_token(jwt_payload)
 
         # Store session and refresh token in the database
-        self._store_user_session(fetched_user, session_id)
-        self._store_refresh_token(fetched_user, jwt_refresh_token)
+        await self._store_user_session(fetched_user, session_id)
+        await self._store_refresh_token(fetched_user, jwt_refresh_token)
 
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=status.HTTP_200_OK,
             content={
                 "status": "success",
@@ -116,21 +117,38 @@ class UserControllersClass:
             }
         )
 
-    def _store_user_session(self, fetched_user, session_id):
+    async def _rehash_password(self, user_id: str, password: str, old_hashed_password: str):
+        """
+        Re-hash a password with the configured bcrypt cost and store it, unless the hash changed meanwhile.
+        """
+        try:
+            self._start_connection()
+
+            new_hashed_password = await self.password_manager.encode_and_hash_password_async(password)
+            user_collection = self._get_collection("users")
+            await user_collection.update_one(
+                {"user_id": user_id, "password": old_hashed_password}, {"$set": {"password": new_hashed_password}}
+            )
+        except Exception as e:
+            print(f"Failed to rehash password for user {user_id}: {e}")
+        finally:
+            self._close_connection()
+
+    async def _store_user_session(self, fetched_user, session_id):
         """
         Store the user session in the database.
         """
         user_session_collection = self._get_collection("user_sessions")
-        user_session_payload = {"session_id": session_id, "user_id": fetched_user["user_id"], "email": fetched_user["email"]}
-        user_session_collection.insert_one(user_session_payload)
+        user_session_payload = {"session_id": session_id, "user_id": fetched_user["user_id"], "email": fetched_user["email"], "created_at": datetime.now(timezone.utc)}
+        await user_session_collection.insert_one(user_session_payload)
 
-    def _store_refresh_token(self, fetched_user, jwt_refresh_token):
+    async def _store_refresh_token(self, fetched_user, jwt_refresh_token):
         """
         Store the refresh token in the database.
         """
         refresh_token_collection = self._get_collection("refresh_tokens")
-        refresh_token_collection.delete_many({"user_id": fetched_user["user_id"], "email": fetched_user["email"]})
-        refresh_token_collection.insert_one({"user_id": fetched_user["user_id"], "email": fetched_user["email"], "refresh_token": jwt_refresh_token})
+        await refresh_token_collection.delete_many({"user_id": fetched_user["user_id"], "email": fetched_user["email"]})
+        await refresh_token_collection.insert_one({"user_id": fetched_user["user_id"], "email": fetched_user["email"], "refresh_token": jwt_refresh_token, "created_at": datetime.now(timezone.utc)})
 
 
     async def signup_user(self, user: dict, background_tasks: BackgroundTasks):
@@ -149,12 +167,12 @@ class UserControllersClass:
             user_collection = self._get_collection("users")
 
             # Check if user already exists
-            if user_collection.find_one({"email": user["email"]}):
+            if await user_collection.find_one({"email": user["email"]}):
                 raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="User with this email already exists!")
 
             # Generate unique user ID and hashed password
-            unique_id = generate_unique_key()
-            hashed_password = self.password_manager.encode_and_hash_password(user["password"])
+            unique_id = new_id()
+            hashed_password = await self.password_manager.encode_and_hash_password_async(user["password"])
             user_payload = {
                 "user_id": unique_id,
                 "name": user["name"],
@@ -169,13 +187,13 @@ class UserControllersClass:
             await self._send_verification_email(user_payload, background_tasks)
 
             # Insert user into the database
-            new_user = user_collection.insert_one(user_payload)
+            new_user = await user_collection.insert_one(user_payload)
             if new_user.inserted_id is None:
                 raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="User not created!")
 
-            created_user = user_collection.find_one({"user_id": user_payload["user_id"]})
+            created_user = await user_collection.find_one({"user_id": user_payload["user_id"]})
 
-            return JSONResponse(
+            return ORJSONResponse(
                 status_code=status.HTTP_201_CREATED,
                 content={"status": "success", "message": "User created successfully. Please check your email box and verify your account.", "user": individual_user_data(created_user)}
             )
@@ -199,14 +217,18 @@ class UserControllersClass:
 
             # Get the user collection
             user_collection = self._get_collection("users")
-            fetched_user = user_collection.find_one({"email": user["email"]})
+            fetched_user = await user_collection.find_one({"email": user["email"]})
 
             if not fetched_user:
                 raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User doesn't exist!")
 
-            if not self.password_manager.verify_password(user["password"], fetched_user["password"]):
+            if not await self.password_manager.verify_password_async(user["password"], fetched_user["password"]):
                 raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Password is incorrect!")
 
+            # Bring the stored hash to the configured cost after the response is sent
+            if self.password_manager.needs_rehash(fetched_user["password"]):
+                background_tasks.add_task(self._rehash_password, fetched_user["user_id"], user["password"], fetched_user["password"])
+
             if not fetched_user.get("is_verified"):
                 return await self._handle_unverified_user(fetched_user, background_tasks)
 
@@ -239,46 +261,44 @@ class UserControllersClass:
 
             # Get the user collection
             user_collection = self._get_collection("users")
-            user = user_collection.find_one({"user_id": user_id, "email": email})
+            user = await user_collection.find_one({"user_id": user_id, "email": email})
             if user is None:
                 raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found!")
 
             if user.get("is_verified"):
-                return JSONResponse(status_code=status.HTTP_200_OK, content={"status": "success", "message": "User account already verified. Login to continue."})
+                return ORJSONResponse(status_code=status.HTTP_200_OK, content={"status": "success", "message": "User account already verified. Login to continue."})
             
             # Update user verification status
-            user_collection.find_one_and_update({"user_id": user_id, "email": email}, {"$set": {"is_verified": True}})
+            await user_collection.find_one_and_update({"user_id": user_id, "email": email}, {"$set": {"is_verified": True}})
 
             # Send account activation confirmation email
             res = await self.email_services.send_account_verification_confirmation_email(user, background_tasks)
             if not res:
                 raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Failed to send account activation confirmation email!")
 
-            return JSONResponse(status_code=status.HTTP_200_OK, content={"status": "success", "message": "User account verified successfully. Login to continue."})
+            return ORJSONResponse(status_code=status.HTTP_200_OK, content={"status": "success", "message": "User account verified successfully. Login to continue."})
 
         except Exception as e:
             raise e
         finally:
             self._close_connection()
 
-    async def refresh_token_controller(self, decoded_token_payload: dict):
+    async def refresh_token_controller(self, auth: AuthContext):
         """
-        Handle the refresh token request by verifying the user session and generating new tokens.
+        Handle the refresh token request by generating new tokens for the already validated session.
 
         Args:
-            decoded_token_payload (dict): The decoded JWT token payload.
+            auth (AuthContext): The request's authentication context; the session was looked up once by TokenValidator.
         """
         try:
             self._start_connection()
 
-            user_id = decoded_token_payload["user_id"]
-            email = decoded_token_payload["email"]
-            session_id = decoded_token_payload["session_id"]
+            user_id = auth.user_id
+            email = auth.email
+            session_id = auth.session_id
 
-            # Check if the user session exists
-            user_session_collection = self._get_collection("user_sessions")
-            user_session = user_session_collection.find_one({"user_id": user_id, "session_id": session_id})
-            if user_session is None:
+            # The session belongs to this user (looked up by TokenValidator, no second query)
+            if auth.session.get("user_id") != user_id:
                 raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User session is not valid! Please login again to continue.")
 
             # Generate new access token and refresh token
@@ -287,13 +307,13 @@ class UserControllersClass:
 
             # Fetch the refresh token from the database
             refresh_tokens_collection = self._get_collection("refresh_tokens")
-            refresh_token_store = refresh_tokens_collection.find_one({"user_id": user_id, "email": email})
+            refresh_token_store = await refresh_tokens_collection.find_one({"user_id": user_id, "email": email})
             if refresh_token_store is None:
                 raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid refresh token!")
 
             jwt_refresh_token = refresh_token_store["refresh_token"]
 
-            return JSONResponse(
+            return ORJSONResponse(
                 status_code=status.HTTP_200_OK,
                 content={"status": "success", "message": "Access token refreshed successfully!", "jwt_access_token": jwt_access_token, "jwt_refresh_token": jwt_refresh_token, "session_id": session_id}
             )
@@ -319,15 +339,16 @@ class UserControllersClass:
             email = decoded_token_payload["email"]
             session_id = decoded_token_payload["session_id"]
 
-            # Delete the user session
+            # Delete the user session and drop it from the session cache (on every worker)
             user_session_collection = self._get_collection("user_sessions")
-            user_session_collection.delete_one({"user_id": user_id, "session_id": session_id})
+            await user_session_collection.delete_one({"user_id": user_id, "session_id": session_id})
+            session_cache.invalidate(session_id)
 
             # Delete the refresh token
             refresh_tokens_collection = self._get_collection("refresh_tokens")
-            refresh_tokens_collection.delete_one({"user_id": user_id, "email": email})
+            await refresh_tokens_collection.delete_one({"user_id": user_id, "email": email})
 
-            return JSONResponse(status_code=status.HTTP_200_OK, content={"status": "success", "message": "User logged out successfully!"})
+            return ORJSONResponse(status_code=status.HTTP_200_OK, content={"status": "success", "message": "User logged out successfully!"})
 
         except Exception as e:
             raise e
@@ -343,7 +364,7 @@ class UserControllersClass:
             background_tasks (BackgroundTasks): Background task manager for sending emails.
 
         Returns:
-            JSONResponse: The response message.
+            ORJSONResponse: The response message.
         """
         try:
             self._start_connection()
@@ -352,7 +373,7 @@ class UserControllersClass:
                 raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Email is required!")
             
             user_collection = self._get_collection("users")
-            user = user_collection.find_one({"email": email})
+            user = await user_collection.find_one({"email": email})
             if user is None:
                 raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User doesn't exist!")
 
@@ -366,7 +387,7 @@ class UserControllersClass:
             if not res:
                 raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Failed to send reset password email!")
 
-            return JSONResponse(status_code=status.HTTP_200_OK, content={"status": "success", "message": "Reset password link sent successfully. Please check your email."})
+            return ORJSONResponse(status_code=status.HTTP_200_OK, content={"status": "success", "message": "Reset password link sent successfully. Please check your email."})
 
         except Exception as e:
             raise e
@@ -383,7 +404,7 @@ class UserControllersClass:
             background_tasks (BackgroundTasks): Background task manager for sending emails.
 
         Returns:
-            JSONResponse: The response message.
+            ORJSONResponse: The response message.
         """
         try:
             self._start_connection()
@@ -401,20 +422,20 @@ class UserControllersClass:
 
             # Get the user collection
             user_collection = self._get_collection("users")
-            user = user_collection.find_one({"user_id": user_id, "email": email})
+            user = await user_collection.find_one({"user_id": user_id, "email": email})
             if user is None:
                 raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User doesn't exist!")
 
             # Update the user's password
-            hashed_password = self.password_manager.encode_and_hash_password(new_password)
-            user_collection.find_one_and_update({"user_id": user_id, "email": email}, {"$set": {"password": hashed_password}})
+            hashed_password = await self.password_manager.encode_and_hash_password_async(new_password)
+            await user_collection.find_one_and_update({"user_id": user_id, "email": email}, {"$set": {"password": hashed_password}})
 
             # Send password reset confirmation email
             res = await self.email_services.send_password_reset_confirmation_email(user, background_tasks)
             if not res:
                 raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Failed to send password reset confirmation email!")
 
-            return JSONResponse(status_code=status.HTTP_200_OK, content={"status": "success", "message": "Password reset successfully. Login to continue."})
+            return ORJSONResponse(status_code=status.HTTP_200_OK, content={"status": "success", "message": "Password reset successfully. Login to continue."})
 
         except Exception as e:
             raise e
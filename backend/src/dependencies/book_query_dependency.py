@@ -0,0 +1,41 @@
+from datetime import date
+from typing import Literal, Optional
+
+from fastapi import Query
+from fastapi.exceptions import RequestValidationError
+from pydantic import ValidationError
+
+from src.schemas.book_schema import BookQueryParams
+
+
+def book_query_params(
+    category: Optional[str] = Query(None, description="Only books in this category."),
+    language: Optional[str] = Query(None, description="Only books in this language."),
+    min_price: Optional[float] = Query(None, ge=0),
+    max_price: Optional[float] = Query(None, ge=0),
+    min_rating: Optional[float] = Query(None, ge=0),
+    max_rating: Optional[float] = Query(None, ge=0),
+    published_from: Optional[date] = Query(None, description="Earliest published date (YYYY-MM-DD)."),
+    published_to: Optional[date] = Query(None, description="Latest published date (YYYY-MM-DD)."),
+    sort_by: Literal["book_id", "book_price", "book_rating", "created_at"] = Query("book_id"),
+    order: Literal["asc", "desc"] = Query("asc"),
+) -> BookQueryParams:
+    """
+    Collects the book listing query parameters into a validated `BookQueryParams`.
+    Cross-field errors (e.g. `min_price` above `max_price`) are returned as a 422 like any other validation error.
+    """
+    try:
+        return BookQueryParams(
+            category=category,
+            language=language,
+            min_price=min_price,
+            max_price=max_price,
+            min_rating=min_rating,
+            max_rating=max_rating,
+            published_from=published_from,
+            published_to=published_to,
+            sort_by=sort_by,
+            order=order,
+        )
+    except ValidationError as e:
+        raise RequestValidationError(e.errors(include_url=False, include_context=False))
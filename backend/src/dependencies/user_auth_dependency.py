@@ -4,7 +4,9 @@ from jwt import ExpiredSignatureError, InvalidTokenError
 
 from src.config.jwt_token import JWTManager
 from src.config.database import MongoDBConnection
+from src.config.session_cache import session_cache
 from src.config.env_setting import Settings
+from src.schemas.user_schema import AuthContext
 
 
 security = HTTPBearer()
@@ -24,7 +26,8 @@ class TokenValidator:
     async def _validate_token(self, credentials: HTTPAuthorizationCredentials):
         """
         Validates the token extracted from the Authorization header.
-        Checks if the token is expired, invalid, or if the session is no longer valid.
+        Checks if the token is expired, invalid, or if the session is no longer valid, and returns
+        the request's AuthContext (decoded payload plus the session document).
         """
         if credentials is None:
             raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Token is missing")
@@ -39,16 +42,25 @@ class TokenValidator:
             if data.get("error"):
                 raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail=data["error"])
 
-            # Check if the session_id exists in the database (user_sessions collection)
+            # Check if the session_id exists (session cache first, then the user_sessions collection)
             session_id = data.get("session_id")
-            user_session_collection = self.mongo_db_connection.get_collection("user_sessions")
-            user_session = user_session_collection.find_one({"session_id": session_id})
-            if not user_session:
-                raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail={
-                    "device_logged_out": True,
-                    "message": "Invalid token. User session does not exist."
-                })
-            return data
+            user_session = session_cache.get(session_id)
+            if user_session is None:
+                user_session_collection = self.mongo_db_connection.get_async_collection("user_sessions")
+                user_session = await user_session_collection.find_one({"session_id": session_id}, {"_id": 0})
+                if not user_session:
+                    raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail={
+                        "device_logged_out": True,
+                        "message": "Invalid token. User session does not exist."
+                    })
+                session_cache.set(session_id, user_session)
+            return AuthContext(
+                user_id=data.get("user_id"),
+                email=data.get("email"),
+                session_id=session_id,
+                token_payload=data,
+                session=user_session,
+            )
         except ExpiredSignatureError:
             raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Token has expired")
         except InvalidTokenError:
@@ -73,3 +85,8 @@ def token_required(is_refresh: bool):
     """
     validator = TokenValidator(is_refresh)
     return validator
+
+
+# Shared dependency instances: every route uses the same callable, so FastAPI validates once per request
+access_token_required = token_required(is_refresh=False)
+refresh_token_required = token_required(is_refresh=True)
@@ -1,7 +1,10 @@
-from fastapi import APIRouter, Depends
+from typing import Optional
+from fastapi import APIRouter, Depends, Header, Query
 
-from src.dependencies.user_auth_dependency import token_required
-from src.schemas.book_schema import AddBookRequest, UpdateBookRequest 
+from src.dependencies.user_auth_dependency import access_token_required
+from src.dependencies.book_query_dependency import book_query_params
+from src.schemas.user_schema import AuthContext
+from src.schemas.book_schema import BookQueryParams, AddBookRequest, UpdateBookRequest, BulkAddBookRequest, BulkUpdateBookRequest, BulkDeleteBookRequest, BookResponse, BookListResponse, BookStatsResponse, MessageResponse
 from src.controllers.book_controller import BookController
 
 
@@ -9,49 +12,110 @@ book_router = APIRouter()
 book_controllers = BookController()
 
 
-@book_router.post("/add-book", dependencies=[Depends(token_required(is_refresh=False))])
-async def add_book(add_book_payload: AddBookRequest, decoded_token_payload: dict = Depends(token_required(is_refresh=False))):
+@book_router.post("/add-book", response_model=BookResponse)
+async def add_book(add_book_payload: AddBookRequest, auth: AuthContext = Depends(access_token_required)):
     """
     Add book route.
     """
-    # print("add_book_payload: ", type(add_book_payload), type(dict(add_book_payload)))
-    user_id = decoded_token_payload.get("user_id")
+    user_id = auth.user_id
     added_book_res = await book_controllers.add_book(dict(add_book_payload), user_id)
     return added_book_res
 
-@book_router.get("/all-books", dependencies=[Depends(token_required(is_refresh=False))])
-async def get_all_books(decoded_token_payload: dict = Depends(token_required(is_refresh=False))):
+@book_router.get("/all-books", response_model=BookListResponse)
+async def get_all_books(
+    limit: Optional[int] = Query(None, ge=1, description="Page size, capped at BOOK_PAGE_MAX_LIMIT."),
+    after: Optional[str] = Query(None, description="Opaque cursor from the previous page's `next_cursor`."),
+    include_total: bool = Query(False, description="Also return the total number of matching books."),
+    params: BookQueryParams = Depends(book_query_params),
+    if_none_match: Optional[str] = Header(None),
+    auth: AuthContext = Depends(access_token_required),
+):
     """
-    Get all books route.
+    Get all books route (filtered, sorted and keyset-paginated, 304 when `If-None-Match` still matches).
     """
-    user_id = decoded_token_payload.get("user_id")
-    all_books_res = await book_controllers.get_all_books(user_id)
+    user_id = auth.user_id
+    all_books_res = await book_controllers.get_all_books(user_id, limit, after, include_total, params, if_none_match)
     return all_books_res
 
-@book_router.get("/one-book/{book_id}", dependencies=[Depends(token_required(is_refresh=False))])
-async def get_book_by_id(book_id: str, decoded_token_payload: dict = Depends(token_required(is_refresh=False))):
+@book_router.get("/search", response_model=BookListResponse)
+async def search_books(
+    q: str = Query(..., min_length=1, max_length=200, description="Words to look for in the title, author and publisher."),
+    limit: Optional[int] = Query(None, ge=1, description="Page size, capped at BOOK_PAGE_MAX_LIMIT."),
+    after: Optional[str] = Query(None, description="Opaque cursor from the previous page's `next_cursor`."),
+    auth: AuthContext = Depends(access_token_required),
+):
     """
-    Get book by ID route.
+    Search books route (relevance-ranked, paginated).
     """
-    print("book_id: ", book_id)
-    user_id = decoded_token_payload.get("user_id")
-    one_book_res = await book_controllers.get_book_by_id(user_id, book_id)
+    user_id = auth.user_id
+    return await book_controllers.search_books(user_id, q, limit, after)
+
+@book_router.get("/stats", response_model=BookStatsResponse)
+async def get_book_stats(auth: AuthContext = Depends(access_token_required)):
+    """
+    Get book statistics route (count per category and language, average price and rating).
+    """
+    user_id = auth.user_id
+    return await book_controllers.get_book_stats(user_id)
+
+@book_router.get("/export-books")
+async def export_books(
+    batch_size: Optional[int] = Query(None, ge=1, le=10000, description="Documents fetched from MongoDB per round trip."),
+    auth: AuthContext = Depends(access_token_required),
+):
+    """
+    Export all books route (streams NDJSON, one book per line).
+    """
+    user_id = auth.user_id
+    return await book_controllers.export_books(user_id, batch_size)
+
+@book_router.get("/one-book/{book_id}", response_model=BookResponse)
+async def get_book_by_id(book_id: str, if_none_match: Optional[str] = Header(None), auth: AuthContext = Depends(access_token_required)):
+    """
+    Get book by ID route (304 when `If-None-Match` still matches).
+    """
+    user_id = auth.user_id
+    one_book_res = await book_controllers.get_book_by_id(user_id, book_id, if_none_match)
     return one_book_res
 
-@book_router.put("/update-book/{book_id}", dependencies=[Depends(token_required(is_refresh=False))])
-async def update_book(book_id: str, update_book_payload: UpdateBookRequest, decoded_token_payload: dict = Depends(token_required(is_refresh=False))):
+@book_router.put("/update-book/{book_id}", response_model=BookResponse)
+async def update_book(book_id: str, update_book_payload: UpdateBookRequest, auth: AuthContext = Depends(access_token_required)):
     """
     Update book route.
     """
-    user_id = decoded_token_payload.get("user_id")
+    user_id = auth.user_id
     updated_book_res = await book_controllers.update_book(dict(update_book_payload), user_id, book_id)
     return updated_book_res
 
-@book_router.delete("/delete-book/{book_id}", dependencies=[Depends(token_required(is_refresh=False))])
-async def delete_book(book_id: str, decoded_token_payload: dict = Depends(token_required(is_refresh=False))):
+@book_router.delete("/delete-book/{book_id}", response_model=MessageResponse)
+async def delete_book(book_id: str, auth: AuthContext = Depends(access_token_required)):
     """
     Delete book route.
     """
-    user_id = decoded_token_payload.get("user_id")
+    user_id = auth.user_id
     deleted_book_res = await book_controllers.delete_book(user_id, book_id)
-    return deleted_book_res
\ No newline at end of file
+    return deleted_book_res
+
+@book_router.post("/bulk/add-books")
+async def bulk_add_books(bulk_add_payload: BulkAddBookRequest, auth: AuthContext = Depends(access_token_required)):
+    """
+    Bulk add books route.
+    """
+    user_id = auth.user_id
+    return await book_controllers.bulk_add_books([dict(book) for book in bulk_add_payload.books], user_id)
+
+@book_router.put("/bulk/update-books")
+async def bulk_update_books(bulk_update_payload: BulkUpdateBookRequest, auth: AuthContext = Depends(access_token_required)):
+    """
+    Bulk update books route.
+    """
+    user_id = auth.user_id
+    return await book_controllers.bulk_update_books([dict(book) for book in bulk_update_payload.books], user_id)
+
+@book_router.post("/bulk/delete-books")
+async def bulk_delete_books(bulk_delete_payload: BulkDeleteBookRequest, auth: AuthContext = Depends(access_token_required)):
+    """
+    Bulk delete books route.
+    """
+    user_id = auth.user_id
+    return await book_controllers.bulk_delete_books(bulk_delete_payload.book_ids, user_id)
@@ -1,9 +1,9 @@
 from fastapi import APIRouter, Depends, BackgroundTasks, HTTPException, Request
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 
-from src.schemas.user_schema import LoginUser, SignUpUser
+from src.schemas.user_schema import LoginUser, SignUpUser, AuthContext
 from src.controllers.user_controller import UserControllersClass
-from src.dependencies.user_auth_dependency import token_required
+from src.dependencies.user_auth_dependency import refresh_token_required
 
 
 user_router = APIRouter()
@@ -53,13 +53,12 @@ async def reset_password(token: str, request: Request, background_tasks: Backgro
 
 
 # Protected routes
-@user_router.post("/renew-access-token", dependencies=[Depends(token_required(is_refresh=True))])
-async def refresh_token(decoded_token_payload: dict = Depends(token_required(is_refresh=True))):
+@user_router.post("/renew-access-token")
+async def refresh_token(auth: AuthContext = Depends(refresh_token_required)):
     """
     Refresh token route.
     """
-    
-    return await user_controllers.refresh_token_controller(decoded_token_payload)
+    return await user_controllers.refresh_token_controller(auth)
 
 @user_router.post("/logout")
 async def logout(credentials: HTTPAuthorizationCredentials = Depends(security)):
@@ -1,4 +1,6 @@
-from pydantic import BaseModel
+from datetime import date
+from typing import Dict, List, Literal, Optional
+from pydantic import BaseModel, Field, model_validator
 
 
 class AddBookRequest(BaseModel):
@@ -19,7 +21,7 @@ class Book(BaseModel):
     """This module contains the schemas for the book model."""
     user_id: str # for the reference of the user who added the book
     book_id: str
-    category: str
+    category: Optional[str] = None # None for books added without one
     book_title: str
     book_author: str
     book_price: float
@@ -44,4 +46,84 @@ class UpdateBookRequest(BaseModel):
     page_count: int
     language: str
     book_rating: float
-    book_image: str
\ No newline at end of file
+    book_image: str
+
+
+class BulkAddBookRequest(BaseModel):
+    """Schema for adding many books in one request."""
+    books: List[AddBookRequest]
+
+
+class BulkUpdateBookItem(UpdateBookRequest):
+    """Schema for one book update inside a bulk request."""
+    book_id: str
+
+
+class BulkUpdateBookRequest(BaseModel):
+    """Schema for updating many books in one request."""
+    books: List[BulkUpdateBookItem]
+
+
+class BulkDeleteBookRequest(BaseModel):
+    """Schema for deleting many books in one request."""
+    book_ids: List[str]
+
+
+class BookQueryParams(BaseModel):
+    """Filters and sort order for listing a user's books."""
+    category: Optional[str] = None
+    language: Optional[str] = None
+    min_price: Optional[float] = Field(None, ge=0)
+    max_price: Optional[float] = Field(None, ge=0)
+    min_rating: Optional[float] = Field(None, ge=0)
+    max_rating: Optional[float] = Field(None, ge=0)
+    published_from: Optional[date] = None
+    published_to: Optional[date] = None
+    sort_by: Literal["book_id", "book_price", "book_rating", "created_at"] = "book_id"
+    order: Literal["asc", "desc"] = "asc"
+
+    @model_validator(mode="after")
+    def check_ranges(self):
+        for low, high in (("min_price", "max_price"), ("min_rating", "max_rating"), ("published_from", "published_to")):
+            if getattr(self, low) is not None and getattr(self, high) is not None and getattr(self, low) > getattr(self, high):
+                raise ValueError(f"{low} must not be greater than {high}")
+        return self
+
+
+class BookResponse(BaseModel):
+    """Response schema for endpoints returning a single book."""
+    status: str
+    message: str
+    book: Book
+
+
+class BookListResponse(BaseModel):
+    """Response schema for one page of books."""
+    status: str
+    message: str
+    books: List[Book]
+    has_more: bool
+    next_cursor: Optional[str] = None
+    total_count: Optional[int] = None
+
+
+class BookStats(BaseModel):
+    """Schema for the catalog statistics of a user."""
+    count: int
+    categories: Dict[str, int]
+    languages: Dict[str, int]
+    average_price: Optional[float] = None
+    average_rating: Optional[float] = None
+
+
+class BookStatsResponse(BaseModel):
+    """Response schema for the catalog statistics endpoint."""
+    status: str
+    message: str
+    stats: BookStats
+
+
+class MessageResponse(BaseModel):
+    """Response schema for endpoints returning only a status message."""
+    status: str
+    message: str
@@ -21,6 +21,15 @@ class UserSessionStore(BaseModel):
     email: str
 
 
+# Request-scoped authentication context produced once per request by TokenValidator
+class AuthContext(BaseModel):
+    user_id: str
+    email: str
+    session_id: str
+    token_payload: dict
+    session: dict
+
+
 class User(BaseModel):
     user_id: str
     name: str
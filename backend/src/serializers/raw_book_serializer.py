@@ -0,0 +1,87 @@
+import re
+import struct
+
+import orjson
+
+
+# BSON element types a stored book can contain
+_BSON_DOUBLE = 0x01
+_BSON_STRING = 0x02
+_BSON_BOOL = 0x08
+_BSON_NULL = 0x0A
+_BSON_INT32 = 0x10
+_BSON_INT64 = 0x12
+
+_needs_escape = re.compile(rb'[\x00-\x1f"\\]').search
+_unpack_int32 = struct.Struct("<i").unpack_from
+_unpack_int64 = struct.Struct("<q").unpack_from
+_unpack_double = struct.Struct("<d").unpack_from
+
+# Quoted `"name":` prefixes, keyed by the raw field name; books only ever have a handful of field names
+_key_prefixes = {}
+
+
+def _json_string(raw: bytes) -> bytes:
+    """
+    Quote UTF-8 bytes as a JSON string, copying them as-is unless they need escaping.
+    """
+    if _needs_escape(raw) is None:
+        return b'"' + raw + b'"'
+    return orjson.dumps(raw.decode("utf-8"))
+
+
+def raw_book_json(raw: bytes) -> bytes:
+    """
+    Convert a flat BSON book document (e.g. `RawBSONDocument.raw`) straight to a JSON object.
+
+    The BSON bytes are walked once and JSON is emitted field by field without decoding the document
+    into a dict. Only the scalar types a book is stored with are supported.
+
+    Raises:
+        ValueError: If the document contains an unsupported BSON type.
+    """
+    parts = []
+    position = 4
+    end = len(raw) - 1
+
+    while position < end:
+        element_type = raw[position]
+        name_end = raw.index(b"\x00", position + 1)
+        name = raw[position + 1:name_end]
+        position = name_end + 1
+
+        prefix = _key_prefixes.get(name)
+        if prefix is None:
+            prefix = _key_prefixes.setdefault(name, _json_string(name) + b":")
+
+        if element_type == _BSON_STRING:
+            length = _unpack_int32(raw, position)[0]
+            value = _json_string(raw[position + 4:position + 3 + length])
+            position += 4 + length
+        elif element_type == _BSON_DOUBLE:
+            value = orjson.dumps(_unpack_double(raw, position)[0])
+            position += 8
+        elif element_type == _BSON_INT32:
+            value = str(_unpack_int32(raw, position)[0]).encode("ascii")
+            position += 4
+        elif element_type == _BSON_INT64:
+            value = str(_unpack_int64(raw, position)[0]).encode("ascii")
+            position += 8
+        elif element_type == _BSON_BOOL:
+            value = b"true" if raw[position] else b"false"
+            position += 1
+        elif element_type == _BSON_NULL:
+            value = b"null"
+        else:
+            raise ValueError(f"Unsupported BSON type 0x{element_type:02x} in field '{name.decode('utf-8', 'replace')}'")
+
+        parts.append(prefix + value)
+
+    return b"{" + b",".join(parts) + b"}"
+
+
+def raw_books_json(raw_documents) -> bytes:
+    """
+    Convert an iterable of raw BSON book documents to a JSON array.
+    """
+    return b"[" + b",".join(raw_book_json(document.raw) for document in raw_documents) + b"]"
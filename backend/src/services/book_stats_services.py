@@ -0,0 +1,224 @@
+from datetime import datetime
+from typing import Iterable, List, Optional
+
+
+# The book fields that feed the per-user statistics
+STATS_FIELDS = ("book_id", "category", "language", "book_price", "book_rating")
+UNKNOWN_KEY = "unknown"
+
+
+def escape_key(value) -> str:
+    """
+    Turn a category or language into a safe Mongo field name ("." and a leading "$" are not allowed).
+    Missing values are counted under "unknown".
+    """
+    if value is None or value == "":
+        return UNKNOWN_KEY
+    return str(value).replace("%", "%25").replace(".", "%2E").replace("$", "%24")
+
+
+def unescape_key(key: str) -> str:
+    """
+    Reverse `escape_key`.
+    """
+    return key.replace("%24", "$").replace("%2E", ".").replace("%25", "%")
+
+
+def _is_number(value) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+class BookStatsServices:
+    """
+    A class to maintain one statistics document per user in the `book_stats` collection.
+
+    Every book mutation is turned into `$inc` deltas (count, per-category and per-language counts, price and
+    rating sums) applied with one atomic upsert, so reading the stats costs a single document lookup no matter
+    how large the catalog is. The same upsert bumps `catalog_version`, which listing ETags are derived from.
+
+    The book write and the stats update are two separate writes: if the process dies in between, the stats
+    drift until `rebuild` recomputes them from the books themselves.
+    """
+
+    def __init__(self):
+        self.collection_name = "book_stats"
+
+    @staticmethod
+    def book_deltas(book: dict, sign: int = 1) -> dict:
+        """
+        Return the `$inc` deltas of adding (`sign=1`) or removing (`sign=-1`) one book.
+        """
+        deltas = {
+            "count": sign,
+            f"category_counts.{escape_key(book.get('category'))}": sign,
+            f"language_counts.{escape_key(book.get('language'))}": sign,
+        }
+        for field, prefix in (("book_price", "price"), ("book_rating", "rating")):
+            if _is_number(book.get(field)):
+                deltas[f"{prefix}_sum"] = sign * book[field]
+                deltas[f"{prefix}_count"] = sign
+        return deltas
+
+    @staticmethod
+    def merge_deltas(deltas_list: Iterable[dict]) -> dict:
+        """
+        Sum several delta documents into one, dropping the ones that cancel out.
+        """
+        merged = {}
+        for deltas in deltas_list:
+            for field, value in deltas.items():
+                merged[field] = merged.get(field, 0) + value
+        return {field: value for field, value in merged.items() if value != 0}
+
+    async def apply_deltas(self, stats_collection, user_id: str, deltas: dict):
+        """
+        Apply the deltas to the user's stats document and bump its catalog version, in one atomic upsert.
+        """
+        await stats_collection.update_one(
+            {"user_id": user_id},
+            {"$inc": {**deltas, "catalog_version": 1}, "$set": {"updated_at": str(datetime.now())}},
+            upsert=True,
+        )
+
+    async def record_added(self, stats_collection, user_id: str, books: List[dict]):
+        """
+        Account for newly added books.
+        """
+        if not books:
+            return
+        await self.apply_deltas(stats_collection, user_id, self.merge_deltas(self.book_deltas(book) for book in books))
+
+    async def record_updated(self, stats_collection, user_id: str, changes: List[tuple]):
+        """
+        Account for updated books, given `(before, after)` pairs.
+        """
+        if not changes:
+            return
+        deltas = []
+        for before, after in changes:
+            deltas.append(self.book_deltas(before, -1))
+            deltas.append(self.book_deltas(after, 1))
+        await self.apply_deltas(stats_collection, user_id, self.merge_deltas(deltas))
+
+    async def record_deleted(self, stats_collection, user_id: str, books: List[dict]):
+        """
+        Account for deleted books.
+        """
+        if not books:
+            return
+        await self.apply_deltas(stats_collection, user_id, self.merge_deltas(self.book_deltas(book, -1) for book in books))
+
+    async def recompute(self, books_collection, stats_collection, user_id: str):
+        """
+        Recompute one user's stats from their books, for a bulk write whose outcome per book is not known exactly
+        (a concurrent request changed some of the same books), so no deltas can be derived from it.
+        """
+        groups = await books_collection.aggregate(self.rebuild_pipeline(user_id))
+        document = self.fold_groups(groups).get(user_id) or {"user_id": user_id, **self.empty_stats()}
+        document["updated_at"] = str(datetime.now())
+        await stats_collection.update_one({"user_id": user_id}, {"$set": document, "$inc": {"catalog_version": 1}}, upsert=True)
+
+    @staticmethod
+    def format_stats(stats: Optional[dict]) -> dict:
+        """
+        Turn a stats document into the API representation, with averages and unescaped keys.
+        """
+        stats = stats or {}
+        price_count = stats.get("price_count", 0)
+        rating_count = stats.get("rating_count", 0)
+        return {
+            "count": stats.get("count", 0),
+            "categories": {unescape_key(key): count for key, count in stats.get("category_counts", {}).items() if count > 0},
+            "languages": {unescape_key(key): count for key, count in stats.get("language_counts", {}).items() if count > 0},
+            "average_price": round(stats["price_sum"] / price_count, 2) if price_count > 0 else None,
+            "average_rating": round(stats["rating_sum"] / rating_count, 2) if rating_count > 0 else None,
+        }
+
+    async def get_catalog_version(self, stats_collection, user_id: str) -> int:
+        """
+        Read the user's catalog version, which changes on every book mutation.
+        """
+        stats = await stats_collection.find_one({"user_id": user_id}, {"_id": 0, "catalog_version": 1})
+        return (stats or {}).get("catalog_version", 0)
+
+    async def get_stats(self, stats_collection, user_id: str) -> dict:
+        """
+        Read the user's stats with a single document lookup.
+        """
+        stats = await stats_collection.find_one({"user_id": user_id}, {"_id": 0})
+        return self.format_stats(stats)
+
+    @staticmethod
+    def rebuild_pipeline(user_id: str = None) -> list:
+        """
+        Return the aggregation that recomputes the stats from the books, grouped per user, category and language.
+        """
+        pipeline = [{"$match": {"user_id": user_id}}] if user_id else []
+        pipeline.append({
+            "$group": {
+                "_id": {"user_id": "$user_id", "category": "$category", "language": "$language"},
+                "count": {"$sum": 1},
+                "price_sum": {"$sum": "$book_price"},
+                "price_count": {"$sum": {"$cond": [{"$isNumber": "$book_price"}, 1, 0]}},
+                "rating_sum": {"$sum": "$book_rating"},
+                "rating_count": {"$sum": {"$cond": [{"$isNumber": "$book_rating"}, 1, 0]}},
+            }
+        })
+        return pipeline
+
+    @staticmethod
+    def empty_stats() -> dict:
+        """
+        Return the stats of a user without books.
+        """
+        return {
+            "count": 0, "category_counts": {}, "language_counts": {},
+            "price_sum": 0, "price_count": 0, "rating_sum": 0, "rating_count": 0,
+        }
+
+    @staticmethod
+    def fold_groups(groups: Iterable[dict]) -> dict:
+        """
+        Fold the `(user_id, category, language)` groups of `rebuild_pipeline` into one stats document per user.
+        """
+        documents = {}
+        for group in groups:
+            user_id = group["_id"]["user_id"]
+            document = documents.setdefault(user_id, {"user_id": user_id, **BookStatsServices.empty_stats()})
+            for field in ("count", "price_sum", "price_count", "rating_sum", "rating_count"):
+                document[field] += group[field]
+            for field, counts in (("category", "category_counts"), ("language", "language_counts")):
+                key = escape_key(group["_id"].get(field))
+                document[counts][key] = document[counts].get(key, 0) + group["count"]
+        return documents
+
+    def rebuild(self, db, user_id: str = None) -> int:
+        """
+        Recompute the stats documents from the books collection (synchronous, for maintenance jobs).
+
+        Stats of users without books are reset to zero. The catalog version is bumped rather than
+        overwritten, so ETags issued before the rebuild are never reused. Mutations that land while the
+        rebuild runs may be overwritten, so run it when the catalog is quiet.
+
+        :param db: A pymongo database.
+        :param user_id: Only rebuild this user's stats. Defaults to every user.
+        :return: The number of stats documents written.
+        """
+        documents = self.fold_groups(db["books"].aggregate(self.rebuild_pipeline(user_id), allowDiskUse=True))
+        stats_collection = db[self.collection_name]
+        timestamp = str(datetime.now())
+
+        for document in documents.values():
+            document["updated_at"] = timestamp
+            stats_collection.update_one(
+                {"user_id": document["user_id"]},
+                {"$set": document, "$inc": {"catalog_version": 1}},
+                upsert=True,
+            )
+
+        empty_stats = {**self.empty_stats(), "updated_at": timestamp}
+        if user_id is None:
+            stats_collection.update_many({"user_id": {"$nin": list(documents)}}, {"$set": empty_stats, "$inc": {"catalog_version": 1}})
+        elif user_id not in documents:
+            stats_collection.update_one({"user_id": user_id}, {"$set": empty_stats, "$inc": {"catalog_version": 1}})
+        return len(documents)
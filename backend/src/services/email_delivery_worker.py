@@ -0,0 +1,141 @@
+import asyncio
+import time
+
+from src.config.email_config import SMTPConnectionPool, build_email_message, is_permanent_email_failure, render_email, smtp_send_deadline
+from src.config.env_setting import Settings
+from src.config.metrics import EMAIL_DELIVERIES, EMAIL_DELIVERY_DURATION
+from src.services.email_outbox_services import EMAIL_FAILED, EMAIL_PENDING, EMAIL_SENT, EmailOutboxServices
+
+
+class EmailDeliveryWorker:
+    """
+    A background worker that drains the email outbox over a pool of reused SMTP connections.
+
+    `EMAIL_DELIVERY_CONCURRENCY` consumer tasks claim due emails one at a time and send them through a pool of
+    as many SMTP sessions. Idle consumers sleep until `notify` is called (after an enqueue in this process)
+    or `EMAIL_OUTBOX_POLL_INTERVAL_SECONDS` elapses, which also picks up retries and emails enqueued by other
+    processes. Several processes can run the worker against the same outbox since every claim is atomic.
+
+    A send is cut off at the SMTP send deadline, which the outbox lease outlasts, so an email is never sent by
+    two workers at once. Idle consumers also fail the emails whose last lease ran out.
+    """
+
+    def __init__(self, config: Settings = None, outbox: EmailOutboxServices = None, smtp_pool: SMTPConnectionPool = None):
+        self.Config = config or Settings()
+        self.smtp_pool = smtp_pool or SMTPConnectionPool(max_size=self.Config.EMAIL_DELIVERY_CONCURRENCY)
+        self.send_deadline = smtp_send_deadline(self.smtp_pool.config)
+        self.outbox = outbox or EmailOutboxServices(self.Config, self.send_deadline + self.Config.EMAIL_OUTBOX_LEASE_MARGIN_SECONDS)
+        self._tasks = []
+        self._wakeup = None
+
+        self.sent = 0
+        self.retried = 0
+        self.failed = 0
+
+    @property
+    def running(self) -> bool:
+        return bool(self._tasks)
+
+    def start(self):
+        """
+        Start the consumer tasks on the running event loop.
+        """
+        if self._tasks:
+            return
+        self._wakeup = asyncio.Event()
+        self._tasks = [asyncio.create_task(self._consume()) for _ in range(self.Config.EMAIL_DELIVERY_CONCURRENCY)]
+
+    async def stop(self):
+        """
+        Cancel the consumers and close the SMTP connections. Emails being sent are retried after their lease.
+        """
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        await self.smtp_pool.close()
+
+    def notify(self):
+        """
+        Wake the idle consumers up, e.g. right after an email has been enqueued.
+        """
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    async def _wait(self):
+        try:
+            await asyncio.wait_for(self._wakeup.wait(), self.Config.EMAIL_OUTBOX_POLL_INTERVAL_SECONDS)
+        except asyncio.TimeoutError:
+            pass
+        self._wakeup.clear()
+
+    async def _consume(self):
+        while True:
+            try:
+                message = await self.outbox.claim_next()
+            except Exception as e:
+                print(f"Failed to claim an email from the outbox: {e}")
+                message = None
+
+            if message is None:
+                await self._fail_expired_leases()
+                await self._wait()
+                continue
+            await self.deliver(message)
+
+    async def _fail_expired_leases(self):
+        try:
+            failed = await self.outbox.fail_expired_leases()
+        except Exception as e:
+            print(f"Failed to expire the exhausted email leases: {e}")
+            return
+        if failed:
+            self.failed += failed
+            EMAIL_DELIVERIES.labels("failed").inc(failed)
+
+    async def deliver(self, message: dict) -> str:
+        """
+        Render and send one claimed email, then record the outcome in the outbox.
+
+        Returns:
+            str: The resulting status, "sent", "pending" (retry scheduled) or "failed".
+        """
+        started = time.perf_counter()
+        try:
+            html = render_email(message["template_name"], message["context"])
+            email = build_email_message(message["recipients"], message["subject"], html, message["message_id"], self.smtp_pool.config)
+            await asyncio.wait_for(self.smtp_pool.send(email), self.send_deadline)
+        except Exception as e:
+            EMAIL_DELIVERY_DURATION.observe(time.perf_counter() - started)
+            permanent = is_permanent_email_failure(e)
+            # A send cut off at the deadline raises a TimeoutError without a message
+            error = str(e) or type(e).__name__
+            print(f"Failed to send email '{message['message_id']}' (attempt {message['attempts']}): {error}")
+            try:
+                status = await self.outbox.mark_failed(message, error, permanent=permanent)
+            except Exception as mark_error:
+                print(f"Failed to record the delivery failure of email '{message['message_id']}': {mark_error}")
+                return EMAIL_PENDING
+            if status == EMAIL_FAILED:
+                self.failed += 1
+                EMAIL_DELIVERIES.labels("failed").inc()
+            else:
+                self.retried += 1
+                EMAIL_DELIVERIES.labels("retried").inc()
+            return status
+
+        EMAIL_DELIVERY_DURATION.observe(time.perf_counter() - started)
+        self.sent += 1
+        EMAIL_DELIVERIES.labels("sent").inc()
+        try:
+            await self.outbox.mark_sent(message)
+        except Exception as e:
+            # The lease runs out and the email is sent again; better than losing it
+            print(f"Failed to record the delivery of email '{message['message_id']}': {e}")
+        return EMAIL_SENT
+
+    def stats(self) -> dict:
+        return {"running": self.running, "sent": self.sent, "retried": self.retried, "failed": self.failed, **self.smtp_pool.stats()}
+
+
+email_delivery_worker = EmailDeliveryWorker()
@@ -0,0 +1,165 @@
+import random
+
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from pymongo import ASCENDING, ReturnDocument
+
+from src.config.database import MongoDBConnection
+from src.config.email_config import conf, smtp_send_deadline
+from src.config.env_setting import Settings
+from src.config.metrics import EMAILS_ENQUEUED
+from src.utils.id_generator import new_id
+
+
+# Outbox states: "pending" (due at `next_attempt_at`), "sending" (claimed until `next_attempt_at`), "sent", "failed"
+EMAIL_PENDING = "pending"
+EMAIL_SENDING = "sending"
+EMAIL_SENT = "sent"
+EMAIL_FAILED = "failed"
+
+
+class EmailOutboxServices:
+    """
+    A class to store outgoing emails in the `email_outbox` collection until they are delivered.
+
+    Requests only insert the email; `EmailDeliveryWorker` claims due emails, sends them and records the
+    outcome. A claim is a lease: the email moves to "sending" with `next_attempt_at` pushed forward by the
+    lease, so an email claimed by a worker that dies is picked up again once the lease runs out. The lease
+    outlasts the longest possible SMTP send by `EMAIL_OUTBOX_LEASE_MARGIN_SECONDS`, so a slow but live send is
+    never claimed twice. Delivery is therefore at-least-once; every attempt carries the same Message-ID.
+
+    An email is only claimed while it has attempts left; one whose last lease ran out is marked as failed by
+    `fail_expired_leases`.
+    """
+
+    def __init__(self, config: Settings = None, lease_seconds: float = None):
+        self.Config = config or Settings()
+        self.lease_seconds = lease_seconds or smtp_send_deadline(conf) + self.Config.EMAIL_OUTBOX_LEASE_MARGIN_SECONDS
+        self.mongo_db_connection = MongoDBConnection(self.Config.MONGO_URI, self.Config.DB_NAME)
+        self.collection_name = "email_outbox"
+
+    def _get_collection(self):
+        """
+        Helper method to get the outbox collection with awaitable (non-blocking) methods.
+        """
+        self.mongo_db_connection.start_connection()
+        return self.mongo_db_connection.get_async_collection(self.collection_name)
+
+    @staticmethod
+    def _now() -> datetime:
+        return datetime.now(timezone.utc)
+
+    def retry_delay(self, attempts: int) -> float:
+        """
+        Return the delay before the next attempt: exponential backoff from `EMAIL_RETRY_BASE_SECONDS`, capped at
+        `EMAIL_RETRY_MAX_SECONDS`, with jitter so emails that failed together are not retried together.
+        """
+        delay = min(self.Config.EMAIL_RETRY_BASE_SECONDS * 2 ** max(attempts - 1, 0), self.Config.EMAIL_RETRY_MAX_SECONDS)
+        return random.uniform(delay / 2, delay)
+
+    async def enqueue(self, recipients: list, subject: str, template_name: str, context: dict) -> str:
+        """
+        Store an email for delivery.
+
+        Args:
+            recipients (list): List of recipient email addresses.
+            subject (str): Subject of the email.
+            template_name (str): Name of the email template.
+            context (dict): Context data for the email template.
+
+        Returns:
+            str: The outbox message id.
+        """
+        now = self._now()
+        message_id = new_id()
+        await self._get_collection().insert_one({
+            "message_id": message_id,
+            "recipients": recipients,
+            "subject": subject,
+            "template_name": template_name,
+            "context": context,
+            "status": EMAIL_PENDING,
+            "attempts": 0,
+            "next_attempt_at": now,
+            "last_error": None,
+            "created_at": now,
+            "updated_at": now,
+        })
+        EMAILS_ENQUEUED.labels(template_name).inc()
+        return message_id
+
+    async def claim_next(self) -> Optional[dict]:
+        """
+        Atomically claim the email that has been due the longest, or return None when nothing is due.
+
+        Emails that used up `EMAIL_MAX_ATTEMPTS` are never claimed again, even when their lease ran out.
+        """
+        now = self._now()
+        return await self._get_collection().find_one_and_update(
+            {
+                "status": {"$in": [EMAIL_PENDING, EMAIL_SENDING]},
+                "next_attempt_at": {"$lte": now},
+                "attempts": {"$lt": self.Config.EMAIL_MAX_ATTEMPTS},
+            },
+            {
+                "$set": {
+                    "status": EMAIL_SENDING,
+                    "next_attempt_at": now + timedelta(seconds=self.lease_seconds),
+                    "updated_at": now,
+                },
+                "$inc": {"attempts": 1},
+            },
+            sort=[("next_attempt_at", ASCENDING)],
+            projection={"_id": 0},
+            return_document=ReturnDocument.AFTER,
+        )
+
+    async def fail_expired_leases(self) -> int:
+        """
+        Mark as failed the emails whose last attempt was claimed but never recorded before its lease ran out,
+        e.g. because the worker died mid-send.
+
+        Returns:
+            int: The number of emails marked as failed.
+        """
+        now = self._now()
+        result = await self._get_collection().update_many(
+            {"status": EMAIL_SENDING, "next_attempt_at": {"$lte": now}, "attempts": {"$gte": self.Config.EMAIL_MAX_ATTEMPTS}},
+            {
+                "$set": {"status": EMAIL_FAILED, "last_error": "The last delivery attempt did not finish within its lease", "updated_at": now},
+                "$unset": {"next_attempt_at": ""},
+            },
+        )
+        return result.modified_count
+
+    async def mark_sent(self, message: dict):
+        """
+        Record a successful delivery. Ignored if the lease expired and another worker claimed the email since.
+        """
+        now = self._now()
+        await self._get_collection().update_one(
+            {"message_id": message["message_id"], "attempts": message["attempts"]},
+            {"$set": {"status": EMAIL_SENT, "sent_at": now, "updated_at": now, "last_error": None}, "$unset": {"next_attempt_at": ""}},
+        )
+
+    async def mark_failed(self, message: dict, error: str, permanent: bool = False) -> str:
+        """
+        Record a failed attempt and schedule a retry, or give up after `EMAIL_MAX_ATTEMPTS` or a permanent failure.
+
+        Returns:
+            str: The new status, "pending" or "failed".
+        """
+        now = self._now()
+        update = {"last_error": error, "updated_at": now}
+        if permanent or message["attempts"] >= self.Config.EMAIL_MAX_ATTEMPTS:
+            update["status"] = EMAIL_FAILED
+            unset = {"next_attempt_at": ""}
+        else:
+            update["status"] = EMAIL_PENDING
+            update["next_attempt_at"] = now + timedelta(seconds=self.retry_delay(message["attempts"]))
+            unset = {}
+
+        changes = {"$set": update, **({"$unset": unset} if unset else {})}
+        await self._get_collection().update_one({"message_id": message["message_id"], "attempts": message["attempts"]}, changes)
+        return update["status"]
@@ -3,7 +3,8 @@ import logging
 from fastapi import BackgroundTasks, HTTPException
 
 from src.config.env_setting import Settings
-from src.config.email_config import send_email
+from src.services.email_delivery_worker import email_delivery_worker
+from src.services.email_outbox_services import EmailOutboxServices
 
 
 # Set up logging for better traceability
@@ -13,9 +14,21 @@ logger = logging.getLogger(__name__)
 class EmailServices:
     """
     A class for email services, such as sending account verification and password reset emails.
+
+    Emails are written to the outbox and delivered by `EmailDeliveryWorker`, so a request only waits for
+    one insert and an email survives a worker restart. `background_tasks` is kept for API compatibility.
     """
     def __init__(self):
         self.config = Settings()
+        self.email_outbox_services = EmailOutboxServices(self.config)
+
+    async def send_email(self, recipients: list, subject: str, template_name: str, context: dict) -> bool:
+        """
+        Queue an email in the outbox and wake the delivery worker up.
+        """
+        await self.email_outbox_services.enqueue(recipients, subject, template_name, context)
+        email_delivery_worker.notify()
+        return True
 
     async def send_account_verification_email(self, user: dict, background_tasks: BackgroundTasks, activate_url: str):
         """
@@ -28,13 +41,12 @@ class EmailServices:
         }
         subject = f"Account Verification - {self.config.APP_NAME}"
         try:
-            # Send the email asynchronously
-            res = await send_email(
+            # Queue the email for the delivery worker
+            res = await self.send_email(
                 recipients=[user["email"]],
                 subject=subject,
                 template_name="account-verification.html",
                 context=data,
-                background_tasks=background_tasks
             )
             return res
         except Exception as e:
@@ -52,13 +64,12 @@ class EmailServices:
         }
         subject = f"Welcome - {self.config.APP_NAME}"
         try:
-            # Send the email asynchronously
-            res = await send_email(
+            # Queue the email for the delivery worker
+            res = await self.send_email(
                 recipients=[user["email"]],
                 subject=subject,
                 template_name="account-verification-confirmation.html",
                 context=data,
-                background_tasks=background_tasks
             )
             return res
         except Exception as e:
@@ -76,13 +87,12 @@ class EmailServices:
         }
         subject = f"Reset Password - {self.config.APP_NAME}"
         try:
-            # Send the email asynchronously
-            res = await send_email(
+            # Queue the email for the delivery worker
+            res = await self.send_email(
                 recipients=[user["email"]],
                 subject=subject,
                 template_name="password-reset.html",
                 context=data,
-                background_tasks=background_tasks
             )
             return res
         except Exception as e:
@@ -101,13 +111,12 @@ class EmailServices:
         }
         subject = f"Password Reset Successful- {self.config.APP_NAME}"
         try:
-            # Send the email asynchronously
-            res = await send_email(
+            # Queue the email for the delivery worker
+            res = await self.send_email(
                 recipients=[user["email"]],
                 subject=subject,
                 template_name="password-reset-confirmation.html",
                 context=data,
-                background_tasks=background_tasks
             )
             return res
         except Exception as e:
@@ -0,0 +1,99 @@
+import re
+import secrets
+import threading
+
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader
+
+
+# Context fields that change with every message; everything else (app name, support address) is static
+DYNAMIC_FIELDS = ("name", "activate_url", "login_url")
+
+
+class EmailTemplateRenderer:
+    """
+    Renders the email templates from precompiled, pre-rendered segments.
+
+    `load` compiles every template once (with a Jinja bytecode cache on disk, so later workers and restarts skip
+    the compilation too). The first message of a template with a given static context (e.g. `app_name`) renders
+    it once with placeholders in place of the `DYNAMIC_FIELDS`, and keeps the text between them. Every later
+    message only joins those segments with its own `name`, `activate_url` and `login_url`.
+
+    The segments are checked against a full Jinja render before they are used: a template that transforms a
+    dynamic field (e.g. with a filter) is always rendered by Jinja instead.
+
+    Attributes:
+        env (Environment): The Jinja environment, configured like fastapi-mail's (no autoescaping).
+        dynamic_fields (tuple): The per-message context fields.
+        max_segment_sets (int): The most (template, static context) combinations kept pre-rendered.
+    """
+
+    def __init__(self, template_folder, bytecode_cache_dir: str = None, dynamic_fields: tuple = DYNAMIC_FIELDS, max_segment_sets: int = 256):
+        self.env = Environment(loader=FileSystemLoader(template_folder), bytecode_cache=FileSystemBytecodeCache(bytecode_cache_dir))
+        self.dynamic_fields = dynamic_fields
+        self.max_segment_sets = max_segment_sets
+        self._segments = {}
+        self._lock = threading.Lock()
+
+    def load(self) -> int:
+        """
+        Compile every template in the folder, so no message pays for it.
+
+        Returns:
+            int: The number of templates compiled.
+        """
+        names = self.env.list_templates(extensions=["html"])
+        for name in names:
+            self.env.get_template(name)
+        return len(names)
+
+    def _build_segments(self, template_name: str, static_context: dict):
+        """
+        Split the template rendered with `static_context` at the dynamic fields.
+
+        Returns:
+            tuple: Literal text and field names alternating, or None if the template can't be split safely.
+        """
+        template = self.env.get_template(template_name)
+        token = secrets.token_hex(8)
+        placeholders = {field: f"@@{token}:{field}@@" for field in self.dynamic_fields}
+        pieces = re.split(f"@@{token}:(\\w+)@@", template.render(**static_context, **placeholders))
+
+        # Even positions are literal text, odd positions are the field names captured by the split
+        segments = tuple(pieces)
+        sample = {field: f"<{field}-{token}>" for field in self.dynamic_fields}
+        if self._join(segments, sample) != template.render(**static_context, **sample):
+            return None
+        return segments
+
+    @staticmethod
+    def _join(segments: tuple, values: dict) -> str:
+        parts = list(segments)
+        for index in range(1, len(parts), 2):
+            value = values.get(parts[index], "")
+            parts[index] = value if isinstance(value, str) else str(value)
+        return "".join(parts)
+
+    def render(self, template_name: str, context: dict) -> str:
+        """
+        Render a template, filling only the dynamic fields when its static part is already rendered.
+
+        Raises:
+            TemplateNotFound: If there is no such template.
+        """
+        static_context = {key: value for key, value in context.items() if key not in self.dynamic_fields}
+        try:
+            key = (template_name, tuple(sorted(static_context.items())))
+            hash(key)
+        except TypeError:
+            return self.env.get_template(template_name).render(**context)
+
+        segments = self._segments.get(key)
+        if segments is None:
+            segments = self._build_segments(template_name, static_context) or False
+            with self._lock:
+                if len(self._segments) < self.max_segment_sets:
+                    self._segments[key] = segments
+
+        if segments is False:
+            return self.env.get_template(template_name).render(**context)
+        return self._join(segments, context)
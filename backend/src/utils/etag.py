@@ -0,0 +1,26 @@
+import hashlib
+
+from typing import Optional
+
+
+def make_etag(*parts) -> str:
+    """
+    Build a strong ETag (quoted) from the values that identify one representation of a resource.
+    """
+    digest = hashlib.sha256("\x1f".join(str(part) for part in parts).encode("utf-8")).hexdigest()
+    return f'"{digest[:32]}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Check an `If-None-Match` header against an ETag.
+
+    Uses the weak comparison the header calls for: `W/` prefixes are ignored, `*` matches anything.
+    """
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == etag:
+            return True
+    return False
@@ -0,0 +1,96 @@
+import base64
+import secrets
+import threading
+import time
+
+from src.config.env_setting import Settings
+from src.utils.generate_unique_key import generate_unique_key
+
+
+# base32 alphabet -> Crockford's base32, whose characters are in ASCII order so the IDs sort like their values
+_CROCKFORD = bytes.maketrans(b"ABCDEFGHIJKLMNOPQRSTUVWXYZ234567", b"0123456789ABCDEFGHJKMNPQRSTVWXYZ")
+_RANDOM_BYTES = 10
+_RANDOM_LIMIT = 1 << (_RANDOM_BYTES * 8)
+
+ID_STRATEGY = Settings().ID_STRATEGY
+
+
+def _encode(timestamp_ms: int, randomness: int) -> str:
+    """
+    Encode a 48-bit millisecond timestamp and 80 random bits as 26 Crockford base32 characters (ULID layout).
+    """
+    value = (timestamp_ms << 80) | randomness
+    # Shifted so the 128 bits start 2 bits into the first character, exactly like a ULID
+    return base64.b32encode((value << 6).to_bytes(17, "big"))[:26].translate(_CROCKFORD).decode("ascii")
+
+
+class SortableIdGenerator:
+    """
+    Generates time-ordered, URL-safe IDs: a millisecond timestamp followed by 80 random bits (the ULID layout).
+
+    IDs created later sort after earlier ones, so new documents are appended to the right edge of the
+    `book_id`/`user_id` index B-trees instead of splitting pages all over them. Within one millisecond the
+    IDs stay monotonic: a random part that does not exceed the previous one is replaced by the previous one
+    plus one. Each ID costs one `secrets.token_bytes` worth of randomness, read in a single call per batch.
+    """
+
+    def __init__(self, clock=time.time_ns):
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._last_ms = -1
+        self._last_random = 0
+
+    def _next(self, timestamp_ms: int, randomness: int) -> tuple:
+        # Caller holds the lock
+        if timestamp_ms <= self._last_ms:
+            timestamp_ms = self._last_ms
+            if randomness <= self._last_random:
+                randomness = self._last_random + 1
+                if randomness >= _RANDOM_LIMIT:
+                    timestamp_ms += 1
+                    randomness = 0
+        self._last_ms, self._last_random = timestamp_ms, randomness
+        return timestamp_ms, randomness
+
+    def generate(self) -> str:
+        """
+        Return a new ID.
+        """
+        randomness = int.from_bytes(secrets.token_bytes(_RANDOM_BYTES), "big")
+        timestamp_ms = self._clock() // 1_000_000
+        with self._lock:
+            timestamp_ms, randomness = self._next(timestamp_ms, randomness)
+        return _encode(timestamp_ms, randomness)
+
+    def generate_batch(self, count: int) -> list:
+        """
+        Return `count` new IDs in ascending order, e.g. for the documents of one bulk insert.
+        """
+        random_bytes = secrets.token_bytes(_RANDOM_BYTES * count)
+        timestamp_ms = self._clock() // 1_000_000
+        values = []
+        with self._lock:
+            for offset in range(0, len(random_bytes), _RANDOM_BYTES):
+                values.append(self._next(timestamp_ms, int.from_bytes(random_bytes[offset:offset + _RANDOM_BYTES], "big")))
+        return [_encode(timestamp_ms, randomness) for timestamp_ms, randomness in values]
+
+
+sortable_id_generator = SortableIdGenerator()
+
+
+def new_id() -> str:
+    """
+    Return a new primary key (book_id, user_id, session_id, ...) using the configured `ID_STRATEGY`.
+    """
+    if ID_STRATEGY == "sortable":
+        return sortable_id_generator.generate()
+    return generate_unique_key()
+
+
+def new_ids(count: int) -> list:
+    """
+    Return `count` new primary keys at once, for bulk inserts.
+    """
+    if ID_STRATEGY == "sortable":
+        return sortable_id_generator.generate_batch(count)
+    return [generate_unique_key() for _ in range(count)]
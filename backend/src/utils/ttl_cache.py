@@ -0,0 +1,101 @@
+import threading
+import time
+
+from collections import OrderedDict
+
+
+class TTLCache:
+    """
+    A bounded, thread-safe LRU cache whose entries also expire after a time-to-live.
+
+    Entries expire after `ttl_seconds` by default; `set` can give a single entry its own TTL.
+    When the cache is full the least recently used entry is evicted.
+
+    Attributes:
+        max_size (int): The maximum number of entries kept.
+        ttl_seconds (float): The default lifetime of an entry.
+        hits (int): Lookups answered from the cache.
+        misses (int): Lookups that found no live entry.
+        evictions (int): Entries dropped to make room for new ones.
+        expirations (int): Entries dropped because their TTL elapsed.
+    """
+
+    def __init__(self, max_size: int, ttl_seconds: float):
+        if max_size <= 0:
+            raise ValueError("max_size must be greater than zero.")
+
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key, default=None):
+        """
+        Return the live value stored under `key`, or `default`.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+
+            value, expires_at = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return default
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key, value, ttl_seconds: float = None):
+        """
+        Store `value` under `key` for `ttl_seconds` (defaults to the cache TTL).
+        """
+        ttl_seconds = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+        if ttl_seconds <= 0:
+            return
+
+        with self._lock:
+            self._entries[key] = (value, time.monotonic() + ttl_seconds)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def delete(self, key) -> bool:
+        """
+        Remove `key` from the cache. Returns True if it was present.
+        """
+        with self._lock:
+            return self._entries.pop(key, None) is not None
+
+    def clear(self):
+        """
+        Remove every entry (counters are kept).
+        """
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> dict:
+        """
+        Return the cache counters.
+        """
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
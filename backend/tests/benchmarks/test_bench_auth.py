@@ -0,0 +1,67 @@
+"""
+Micro-benchmarks of the authentication hot paths: ids, bcrypt, JWTs and the signup email check.
+
+Run with `python -m pytest tests/benchmarks --benchmark-only`; see the README for storing a baseline
+and failing on regressions.
+"""
+import re
+
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+from src.config.env_setting import Settings
+from src.config.jwt_token import JWTManager
+from src.config.security import PasswordManager
+from src.controllers.user_controller import UserControllersClass
+from src.utils.generate_unique_key import generate_unique_key
+from src.utils.id_generator import sortable_id_generator
+
+
+PASSWORD = "StrongP@ssw0rd"
+PAYLOAD = {"user_id": "QSGFEHJ4875YKFBKJHFK", "email": "test@gmail.com", "session_id": "1234"}
+BCRYPT_ROUNDS = Settings().BCRYPT_ROUNDS
+
+
+def test_generate_unique_key(benchmark):
+    key = benchmark(generate_unique_key)
+    assert len(key) == 20
+
+
+def test_generate_sortable_id(benchmark):
+    key = benchmark(sortable_id_generator.generate)
+    assert len(key) == 26
+
+
+def test_encode_and_hash_password(benchmark):
+    # bcrypt at the configured cost takes hundreds of milliseconds, so a few rounds are enough
+    hashed_password = benchmark.pedantic(PasswordManager.encode_and_hash_password, args=(PASSWORD, BCRYPT_ROUNDS), rounds=5, iterations=1)
+    assert PasswordManager.get_hash_rounds(hashed_password) == BCRYPT_ROUNDS
+
+
+def test_verify_password(benchmark):
+    hashed_password = PasswordManager.encode_and_hash_password(PASSWORD, BCRYPT_ROUNDS)
+    assert benchmark.pedantic(PasswordManager.verify_password, args=(PASSWORD, hashed_password), rounds=5, iterations=1)
+
+
+def test_create_access_token(benchmark):
+    jwt_manager = JWTManager()
+    token = benchmark(lambda: jwt_manager.create_access_token(dict(PAYLOAD)))
+    assert token.count(".") == 2
+
+
+def test_decode_access_token(benchmark):
+    jwt_manager = JWTManager()
+    jwt_manager.verify_cache_enabled = False
+    token = jwt_manager.create_access_token(dict(PAYLOAD))
+    assert benchmark(jwt_manager.decode_token, token, False)["user_id"] == PAYLOAD["user_id"]
+
+
+@pytest.mark.parametrize("email, valid", [
+    ("reader@example.com", True),
+    ("first.last+books@mail.example.co.uk", True),
+    ("a" * 64 + "@" + "b" * 60 + ".c", False),
+], ids=["simple", "dotted", "long-invalid"])
+def test_email_regex(benchmark, email, valid):
+    pattern = UserControllersClass().email_regex_parrern
+    assert bool(benchmark(re.match, pattern, email)) is valid
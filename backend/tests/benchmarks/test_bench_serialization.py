@@ -0,0 +1,38 @@
+"""
+Micro-benchmarks of the book serializers used by every book response.
+"""
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+from src.serializers.book_serializer import all_books_data, book_data
+
+
+def make_book(index: int) -> dict:
+    return {
+        "_id": f"object-id-{index}",
+        "user_id": "QSGFEHJ4875YKFBKJHFK",
+        "book_id": f"BOOK{index:016d}",
+        "category": "Fiction",
+        "book_title": f"The Book Number {index}",
+        "book_author": "Jane Author",
+        "book_price": 10.5 + index % 100,
+        "publisher": "Publisher House",
+        "published_date": "2020-01-01",
+        "page_count": 100 + index % 500,
+        "language": "English",
+        "book_rating": 4.5,
+        "book_image": f"https://example.com/images/{index}.png",
+        "created_at": "2024-01-01 00:00:00.000000",
+        "updated_at": "2024-01-01 00:00:00.000000",
+    }
+
+
+def test_book_data(benchmark):
+    assert "_id" not in benchmark(book_data, make_book(1))
+
+
+@pytest.mark.parametrize("size", [100, 1000])
+def test_all_books_data(benchmark, size):
+    books = [make_book(index) for index in range(size)]
+    assert len(benchmark(all_books_data, books)) == size
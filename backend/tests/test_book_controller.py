@@ -0,0 +1,550 @@
+import json
+
+import anyio
+import bson
+import pytest
+from bson.raw_bson import RawBSONDocument
+from fastapi import HTTPException
+from pymongo import ReturnDocument
+from pymongo.errors import BulkWriteError
+from unittest.mock import patch, MagicMock
+
+from src.config.database import AsyncCollection
+from src.config.response_cache import response_cache, ResponseCache, InMemoryResponseCacheBackend
+from src.controllers.book_controller import BookController
+from src.routes.book_route import book_router
+from src.schemas.book_schema import BookQueryParams
+from src.utils.etag import etag_matches
+from src.utils.pagination_cursor import decode_cursor
+
+
+MOCK_USER_ID = "QSGFEHJ4875YKFBKJHFK"
+
+
+def make_book(book_id: str) -> dict:
+    """Build a stored book document."""
+    return {
+        "user_id": MOCK_USER_ID,
+        "book_id": book_id,
+        "category": "Fiction",
+        "book_title": f"Title {book_id}",
+        "book_author": "Author",
+        "book_price": 10.5,
+        "publisher": "Publisher",
+        "published_date": "2020-01-01",
+        "page_count": 100,
+        "language": "English",
+        "book_rating": 4.5,
+        "book_image": "https://example.com/image.png",
+        "created_at": "2024-01-01 00:00:00",
+        "updated_at": "2024-01-01 00:00:00",
+    }
+
+
+@pytest.fixture
+def mock_collection():
+    """A pymongo books collection mock served to the controller through AsyncCollection (stats go to `.stats`)."""
+    collection = MagicMock()
+    cursor = MagicMock()
+    cursor.sort.return_value = cursor
+    cursor.limit.return_value = cursor
+    collection.find.return_value = cursor
+    collection.cursor = cursor
+    collection.with_options.return_value = collection
+    collection.stats = MagicMock()
+    collection.stats.find_one.return_value = {"catalog_version": 3}
+    collections = {"books": collection, "book_stats": collection.stats}
+
+    def get_collection(collection_name):
+        return AsyncCollection(collections[collection_name], anyio.CapacityLimiter(4))
+
+    # Responses are not cached here, so every call reaches the collection mock
+    with patch.object(response_cache, "enabled", False), \
+         patch.object(BookController, "_get_collection", side_effect=get_collection), \
+         patch.object(BookController, "_start_connection"):
+        yield collection
+
+
+def run(coroutine_function, *args):
+    """Run a controller coroutine and decode its JSON response."""
+    response = anyio.run(coroutine_function, *args)
+    return response.status_code, json.loads(response.body)
+
+
+def test_get_all_books_first_page(mock_collection):
+    """A full page reports has_more and a cursor pointing at its last book."""
+    mock_collection.cursor.__iter__.return_value = iter([make_book("A"), make_book("B"), make_book("C")])
+
+    status_code, body = run(BookController().get_all_books, MOCK_USER_ID, 2)
+
+    assert status_code == 200
+    assert [book["book_id"] for book in body["books"]] == ["A", "B"]
+    assert body["has_more"] is True
+    assert decode_cursor(body["next_cursor"]) == {"book_id": "B"}
+    assert "total_count" not in body
+    mock_collection.find.assert_called_once()
+    assert mock_collection.find.call_args.args[0] == {"user_id": MOCK_USER_ID}
+    mock_collection.cursor.limit.assert_called_once_with(3)
+
+
+def test_get_all_books_next_page_uses_keyset(mock_collection):
+    """The cursor becomes a range condition on book_id instead of a skip."""
+    controller = BookController()
+    mock_collection.cursor.__iter__.return_value = iter([make_book("A"), make_book("B")])
+    _, first_page = run(controller.get_all_books, MOCK_USER_ID, 1)
+
+    mock_collection.cursor.__iter__.return_value = iter([make_book("B")])
+    mock_collection.count_documents.return_value = 2
+    _, second_page = run(controller.get_all_books, MOCK_USER_ID, 1, first_page["next_cursor"], True)
+
+    assert mock_collection.find.call_args.args[0] == {"user_id": MOCK_USER_ID, "book_id": {"$gt": "A"}}
+    mock_collection.cursor.skip.assert_not_called()
+    assert second_page["has_more"] is False
+    assert second_page["next_cursor"] is None
+    assert second_page["total_count"] == 2
+
+
+def test_get_all_books_filters_and_sorts(mock_collection):
+    """Filters become one query and the sort field leads the keyset cursor, with book_id breaking ties."""
+    params = BookQueryParams(category="Fiction", min_price=5, max_price=50, published_from="2020-01-01", sort_by="book_price", order="desc")
+    mock_collection.cursor.__iter__.return_value = iter([make_book("A"), make_book("B")])
+
+    _, body = run(BookController().get_all_books, MOCK_USER_ID, 1, None, False, params)
+
+    assert mock_collection.find.call_args.args[0] == {
+        "user_id": MOCK_USER_ID,
+        "category": "Fiction",
+        "book_price": {"$gte": 5, "$lte": 50},
+        "published_date": {"$gte": "2020-01-01"},
+    }
+    mock_collection.cursor.sort.assert_called_once_with([("book_price", -1), ("book_id", -1)])
+    assert decode_cursor(body["next_cursor"]) == {"book_id": "A", "sort_by": "book_price", "value": 10.5, "order": "desc"}
+
+    mock_collection.cursor.__iter__.return_value = iter([make_book("B")])
+    run(BookController().get_all_books, MOCK_USER_ID, 1, body["next_cursor"], False, params)
+
+    assert mock_collection.find.call_args.args[0] == {
+        "user_id": MOCK_USER_ID,
+        "category": "Fiction",
+        "book_price": {"$gte": 5, "$lte": 10.5},
+        "published_date": {"$gte": "2020-01-01"},
+        "$or": [{"book_price": {"$lt": 10.5}}, {"book_id": {"$lt": "A"}}],
+    }
+
+
+def test_get_all_books_rejects_cursor_from_another_sort(mock_collection):
+    """A cursor only continues the sort order it was issued for."""
+    mock_collection.cursor.__iter__.return_value = iter([make_book("A"), make_book("B")])
+    _, body = run(BookController().get_all_books, MOCK_USER_ID, 1)
+
+    with pytest.raises(HTTPException) as excinfo:
+        anyio.run(BookController().get_all_books, MOCK_USER_ID, 1, body["next_cursor"], False, BookQueryParams(sort_by="book_rating"))
+
+    assert excinfo.value.status_code == 400
+
+
+def test_get_all_books_raw_bson_matches_dict_path(mock_collection):
+    """The raw BSON read path returns the same page as the decoded one."""
+    books = [make_book("A"), make_book("B"), make_book("C")]
+    mock_collection.cursor.__iter__.return_value = iter(books)
+    _, decoded_page = run(BookController().get_all_books, MOCK_USER_ID, 2)
+
+    controller = BookController()
+    controller.Config.BOOK_RAW_BSON_READS = True
+    mock_collection.cursor.__iter__.return_value = iter([RawBSONDocument(bson.encode(book)) for book in books])
+    status_code, raw_page = run(controller.get_all_books, MOCK_USER_ID, 2)
+
+    assert status_code == 200
+    assert raw_page == decoded_page
+    assert mock_collection.with_options.call_args.kwargs["codec_options"].document_class is RawBSONDocument
+
+
+def test_get_book_by_id_raw_bson_uses_projection(mock_collection):
+    """A single raw book is fetched with the Book projection and returned without decoding."""
+    controller = BookController()
+    controller.Config.BOOK_RAW_BSON_READS = True
+    mock_collection.find_one.return_value = RawBSONDocument(bson.encode(make_book("A")))
+
+    status_code, body = run(controller.get_book_by_id, MOCK_USER_ID, "A")
+
+    assert status_code == 200
+    assert body["book"] == make_book("A")
+    assert mock_collection.find_one.call_args.args[1]["_id"] == 0
+
+
+def test_etag_matches_if_none_match_lists():
+    """If-None-Match uses weak comparison and may list several tags."""
+    assert etag_matches('"a", W/"b"', '"b"')
+    assert etag_matches("*", '"b"')
+    assert not etag_matches('"a"', '"b"')
+    assert not etag_matches(None, '"b"')
+
+
+def test_get_book_by_id_honors_if_none_match(mock_collection):
+    """A book whose ETag still matches is answered with 304 and is not serialized."""
+    mock_collection.find_one.return_value = make_book("A")
+    response = anyio.run(BookController().get_book_by_id, MOCK_USER_ID, "A")
+    etag = response.headers["etag"]
+
+    with patch("src.controllers.book_controller.book_data") as serializer:
+        not_modified = anyio.run(BookController().get_book_by_id, MOCK_USER_ID, "A", f"W/{etag}")
+
+    assert not_modified.status_code == 304
+    assert not_modified.body == b""
+    assert not_modified.headers["etag"] == etag
+    serializer.assert_not_called()
+
+    mock_collection.find_one.return_value = {**make_book("A"), "updated_at": "2024-02-01 00:00:00"}
+    assert anyio.run(BookController().get_book_by_id, MOCK_USER_ID, "A", etag).status_code == 200
+
+
+def test_get_all_books_not_modified_skips_the_query(mock_collection):
+    """A listing ETag follows the catalog version; while it matches, the books are not queried."""
+    mock_collection.cursor.__iter__.return_value = iter([make_book("A")])
+    response = anyio.run(BookController().get_all_books, MOCK_USER_ID, 10)
+    etag = response.headers["etag"]
+    mock_collection.find.reset_mock()
+
+    not_modified = anyio.run(BookController().get_all_books, MOCK_USER_ID, 10, None, False, None, etag)
+
+    assert not_modified.status_code == 304
+    mock_collection.find.assert_not_called()
+
+    mock_collection.stats.find_one.return_value = {"catalog_version": 4}
+    mock_collection.cursor.__iter__.return_value = iter([make_book("A")])
+    assert anyio.run(BookController().get_all_books, MOCK_USER_ID, 10, None, False, None, etag).status_code == 200
+    assert anyio.run(BookController().get_all_books, MOCK_USER_ID, 20).headers["etag"] != etag
+
+
+def test_reads_are_cached_until_the_user_mutates(mock_collection):
+    """Repeated reads are served from the response cache; a mutation of that user drops them."""
+    cache = ResponseCache(backend=InMemoryResponseCacheBackend(100, 1_000_000, 60))
+    mock_collection.cursor.__iter__.side_effect = lambda: iter([make_book("A")])
+    mock_collection.find_one.return_value = make_book("A")
+    mock_collection.find_one_and_update.return_value = make_book("A")
+
+    with patch("src.controllers.book_controller.response_cache", cache):
+        controller = BookController()
+        first = anyio.run(controller.get_all_books, MOCK_USER_ID, 10)
+        second = anyio.run(controller.get_all_books, MOCK_USER_ID, 10)
+
+        assert second.body == first.body
+        assert second.headers["etag"] == first.headers["etag"]
+        assert mock_collection.find.call_count == 1
+
+        anyio.run(controller.update_book, {"book_title": "New"}, MOCK_USER_ID, "A")
+        anyio.run(controller.get_all_books, MOCK_USER_ID, 10)
+
+        assert mock_collection.find.call_count == 2
+        assert cache.stats()["hits"] == 1
+
+
+def test_get_book_by_id_costs_one_query(mock_collection):
+    """A single-book read is one find_one: no catalog version lookup and nothing stored in the response cache."""
+    cache = ResponseCache(backend=InMemoryResponseCacheBackend(100, 1_000_000, 60))
+    mock_collection.find_one.return_value = make_book("A")
+
+    with patch("src.controllers.book_controller.response_cache", cache):
+        for _ in range(2):
+            assert anyio.run(BookController().get_book_by_id, MOCK_USER_ID, "A").status_code == 200
+
+    assert mock_collection.find_one.call_count == 2
+    mock_collection.stats.find_one.assert_not_called()
+    assert cache.stats()["entries"] == 0
+
+
+def test_cached_reads_follow_mutations_made_by_another_worker(mock_collection):
+    """A worker whose memory cache never saw the invalidation still stops serving (and 304-ing) the old responses."""
+    worker_a = ResponseCache(backend=InMemoryResponseCacheBackend(100, 1_000_000, 60))
+    mock_collection.cursor.__iter__.side_effect = lambda: iter([make_book("A")])
+    mock_collection.find_one.return_value = make_book("A")
+
+    with patch("src.controllers.book_controller.response_cache", worker_a):
+        controller = BookController()
+        listing = anyio.run(controller.get_all_books, MOCK_USER_ID, 10)
+        anyio.run(controller.get_book_by_id, MOCK_USER_ID, "A")
+
+        # Another worker updates the book: the catalog version moves, worker A's cache is not told
+        mock_collection.stats.find_one.return_value = {"catalog_version": 4}
+        updated = {**make_book("A"), "book_title": "New", "updated_at": "2024-02-01 00:00:00"}
+        mock_collection.cursor.__iter__.side_effect = lambda: iter([updated])
+        mock_collection.find_one.return_value = updated
+
+        fresh_listing = anyio.run(controller.get_all_books, MOCK_USER_ID, 10, None, False, None, listing.headers["etag"])
+        fresh_book = anyio.run(controller.get_book_by_id, MOCK_USER_ID, "A")
+
+    assert fresh_listing.status_code == 200
+    assert json.loads(fresh_listing.body)["books"][0]["book_title"] == "New"
+    assert json.loads(fresh_book.body)["book"]["book_title"] == "New"
+    assert worker_a.stats()["hits"] == 0
+
+
+def test_get_all_books_rejects_invalid_cursor(mock_collection):
+    """A tampered cursor is a client error."""
+    with pytest.raises(HTTPException) as excinfo:
+        anyio.run(BookController().get_all_books, MOCK_USER_ID, 10, "not-a-cursor")
+
+    assert excinfo.value.status_code == 400
+
+
+def test_search_books_ranks_by_text_score(mock_collection):
+    """The search is scoped to the user, sorted by relevance and paged with an offset cursor."""
+    mock_collection.cursor.skip.return_value = mock_collection.cursor
+    controller = BookController()
+    mock_collection.cursor.__iter__.return_value = iter([make_book("B"), make_book("A"), make_book("C")])
+
+    _, first_page = run(controller.search_books, MOCK_USER_ID, "  title ", 2)
+
+    query, projection = mock_collection.find.call_args.args
+    assert query == {"user_id": MOCK_USER_ID, "$text": {"$search": "title"}}
+    assert projection["score"] == {"$meta": "textScore"}
+    assert mock_collection.cursor.sort.call_args.args[0][0] == ("score", {"$meta": "textScore"})
+    assert [book["book_id"] for book in first_page["books"]] == ["B", "A"]
+    assert "score" not in first_page["books"][0]
+    assert first_page["has_more"] is True
+
+    mock_collection.cursor.__iter__.return_value = iter([make_book("C")])
+    _, second_page = run(controller.search_books, MOCK_USER_ID, "title", 2, first_page["next_cursor"])
+
+    mock_collection.cursor.skip.assert_called_once_with(2)
+    assert second_page["has_more"] is False
+
+
+def test_search_books_rejects_blank_query(mock_collection):
+    """A query made only of whitespace is a client error."""
+    with pytest.raises(HTTPException) as excinfo:
+        anyio.run(BookController().search_books, MOCK_USER_ID, "   ")
+
+    assert excinfo.value.status_code == 400
+    mock_collection.find.assert_not_called()
+
+
+def test_export_books_streams_ndjson(mock_collection):
+    """Every book is written as one JSON line, read in cursor batches of the requested size."""
+    mock_collection.cursor.batch_size.return_value = mock_collection.cursor
+    mock_collection.cursor.__iter__.return_value = iter([make_book("A"), make_book("B"), make_book("C")])
+
+    async def export():
+        response = await BookController().export_books(MOCK_USER_ID, 2)
+        return response, [chunk async for chunk in response.body_iterator]
+
+    response, chunks = anyio.run(export)
+
+    assert response.media_type == "application/x-ndjson"
+    assert [json.loads(line)["book_id"] for line in b"".join(chunks).splitlines()] == ["A", "B", "C"]
+    mock_collection.cursor.batch_size.assert_called_once_with(2)
+    mock_collection.cursor.close.assert_called_once()
+
+
+def test_bulk_add_books_reports_per_item_results(mock_collection):
+    """One unordered bulk_write is issued and a failed insert is reported on its own item."""
+    mock_collection.bulk_write.side_effect = BulkWriteError({"writeErrors": [{"index": 1, "errmsg": "duplicate key"}]})
+    items = [{"book_title": "First"}, {"book_title": "Second"}]
+
+    status_code, body = run(BookController().bulk_add_books, items, MOCK_USER_ID)
+
+    assert status_code == 200
+    assert body["status"] == "partial_success"
+    assert [result["status"] for result in body["results"]] == ["created", "failed"]
+    assert body["results"][0]["book"]["book_title"] == "First"
+    mock_collection.bulk_write.assert_called_once()
+    assert mock_collection.bulk_write.call_args.kwargs["ordered"] is False
+
+
+def test_bulk_update_books_skips_unknown_books(mock_collection):
+    """Books that do not belong to the user are not sent to the server."""
+    mock_collection.cursor.__iter__.return_value = iter([{"book_id": "A"}])
+    mock_collection.bulk_write.return_value.bulk_api_result = {"nMatched": 1}
+    items = [{"book_id": "A", "book_title": "New"}, {"book_id": "Z", "book_title": "New"}]
+
+    _, body = run(BookController().bulk_update_books, items, MOCK_USER_ID)
+
+    assert [result["status"] for result in body["results"]] == ["updated", "not_found"]
+    operations = mock_collection.bulk_write.call_args.args[0]
+    assert len(operations) == 1
+
+
+def test_bulk_delete_books_rejects_oversized_batches(mock_collection):
+    """A batch above BOOK_BULK_MAX_BATCH_SIZE is refused before touching the database."""
+    controller = BookController()
+    controller.Config.BOOK_BULK_MAX_BATCH_SIZE = 2
+
+    with pytest.raises(HTTPException) as excinfo:
+        anyio.run(controller.bulk_delete_books, ["A", "B", "C"], MOCK_USER_ID)
+
+    assert excinfo.value.status_code == 400
+    mock_collection.bulk_write.assert_not_called()
+
+
+@pytest.mark.parametrize("method, items", [
+    ("bulk_update_books", [{"book_id": "A", "book_title": "New"}, {"book_id": "B"}, {"book_id": "A", "book_title": "Newer"}]),
+    ("bulk_delete_books", ["A", "B", "A"]),
+])
+def test_bulk_requests_reject_repeated_books(mock_collection, method, items):
+    """A book named twice in one bulk request is refused before touching the database."""
+    with pytest.raises(HTTPException) as excinfo:
+        anyio.run(getattr(BookController(), method), items, MOCK_USER_ID)
+
+    assert excinfo.value.status_code == 400
+    assert "A" in excinfo.value.detail
+    mock_collection.find.assert_not_called()
+    mock_collection.bulk_write.assert_not_called()
+    mock_collection.stats.update_one.assert_not_called()
+
+
+def test_bulk_update_books_reports_books_deleted_meanwhile(mock_collection):
+    """A book deleted between the ownership check and the write is reported as not found, not as updated."""
+    mock_collection.cursor.__iter__.side_effect = [iter([{"book_id": "A"}, {"book_id": "B"}]), iter([{"book_id": "A"}])]
+    mock_collection.bulk_write.return_value.bulk_api_result = {"nMatched": 1}
+    items = [{"book_id": "A", "book_title": "New"}, {"book_id": "B", "book_title": "New"}]
+
+    _, body = run(BookController().bulk_update_books, items, MOCK_USER_ID)
+
+    assert [result["status"] for result in body["results"]] == ["updated", "not_found"]
+    assert body["status"] == "partial_success"
+
+
+@pytest.mark.parametrize("removed, expected", [(2, ["deleted", "deleted"]), (0, ["not_found", "not_found"]), (1, ["conflict", "conflict"])])
+def test_bulk_delete_books_trusts_the_removed_count(mock_collection, removed, expected):
+    """Items are only reported as deleted when the server removed as many books as were sent."""
+    mock_collection.cursor.__iter__.return_value = iter([make_book("A"), make_book("B")])
+    mock_collection.bulk_write.return_value.bulk_api_result = {"nRemoved": removed}
+
+    _, body = run(BookController().bulk_delete_books, ["A", "B"], MOCK_USER_ID)
+
+    assert [result["status"] for result in body["results"]] == expected
+
+
+def test_add_book_does_not_read_back(mock_collection):
+    """The inserted payload is returned without a second query."""
+    mock_collection.insert_one.return_value = MagicMock(inserted_id="object-id")
+
+    status_code, body = run(BookController().add_book, {"book_title": "New"}, MOCK_USER_ID)
+
+    assert status_code == 201
+    assert body["book"]["book_title"] == "New"
+    assert body["book"]["user_id"] == MOCK_USER_ID
+    mock_collection.find_one.assert_not_called()
+
+
+def test_update_book_returns_post_image(mock_collection):
+    """An update that matches but changes nothing still returns the book from the same round trip."""
+    mock_collection.find_one_and_update.return_value = make_book("A")
+
+    status_code, body = run(BookController().update_book, {"book_title": "Title A"}, MOCK_USER_ID, "A")
+
+    assert status_code == 200
+    assert body["book"]["book_id"] == "A"
+    mock_collection.update_one.assert_not_called()
+    mock_collection.find_one.assert_not_called()
+
+
+def test_update_book_applies_stats_deltas(mock_collection):
+    """The pre-image returned by the update gives the stats deltas without another read."""
+    mock_collection.find_one_and_update.return_value = make_book("A")
+
+    run(BookController().update_book, {"category": "History", "book_price": 12.5}, MOCK_USER_ID, "A")
+
+    assert mock_collection.find_one_and_update.call_args.kwargs["return_document"] == ReturnDocument.BEFORE
+    update = mock_collection.stats.update_one.call_args.args[1]
+    assert update["$inc"] == {"category_counts.Fiction": -1, "category_counts.History": 1, "price_sum": 2.0, "catalog_version": 1}
+
+
+def test_delete_book_applies_stats_deltas(mock_collection):
+    """Deleting a book removes it from the stats in the same request."""
+    mock_collection.find_one_and_delete.return_value = make_book("A")
+
+    status_code, _ = run(BookController().delete_book, MOCK_USER_ID, "A")
+
+    assert status_code == 200
+    assert mock_collection.stats.update_one.call_args.args[1]["$inc"]["count"] == -1
+
+
+def test_bulk_delete_books_with_a_repeated_book_keeps_stats_exact(mock_collection):
+    """A repeated book id is refused as a whole, so it can never be subtracted from the stats twice."""
+    mock_collection.cursor.__iter__.return_value = iter([make_book("A")])
+
+    with pytest.raises(HTTPException):
+        anyio.run(BookController().bulk_delete_books, ["A", "A"], MOCK_USER_ID)
+
+    mock_collection.stats.update_one.assert_not_called()
+
+    mock_collection.bulk_write.return_value.bulk_api_result = {"nRemoved": 1}
+    run(BookController().bulk_delete_books, ["A"], MOCK_USER_ID)
+
+    assert mock_collection.stats.update_one.call_args.args[1]["$inc"]["count"] == -1
+
+
+def test_bulk_delete_books_recomputes_stats_after_a_race(mock_collection):
+    """When the server removed fewer books than were sent, the stats are recomputed instead of guessed."""
+    mock_collection.cursor.__iter__.return_value = iter([make_book("A"), make_book("B")])
+    mock_collection.bulk_write.return_value.bulk_api_result = {"nRemoved": 1}
+    mock_collection.aggregate.return_value = iter([])
+
+    run(BookController().bulk_delete_books, ["A", "B"], MOCK_USER_ID)
+
+    mock_collection.aggregate.assert_called_once()
+    update = mock_collection.stats.update_one.call_args.args[1]
+    assert update["$set"]["count"] == 0
+    assert update["$inc"] == {"catalog_version": 1}
+
+
+def test_bulk_delete_books_skips_stats_for_books_deleted_elsewhere(mock_collection):
+    """Books another request deleted first are already accounted for by that request."""
+    mock_collection.cursor.__iter__.return_value = iter([make_book("A")])
+    mock_collection.bulk_write.return_value.bulk_api_result = {"nRemoved": 0}
+
+    run(BookController().bulk_delete_books, ["A"], MOCK_USER_ID)
+
+    mock_collection.stats.update_one.assert_not_called()
+    mock_collection.aggregate.assert_not_called()
+
+
+def test_bulk_update_books_recomputes_stats_after_a_race(mock_collection):
+    """A book deleted while the bulk update ran makes the deltas unknown, so the stats are recomputed."""
+    mock_collection.cursor.__iter__.side_effect = [iter([make_book("A"), make_book("B")]), iter([make_book("A")])]
+    mock_collection.bulk_write.return_value.bulk_api_result = {"nMatched": 1}
+    mock_collection.aggregate.return_value = iter([])
+
+    run(BookController().bulk_update_books, [{"book_id": "A", "book_price": 1.0}, {"book_id": "B", "book_price": 2.0}], MOCK_USER_ID)
+
+    mock_collection.aggregate.assert_called_once()
+    assert "$set" in mock_collection.stats.update_one.call_args.args[1]
+
+
+def test_update_book_not_found(mock_collection):
+    """An update that matches no book is a 404."""
+    mock_collection.find_one_and_update.return_value = None
+
+    with pytest.raises(HTTPException) as excinfo:
+        anyio.run(BookController().update_book, {"book_title": "New"}, MOCK_USER_ID, "missing")
+
+    assert excinfo.value.status_code == 404
+
+
+def test_responses_match_the_declared_models(mock_collection):
+    """The controllers return ORJSONResponse directly, so check their payloads against the routes' OpenAPI models."""
+    models = {route.path: route.response_model for route in book_router.routes if route.response_model}
+    new_book = {key: value for key, value in make_book("A").items() if key not in ("user_id", "book_id", "category", "created_at", "updated_at")}
+    mock_collection.find_one.return_value = make_book("A")
+    mock_collection.find_one_and_update.return_value = make_book("A")
+    mock_collection.delete_one.return_value.deleted_count = 1
+    mock_collection.cursor.__iter__.side_effect = lambda: iter([make_book("A"), make_book("B")])
+    controller = BookController()
+
+    payloads = {
+        "/add-book": run(controller.add_book, new_book, MOCK_USER_ID)[1],
+        "/all-books": run(controller.get_all_books, MOCK_USER_ID, 10)[1],
+        "/search": run(controller.search_books, MOCK_USER_ID, "title")[1],
+        "/stats": run(controller.get_book_stats, MOCK_USER_ID)[1],
+        "/one-book/{book_id}": run(controller.get_book_by_id, MOCK_USER_ID, "A")[1],
+        "/update-book/{book_id}": run(controller.update_book, {"book_title": "New"}, MOCK_USER_ID, "A")[1],
+        "/delete-book/{book_id}": run(controller.delete_book, MOCK_USER_ID, "A")[1],
+    }
+
+    assert set(payloads) == set(models)
+    assert payloads["/add-book"]["book"]["category"] is None
+    for path, payload in payloads.items():
+        model = models[path]
+        # Every field is declared, so nothing the controller sends is hidden from the schema
+        assert model.model_validate(payload).model_dump(exclude_unset=True) == payload, path
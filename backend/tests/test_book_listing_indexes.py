@@ -0,0 +1,91 @@
+import itertools
+import os
+
+import pytest
+from pymongo import MongoClient
+from pymongo.errors import PyMongoError
+
+from src.config.database_indexes import IndexManager, find_stages
+from src.controllers.book_controller import BookController, BOOK_PROJECTION
+from src.schemas.book_schema import BookQueryParams
+from src.utils.pagination_cursor import encode_cursor
+
+
+# Runs against a real server; point MONGO_TEST_URI at a disposable instance
+MONGO_TEST_URI = os.getenv("MONGO_TEST_URI", "mongodb://localhost:27017")
+TEST_DB_NAME = "books_store_test_listing_indexes"
+USER_ID = "QSGFEHJ4875YKFBKJHFK"
+
+FILTERS = [
+    {},
+    {"category": "Fiction"},
+    {"language": "English"},
+    {"category": "Fiction", "language": "English"},
+    {"min_price": 5, "max_price": 50},
+    {"category": "Fiction", "min_rating": 3},
+    {"language": "English", "published_from": "2000-01-01", "published_to": "2020-12-31"},
+]
+SORTS = list(itertools.product(("book_id", "book_price", "book_rating", "created_at"), ("asc", "desc")))
+
+
+@pytest.fixture(scope="module")
+def books_db():
+    """A scratch database with the declared indexes and a few books, skipped when no server is reachable."""
+    client = MongoClient(MONGO_TEST_URI, serverSelectionTimeoutMS=1000)
+    try:
+        client.admin.command("ping")
+    except PyMongoError:
+        pytest.skip(f"MongoDB is not reachable at {MONGO_TEST_URI}")
+
+    db = client[TEST_DB_NAME]
+    db["books"].insert_many([
+        {
+            "user_id": USER_ID if index % 2 else "OTHERUSER",
+            "book_id": f"BOOK{index:04d}",
+            "category": ("Fiction", "History", "Science")[index % 3],
+            "book_price": float(index % 60),
+            "published_date": f"{1990 + index % 35}-01-01",
+            "language": ("English", "French")[index % 2],
+            "book_rating": float(index % 5),
+            "created_at": f"2024-01-01 00:00:{index % 60:02d}",
+        }
+        for index in range(300)
+    ])
+    IndexManager(db).ensure_indexes()
+    yield db
+    client.drop_database(TEST_DB_NAME)
+    client.close()
+
+
+@pytest.mark.parametrize("filters", FILTERS)
+@pytest.mark.parametrize("sort_by, order", SORTS)
+@pytest.mark.parametrize("with_cursor", [False, True])
+def test_listing_is_index_backed_without_in_memory_sort(books_db, filters, sort_by, order, with_cursor):
+    """Every filter/sort combination of get_all_books walks an index in order."""
+    params = BookQueryParams(**filters, sort_by=sort_by, order=order)
+    query = BookController._build_filter_query(USER_ID, params)
+    if with_cursor:
+        position = {"book_id": "BOOK0100", "sort_by": sort_by, "value": "2024-01-01 00:00:10" if sort_by == "created_at" else 10.0, "order": order}
+        if sort_by == "book_id":
+            position = {"book_id": "BOOK0100", "order": order}
+        query = BookController._build_page_query(query, params, encode_cursor(position))
+
+    direction = 1 if order == "asc" else -1
+    sort = [("book_id", direction)] if sort_by == "book_id" else [(sort_by, direction), ("book_id", direction)]
+    explain_output = books_db["books"].find(query, BOOK_PROJECTION).sort(sort).limit(101).explain()
+    winning_plan = explain_output["queryPlanner"]["winningPlan"]
+
+    assert find_stages(winning_plan, "IXSCAN"), winning_plan
+    assert not find_stages(winning_plan, "COLLSCAN"), winning_plan
+    assert not find_stages(winning_plan, "SORT"), winning_plan
+
+
+@pytest.mark.parametrize("language", ["Hindi", "Tamil", "Japanese", "Klingon"])
+def test_text_index_accepts_any_book_language(books_db, language):
+    """The free-form `language` field is not read as the text-search language, so any value can be written."""
+    book = {"user_id": USER_ID, "book_id": f"LANG{language.upper()}", "book_title": "River Shadow", "language": language}
+    books_db["books"].insert_one(book)
+    books_db["books"].update_one({"book_id": book["book_id"]}, {"$set": {"book_title": "Silent Garden"}})
+
+    found = books_db["books"].find_one({"user_id": USER_ID, "$text": {"$search": "garden"}, "book_id": book["book_id"]})
+    assert found["language"] == language
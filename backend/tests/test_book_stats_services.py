@@ -0,0 +1,105 @@
+import anyio
+from unittest.mock import MagicMock
+
+from src.config.database import AsyncCollection
+from src.services.book_stats_services import BookStatsServices, escape_key, unescape_key
+
+
+MOCK_USER_ID = "QSGFEHJ4875YKFBKJHFK"
+
+
+def make_book(book_id: str, category="Fiction", language="English", price=10.0, rating=4.0) -> dict:
+    return {"book_id": book_id, "category": category, "language": language, "book_price": price, "book_rating": rating}
+
+
+def test_escape_key_round_trips_reserved_characters():
+    """Dots, dollars and the escape character itself survive as Mongo field names."""
+    for value in ("Sci.Fi", "$pecial", "100% Fiction", "plain"):
+        key = escape_key(value)
+        assert "." not in key and not key.startswith("$")
+        assert unescape_key(key) == value
+    assert escape_key(None) == "unknown"
+
+
+def test_update_deltas_only_touch_what_changed():
+    """Moving a book to another category shifts one count and leaves the totals alone."""
+    services = BookStatsServices()
+    before = make_book("A", category="Fiction", price=10.0)
+    after = make_book("A", category="Sci.Fi", price=15.0)
+
+    deltas = services.merge_deltas([services.book_deltas(before, -1), services.book_deltas(after, 1)])
+
+    assert deltas == {"category_counts.Fiction": -1, "category_counts.Sci%2EFi": 1, "price_sum": 5.0}
+
+
+def test_record_added_is_one_atomic_upsert():
+    """Several books are folded into a single $inc upsert on the user's stats document."""
+    collection = MagicMock()
+
+    anyio.run(BookStatsServices().record_added, AsyncCollection(collection, anyio.CapacityLimiter(2)), MOCK_USER_ID,
+              [make_book("A"), make_book("B", language="French", price=None)])
+
+    collection.update_one.assert_called_once()
+    query, update = collection.update_one.call_args.args
+    assert query == {"user_id": MOCK_USER_ID}
+    assert update["$inc"] == {
+        "catalog_version": 1, "count": 2, "category_counts.Fiction": 2, "language_counts.English": 1, "language_counts.French": 1,
+        "price_sum": 10.0, "price_count": 1, "rating_sum": 8.0, "rating_count": 2,
+    }
+    assert collection.update_one.call_args.kwargs["upsert"] is True
+
+
+def test_format_stats_computes_averages_and_hides_empty_counts():
+    """Averages come from the sums and categories that dropped to zero are not reported."""
+    stats = BookStatsServices.format_stats({
+        "count": 2, "category_counts": {"Sci%2EFi": 2, "Fiction": 0}, "language_counts": {"English": 2},
+        "price_sum": 25.0, "price_count": 2, "rating_sum": 9.0, "rating_count": 2,
+    })
+
+    assert stats == {"count": 2, "categories": {"Sci.Fi": 2}, "languages": {"English": 2}, "average_price": 12.5, "average_rating": 4.5}
+    assert BookStatsServices.format_stats(None)["average_price"] is None
+
+
+def test_rebuild_folds_groups_into_one_document_per_user():
+    """The per (user, category, language) $group output is folded into the same shape the deltas maintain, keeping the catalog version increasing."""
+    groups = [
+        {"_id": {"user_id": MOCK_USER_ID, "category": "Fiction", "language": "English"}, "count": 2, "price_sum": 20.0, "price_count": 2, "rating_sum": 8.0, "rating_count": 2},
+        {"_id": {"user_id": MOCK_USER_ID, "category": "Sci.Fi", "language": "French"}, "count": 1, "price_sum": 0, "price_count": 0, "rating_sum": 5.0, "rating_count": 1},
+    ]
+    db = MagicMock()
+    db["books"].aggregate.return_value = iter(groups)
+
+    assert BookStatsServices().rebuild(db) == 1
+
+    query, update = db["book_stats"].update_one.call_args.args
+    rebuilt = update["$set"]
+    assert query == {"user_id": MOCK_USER_ID}
+    assert update["$inc"] == {"catalog_version": 1}
+    assert rebuilt["count"] == 3
+    assert rebuilt["category_counts"] == {"Fiction": 2, "Sci%2EFi": 1}
+    assert rebuilt["language_counts"] == {"English": 2, "French": 1}
+    assert (rebuilt["price_sum"], rebuilt["price_count"], rebuilt["rating_sum"], rebuilt["rating_count"]) == (20.0, 2, 13.0, 3)
+    stale_query, stale_update = db["book_stats"].update_many.call_args.args
+    assert stale_query == {"user_id": {"$nin": [MOCK_USER_ID]}}
+    assert stale_update["$set"]["count"] == 0
+
+
+def test_recompute_replaces_one_users_stats_from_their_books():
+    """The async recompute writes the folded groups of one user, or zero stats once they have no books left."""
+    books, stats = MagicMock(), MagicMock()
+    books.aggregate.return_value = iter([
+        {"_id": {"user_id": MOCK_USER_ID, "category": "Fiction", "language": "English"}, "count": 2, "price_sum": 20.0, "price_count": 2, "rating_sum": 8.0, "rating_count": 2},
+    ])
+    limiter = anyio.CapacityLimiter(2)
+
+    anyio.run(BookStatsServices().recompute, AsyncCollection(books, limiter), AsyncCollection(stats, limiter), MOCK_USER_ID)
+
+    assert books.aggregate.call_args.args[0][0] == {"$match": {"user_id": MOCK_USER_ID}}
+    query, update = stats.update_one.call_args.args
+    assert query == {"user_id": MOCK_USER_ID}
+    assert update["$set"]["count"] == 2 and update["$inc"] == {"catalog_version": 1}
+
+    books.aggregate.return_value = iter([])
+    anyio.run(BookStatsServices().recompute, AsyncCollection(books, limiter), AsyncCollection(stats, limiter), MOCK_USER_ID)
+
+    assert stats.update_one.call_args.args[1]["$set"]["count"] == 0
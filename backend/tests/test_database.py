@@ -0,0 +1,123 @@
+import threading
+
+import anyio
+import pytest
+from unittest.mock import patch, MagicMock
+
+from src.config.database import MongoDBConnection, AsyncCollection, AsyncCursor
+
+
+MOCK_URI = "mongodb://localhost:27017"
+MOCK_DB_NAME = "test_db"
+
+
+@pytest.fixture
+def mock_mongo_client():
+    """Mock the pymongo client and reset the shared pool around each test."""
+    MongoDBConnection.close_client_pool()
+    with patch("src.config.database.MongoClient") as MockClient:
+        MockClient.return_value = MagicMock()
+        yield MockClient
+    MongoDBConnection.close_client_pool()
+
+
+def test_connections_share_one_client(mock_mongo_client):
+    """Every MongoDBConnection reuses the process-wide client."""
+    first = MongoDBConnection(MOCK_URI, MOCK_DB_NAME)
+    second = MongoDBConnection(MOCK_URI, MOCK_DB_NAME)
+
+    first.start_connection()
+    second.start_connection()
+    first.start_connection()
+
+    assert mock_mongo_client.call_count == 1
+    assert first.client is second.client
+
+
+def test_pool_options_come_from_settings(mock_mongo_client):
+    """The pool limits are passed to the driver."""
+    MongoDBConnection(MOCK_URI, MOCK_DB_NAME).start_connection()
+
+    kwargs = mock_mongo_client.call_args.kwargs
+    assert "maxPoolSize" in kwargs
+    assert "minPoolSize" in kwargs
+    assert "maxIdleTimeMS" in kwargs
+    assert "waitQueueTimeoutMS" in kwargs
+
+
+def test_close_connection_keeps_pool_open(mock_mongo_client):
+    """Per-request close does not tear down the shared pool and no ping is issued per request."""
+    connection = MongoDBConnection(MOCK_URI, MOCK_DB_NAME)
+    connection.start_connection()
+    connection.close_connection()
+
+    mock_mongo_client.return_value.close.assert_not_called()
+    mock_mongo_client.return_value.admin.command.assert_not_called()
+
+    MongoDBConnection.close_client_pool()
+    mock_mongo_client.return_value.close.assert_called_once()
+
+
+def test_health_check_is_cached(mock_mongo_client):
+    """Repeated health checks within the interval ping the server once."""
+    MongoDBConnection.create_client_pool(MOCK_URI)
+
+    assert MongoDBConnection.check_health() is True
+    assert MongoDBConnection.check_health() is True
+    assert mock_mongo_client.return_value.admin.command.call_count == 1
+
+    assert MongoDBConnection.check_health(force=True) is True
+    assert mock_mongo_client.return_value.admin.command.call_count == 2
+
+
+def test_health_check_reports_failure(mock_mongo_client):
+    """A failing ping marks the database as unhealthy."""
+    MongoDBConnection.create_client_pool(MOCK_URI)
+    mock_mongo_client.return_value.admin.command.side_effect = Exception("connection refused")
+
+    assert MongoDBConnection.check_health(force=True) is False
+
+
+def test_health_check_does_not_cache_failures(mock_mongo_client):
+    """After a failed ping the next check pings again, so a recovered server is reported healthy at once."""
+    MongoDBConnection.create_client_pool(MOCK_URI)
+    ping = mock_mongo_client.return_value.admin.command
+    ping.side_effect = [Exception("connection refused"), {"ok": 1}, {"ok": 1}]
+
+    with patch("src.config.database.Settings") as MockSettings:
+        assert MongoDBConnection.check_health() is False
+        assert MongoDBConnection.check_health() is True
+        assert MongoDBConnection.check_health() is True
+
+    assert ping.call_count == 2
+    MockSettings.assert_not_called()
+
+
+def test_async_collection_runs_driver_off_the_event_loop():
+    """Driver calls made through AsyncCollection run in a worker thread."""
+    calling_threads = []
+    collection = MagicMock()
+    collection.find_one.side_effect = lambda *args, **kwargs: calling_threads.append(threading.get_ident()) or {"book_id": "1"}
+
+    async def run():
+        async_collection = AsyncCollection(collection, anyio.CapacityLimiter(2))
+        return await async_collection.find_one({"book_id": "1"}), threading.get_ident()
+
+    result, loop_thread = anyio.run(run)
+
+    assert result == {"book_id": "1"}
+    assert calling_threads and calling_threads[0] != loop_thread
+
+
+def test_async_cursor_iterates_in_batches():
+    """AsyncCursor yields every document and closes the cursor afterwards."""
+    cursor = MagicMock()
+    cursor.__iter__.return_value = iter([{"book_id": str(i)} for i in range(5)])
+    cursor.batch_size.return_value = cursor
+
+    async def run():
+        async_cursor = AsyncCursor(cursor, anyio.CapacityLimiter(2)).batch_size(2)
+        return [document["book_id"] async for document in async_cursor]
+
+    assert anyio.run(run) == ["0", "1", "2", "3", "4"]
+    cursor.close.assert_called_once()
@@ -0,0 +1,187 @@
+import pytest
+from pymongo.errors import DuplicateKeyError, OperationFailure
+from unittest.mock import MagicMock, call
+
+from src.config.database_indexes import IndexManager, find_collscan_stages
+from src.config.env_setting import Settings
+
+
+@pytest.fixture
+def mock_config():
+    """Settings with known expiry values."""
+    config = Settings()
+    config.USER_SESSION_EXPIRY_MINUTES = 30
+    config.JWT_REFRESH_EXPIRY_DAYS = 7
+    return config
+
+
+@pytest.fixture
+def mock_db():
+    """A database mock whose collections report no existing indexes."""
+    collections = {}
+
+    def get_collection(name):
+        if name not in collections:
+            collection = MagicMock()
+            collection.index_information.return_value = {"_id_": {"key": [("_id", 1)]}}
+            collections[name] = collection
+        return collections[name]
+
+    db = MagicMock()
+    db.__getitem__.side_effect = get_collection
+    db.collections = collections
+    return db
+
+
+def test_find_collscan_stages_walks_nested_plans():
+    """COLLSCAN stages are found at any depth, IXSCAN plans pass."""
+    index_plan = {"stage": "FETCH", "inputStage": {"stage": "IXSCAN", "indexName": "users_email_unique"}}
+    collscan_plan = {"stage": "SORT", "inputStage": {"stage": "OR", "inputStages": [index_plan, {"stage": "COLLSCAN"}]}}
+
+    assert find_collscan_stages(index_plan) == []
+    assert find_collscan_stages(collscan_plan) == [{"stage": "COLLSCAN"}]
+
+
+def test_ttl_indexes_follow_settings(mock_config):
+    """TTL indexes expire sessions and refresh tokens after the configured lifetimes."""
+    definitions = IndexManager(MagicMock(), mock_config).index_definitions()
+
+    session_ttl = [index.document for index in definitions["user_sessions"] if "expireAfterSeconds" in index.document]
+    refresh_ttl = [index.document for index in definitions["refresh_tokens"] if "expireAfterSeconds" in index.document]
+
+    assert session_ttl[0]["expireAfterSeconds"] == 30 * 60
+    assert refresh_ttl[0]["expireAfterSeconds"] == 7 * 24 * 60 * 60
+
+
+def test_ensure_indexes_creates_missing_indexes(mock_db, mock_config):
+    """Every declared index is created on an empty database."""
+    report = IndexManager(mock_db, mock_config).ensure_indexes()
+
+    assert "users_email_unique" in report["users"]["created"]
+    assert "books_user_id_book_id_unique" in report["books"]["created"]
+    mock_db.collections["users"].create_indexes.assert_called()
+
+
+def test_ensure_indexes_updates_ttl_in_place(mock_db, mock_config):
+    """A changed TTL is applied with collMod instead of dropping the index."""
+    sessions = mock_db["user_sessions"]
+    sessions.index_information.return_value = {
+        "user_sessions_session_id_unique": {"key": [("session_id", 1)], "unique": True},
+        "user_sessions_created_at_ttl": {"key": [("created_at", 1)], "expireAfterSeconds": 60},
+    }
+
+    report = IndexManager(mock_db, mock_config).ensure_indexes()
+
+    assert report["user_sessions"]["updated"] == ["user_sessions_created_at_ttl"]
+    assert report["user_sessions"]["unchanged"] == ["user_sessions_session_id_unique"]
+    sessions.drop_index.assert_not_called()
+    mock_db.command.assert_called_once_with(
+        "collMod", "user_sessions", index={"name": "user_sessions_created_at_ttl", "expireAfterSeconds": 30 * 60}
+    )
+
+
+def test_ensure_indexes_rebuilds_changed_keys(mock_db, mock_config):
+    """An index whose options changed is rebuilt while a bridge index serves its queries."""
+    users = mock_db["users"]
+    users.index_information.return_value = {"users_email_unique": {"key": [("email", 1)]}}
+
+    report = IndexManager(mock_db, mock_config).ensure_indexes()
+
+    assert report["users"]["rebuilt"] == ["users_email_unique"]
+    bridge, replacement = [create.args[0][0].document for create in users.create_indexes.call_args_list[:2]]
+    assert bridge["name"] == "users_email_unique_rebuild"
+    assert list(bridge["key"].items()) == [("email", 1), ("_id", 1)]
+    assert replacement["name"] == "users_email_unique" and replacement["unique"] is True
+    assert users.drop_index.call_args_list == [call("users_email_unique"), call("users_email_unique_rebuild")]
+    mock_db["index_rebuilds"].delete_one.assert_called_once_with({"_id": "users.users_email_unique"})
+
+
+def test_failed_rebuild_restores_the_previous_index(mock_db, mock_config):
+    """If the replacement cannot be built the old index is recreated; if the bridge cannot, it is never dropped."""
+    users = mock_db["users"]
+    users.index_information.return_value = {"users_email_unique": {"key": [("email", 1)]}}
+    users.create_indexes.side_effect = [None, OperationFailure("E11000 duplicate key"), None, None]
+
+    report = IndexManager(mock_db, mock_config).ensure_indexes()
+
+    assert report["users"]["failed"] == ["users_email_unique"]
+    restored = users.create_indexes.call_args_list[2].args[0][0].document
+    assert restored == {"key": {"email": 1}, "name": "users_email_unique"}
+    assert users.drop_index.call_args_list == [call("users_email_unique"), call("users_email_unique_rebuild")]
+
+    users.reset_mock()
+    users.create_indexes.side_effect = [OperationFailure("out of disk"), None]
+    report = IndexManager(mock_db, mock_config).ensure_indexes()
+
+    assert report["users"]["failed"] == ["users_email_unique"]
+    users.drop_index.assert_not_called()
+
+
+def test_rebuild_claimed_by_another_worker_is_left_alone(mock_db, mock_config):
+    """Workers starting together rebuild an index once; the others keep the old index and report it in progress."""
+    users = mock_db["users"]
+    users.index_information.return_value = {"users_email_unique": {"key": [("email", 1)]}}
+    mock_db["index_rebuilds"].update_one.side_effect = DuplicateKeyError("lock held")
+
+    report = IndexManager(mock_db, mock_config).ensure_indexes()
+
+    assert report["users"]["in_progress"] == ["users_email_unique"]
+    users.drop_index.assert_not_called()
+    mock_db["index_rebuilds"].delete_one.assert_not_called()
+
+
+def test_text_index_is_restored_from_its_server_form():
+    """A dropped text index is declared again from the `_fts` keys and weights the server reports."""
+    info = {
+        "v": 2,
+        "key": [("user_id", 1), ("_fts", "text"), ("_ftsx", 1)],
+        "weights": {"book_title": 10, "publisher": 1},
+        "default_language": "english",
+        "language_override": "language",
+        "textIndexVersion": 3,
+    }
+
+    document = IndexManager._index_model_from_info("books_user_id_text", info).document
+
+    assert list(document["key"].items()) == [("user_id", 1), ("book_title", "text"), ("publisher", "text")]
+    assert document["weights"] == {"book_title": 10, "publisher": 1}
+    assert document["language_override"] == "language"
+
+
+def test_ensure_indexes_keeps_matching_text_index(mock_db, mock_config):
+    """A text index reported in its server form (`_fts`/`_ftsx` plus weights) is not rebuilt on every start."""
+    books = mock_db["books"]
+    books.index_information.return_value = {
+        "books_user_id_text": {
+            "key": [("user_id", 1), ("_fts", "text"), ("_ftsx", 1)],
+            "weights": {"book_title": 10, "book_author": 5, "publisher": 1},
+            "default_language": "english",
+            "language_override": "text_language",
+        },
+    }
+
+    report = IndexManager(mock_db, mock_config).ensure_indexes()
+
+    assert "books_user_id_text" in report["books"]["unchanged"]
+
+    books.index_information.return_value["books_user_id_text"]["weights"]["publisher"] = 3
+    report = IndexManager(mock_db, mock_config).ensure_indexes()
+
+    assert "books_user_id_text" in report["books"]["rebuilt"]
+
+
+def test_ensure_indexes_rebuilds_text_index_reading_the_book_language(mock_db, mock_config):
+    """A text index created with the server's default `language_override` is rebuilt to ignore the books' `language`."""
+    books = mock_db["books"]
+    books.index_information.return_value = {
+        "books_user_id_text": {
+            "key": [("user_id", 1), ("_fts", "text"), ("_ftsx", 1)],
+            "weights": {"book_title": 10, "book_author": 5, "publisher": 1},
+            "default_language": "english",
+            "language_override": "language",
+        },
+    }
+
+    report = IndexManager(mock_db, mock_config).ensure_indexes()
+
+    assert "books_user_id_text" in report["books"]["rebuilt"]
@@ -0,0 +1,293 @@
+import asyncio
+import socket
+
+import aiosmtplib
+import anyio
+import pytest
+from datetime import datetime, timedelta, timezone
+from fastapi_mail import ConnectionConfig
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from src.config.database import AsyncCollection
+from src.config.email_config import (
+    SMTP_SEND_STEPS, SMTPConnectionPool, conf, build_email_message, is_permanent_email_failure, render_email, smtp_send_deadline,
+)
+from src.config.env_setting import Settings
+from src.services.email_delivery_worker import EmailDeliveryWorker
+from src.services.email_outbox_services import EmailOutboxServices
+from src.services.email_services import EmailServices
+
+
+MOCK_USER = {"user_id": "QSGFEHJ4875YKFBKJHFK", "name": "Test User", "email": "test@gmail.com"}
+
+
+@pytest.fixture
+def mock_collection():
+    """A pymongo collection mock served to the outbox through AsyncCollection."""
+    collection = MagicMock()
+    with patch.object(EmailOutboxServices, "_get_collection", return_value=AsyncCollection(collection, anyio.CapacityLimiter(4))):
+        yield collection
+
+
+def claimed_message(attempts: int = 1) -> dict:
+    return {
+        "message_id": "MESSAGE",
+        "recipients": ["test@gmail.com"],
+        "subject": "Account Verification",
+        "template_name": "account-verification.html",
+        "context": {"app_name": "Books", "name": "Test User", "activate_url": "http://localhost/activate"},
+        "attempts": attempts,
+    }
+
+
+def test_email_services_only_enqueue(mock_collection):
+    """Sending an email inserts a pending outbox entry instead of talking to SMTP."""
+    with patch("src.services.email_services.email_delivery_worker") as worker:
+        result = anyio.run(EmailServices().send_account_verification_email, MOCK_USER, None, "http://localhost/activate")
+
+    assert result is True
+    worker.notify.assert_called_once()
+    document = mock_collection.insert_one.call_args.args[0]
+    assert document["status"] == "pending"
+    assert document["attempts"] == 0
+    assert document["recipients"] == ["test@gmail.com"]
+    assert document["template_name"] == "account-verification.html"
+    assert document["context"]["activate_url"] == "http://localhost/activate"
+    assert document["next_attempt_at"] <= datetime.now(timezone.utc)
+
+
+def test_claim_leases_the_oldest_due_email(mock_collection):
+    """A claim moves the email to "sending", counts the attempt and pushes it past the lease."""
+    mock_collection.find_one_and_update.return_value = claimed_message()
+    before = datetime.now(timezone.utc)
+
+    assert anyio.run(EmailOutboxServices().claim_next) == claimed_message()
+
+    query, update = mock_collection.find_one_and_update.call_args.args
+    kwargs = mock_collection.find_one_and_update.call_args.kwargs
+    assert query["status"] == {"$in": ["pending", "sending"]}
+    assert query["next_attempt_at"]["$lte"] >= before
+    assert query["attempts"] == {"$lt": Settings().EMAIL_MAX_ATTEMPTS}
+    assert update["$set"]["status"] == "sending"
+    assert update["$set"]["next_attempt_at"] >= before + timedelta(seconds=smtp_send_deadline(conf))
+    assert update["$inc"] == {"attempts": 1}
+    assert kwargs["sort"] == [("next_attempt_at", 1)]
+
+
+def test_lease_outlasts_the_smtp_send_deadline():
+    """The lease is sized from the SMTP timeout, so a send cut off at its deadline is still under lease."""
+    config = Settings()
+    config.EMAIL_OUTBOX_LEASE_MARGIN_SECONDS = 30
+    slow_smtp = conf.model_copy(update={"TIMEOUT": 100})
+
+    worker = EmailDeliveryWorker(config, smtp_pool=MagicMock(config=slow_smtp))
+
+    assert worker.send_deadline == SMTP_SEND_STEPS * 100
+    assert worker.outbox.lease_seconds == worker.send_deadline + 30
+    assert EmailOutboxServices(config).lease_seconds == smtp_send_deadline(conf) + 30
+
+
+def test_expired_last_attempts_are_failed(mock_collection):
+    """A lease that ran out on the last allowed attempt moves the email to "failed" instead of leaving it claimed."""
+    mock_collection.update_many.return_value.modified_count = 2
+    outbox = EmailOutboxServices()
+    outbox.Config.EMAIL_MAX_ATTEMPTS = 3
+
+    assert anyio.run(outbox.fail_expired_leases) == 2
+
+    query, update = mock_collection.update_many.call_args.args
+    assert query["status"] == "sending"
+    assert query["attempts"] == {"$gte": 3}
+    assert query["next_attempt_at"]["$lte"] <= datetime.now(timezone.utc)
+    assert update["$set"]["status"] == "failed"
+    assert update["$unset"] == {"next_attempt_at": ""}
+
+
+def test_failed_attempt_is_retried_with_backoff_then_given_up(mock_collection):
+    """Failures are rescheduled with a growing delay until the attempts run out."""
+    outbox = EmailOutboxServices()
+    outbox.Config.EMAIL_RETRY_BASE_SECONDS = 10
+    outbox.Config.EMAIL_RETRY_MAX_SECONDS = 60
+    outbox.Config.EMAIL_MAX_ATTEMPTS = 3
+
+    assert 5 <= outbox.retry_delay(1) <= 10
+    assert 20 <= outbox.retry_delay(3) <= 40
+    assert 30 <= outbox.retry_delay(10) <= 60
+
+    assert anyio.run(outbox.mark_failed, claimed_message(attempts=1), "timeout") == "pending"
+    query, update = mock_collection.update_one.call_args.args
+    assert query == {"message_id": "MESSAGE", "attempts": 1}
+    assert update["$set"]["last_error"] == "timeout"
+    assert update["$set"]["next_attempt_at"] > datetime.now(timezone.utc)
+
+    assert anyio.run(outbox.mark_failed, claimed_message(attempts=3), "timeout") == "failed"
+    assert anyio.run(outbox.mark_failed, claimed_message(attempts=1), "rejected", True) == "failed"
+    assert mock_collection.update_one.call_args.args[1]["$unset"] == {"next_attempt_at": ""}
+
+
+def test_permanent_failures_are_classified():
+    """Rejected recipients, 5xx replies and missing templates are not retried."""
+    assert is_permanent_email_failure(aiosmtplib.SMTPRecipientsRefused([]))
+    assert is_permanent_email_failure(aiosmtplib.SMTPResponseException(550, "mailbox unavailable"))
+    assert not is_permanent_email_failure(aiosmtplib.SMTPResponseException(451, "try again later"))
+    assert not is_permanent_email_failure(aiosmtplib.SMTPServerDisconnected("gone"))
+
+
+def test_render_and_build_message():
+    """The template is rendered with its context into an HTML message carrying the outbox id."""
+    html = render_email("account-verification.html", claimed_message()["context"])
+    message = build_email_message(["test@gmail.com"], "Subject", html, "MESSAGE")
+
+    assert "http://localhost/activate" in html
+    assert message["To"] == "test@gmail.com"
+    assert "MESSAGE" in message["Message-ID"]
+    assert message.get_content_type() == "text/html"
+
+
+def test_retries_carry_the_same_message_id():
+    """Two builds of the same outbox entry get equal Message-ID headers, made only from the outbox id."""
+    first = build_email_message(["test@gmail.com"], "Subject", "<p>hi</p>", "MESSAGE")
+    second = build_email_message(["test@gmail.com"], "Subject", "<p>hi</p>", "MESSAGE")
+
+    assert first["Message-ID"] == second["Message-ID"] == f"<MESSAGE@{conf.MAIL_FROM.rpartition('@')[2]}>"
+    assert build_email_message(["test@gmail.com"], "Subject", "<p>hi</p>")["Message-ID"] != first["Message-ID"]
+
+
+def test_worker_records_the_delivery_outcome():
+    """A sent email is marked sent; a failed one is handed back to the outbox with its classification."""
+    outbox = MagicMock(mark_sent=AsyncMock(), mark_failed=AsyncMock(return_value="failed"))
+    smtp_pool = MagicMock(send=AsyncMock(), config=conf)
+    worker = EmailDeliveryWorker(Settings(), outbox, smtp_pool)
+
+    assert anyio.run(worker.deliver, claimed_message()) == "sent"
+    outbox.mark_sent.assert_awaited_once_with(claimed_message())
+
+    smtp_pool.send.side_effect = aiosmtplib.SMTPRecipientsRefused([])
+    assert anyio.run(worker.deliver, claimed_message()) == "failed"
+    assert outbox.mark_failed.call_args.kwargs == {"permanent": True}
+    assert (worker.sent, worker.failed) == (1, 1)
+
+
+def test_worker_cuts_a_hung_send_off_at_the_deadline():
+    """A send that outlives the deadline is abandoned and retried, before its lease can run out."""
+    async def hang(message):
+        await asyncio.sleep(60)
+
+    outbox = MagicMock(mark_failed=AsyncMock(return_value="pending"))
+    worker = EmailDeliveryWorker(Settings(), outbox, MagicMock(send=hang, config=conf))
+    worker.send_deadline = 0.01
+
+    assert anyio.run(worker.deliver, claimed_message()) == "pending"
+    assert outbox.mark_failed.call_args.args[1] == "TimeoutError"
+    assert outbox.mark_failed.call_args.kwargs == {"permanent": False}
+    assert worker.retried == 1
+
+
+def test_cancelled_send_closes_the_session():
+    """A send cut off at the deadline closes its session and frees its pool slot instead of leaking them."""
+    class HangingSMTP:
+        def __init__(self, **kwargs):
+            self.is_connected = False
+            self.closed = False
+            sessions.append(self)
+
+        async def connect(self):
+            self.is_connected = True
+
+        async def login(self, username, password):
+            assert password == conf.MAIL_PASSWORD
+
+        async def send_message(self, message):
+            await asyncio.sleep(60)
+
+        def close(self):
+            self.closed = True
+
+    sessions = []
+
+    async def scenario():
+        pool = SMTPConnectionPool(conf, max_size=1)
+        for _ in range(2):
+            with pytest.raises(asyncio.TimeoutError):
+                await asyncio.wait_for(pool.send(build_email_message(["test@gmail.com"], "Subject", "<p>hi</p>")), 0.01)
+        return pool
+
+    with patch("src.config.email_config.aiosmtplib.SMTP", HangingSMTP):
+        pool = asyncio.run(scenario())
+
+    assert [session.closed for session in sessions] == [True, True]
+    assert pool.stats()["idle_connections"] == 0
+
+
+def test_worker_drains_the_outbox_after_notify():
+    """Started consumers claim and send queued emails without waiting for the poll interval."""
+    async def scenario():
+        queue = [claimed_message(), None]
+        outbox = MagicMock(
+            claim_next=AsyncMock(side_effect=lambda: queue.pop(0) if queue else None),
+            mark_sent=AsyncMock(),
+            fail_expired_leases=AsyncMock(return_value=0),
+        )
+        config = Settings()
+        config.EMAIL_DELIVERY_CONCURRENCY = 1
+        config.EMAIL_OUTBOX_POLL_INTERVAL_SECONDS = 60
+        worker = EmailDeliveryWorker(config, outbox, MagicMock(send=AsyncMock(), close=AsyncMock(), config=conf))
+
+        worker.start()
+        for _ in range(100):
+            if worker.sent:
+                break
+            await asyncio.sleep(0.01)
+        queue.append(claimed_message())
+        worker.notify()
+        for _ in range(100):
+            if worker.sent == 2:
+                break
+            await asyncio.sleep(0.01)
+        await worker.stop()
+        return worker.sent
+
+    assert asyncio.run(scenario()) == 2
+
+
+def test_smtp_pool_reuses_connections():
+    """Messages sent one after another go over a single SMTP session."""
+    controller_module = pytest.importorskip("aiosmtpd.controller")
+
+    class Sink:
+        def __init__(self):
+            self.messages = []
+
+        async def handle_DATA(self, server, session, envelope):
+            self.messages.append(envelope.content)
+            return "250 OK"
+
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        port = probe.getsockname()[1]
+
+    sink = Sink()
+    controller = controller_module.Controller(sink, hostname="127.0.0.1", port=port)
+    controller.start()
+    try:
+        config = ConnectionConfig(
+            MAIL_USERNAME="", MAIL_PASSWORD="", MAIL_FROM="noreply@example.com", MAIL_FROM_NAME="Books",
+            MAIL_PORT=port, MAIL_SERVER="127.0.0.1", MAIL_STARTTLS=False, MAIL_SSL_TLS=False,
+            USE_CREDENTIALS=False, VALIDATE_CERTS=False,
+        )
+
+        async def scenario():
+            pool = SMTPConnectionPool(config, max_size=2)
+            for index in range(5):
+                await pool.send(build_email_message(["test@gmail.com"], f"Message {index}", "<p>hi</p>", config=config))
+            stats = pool.stats()
+            await pool.close()
+            return stats
+
+        stats = asyncio.run(scenario())
+    finally:
+        controller.stop()
+
+    assert len(sink.messages) == 5
+    assert stats["connections_opened"] == 1
+    assert stats["messages_sent"] == 5
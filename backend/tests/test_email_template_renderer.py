@@ -0,0 +1,50 @@
+from src.config.email_config import conf
+from src.utils.email_template_renderer import EmailTemplateRenderer
+
+
+CONTEXTS = {
+    "account-verification.html": {"app_name": "Books", "name": "Test User", "activate_url": "http://localhost:3000/activate/abc"},
+    "account-verification-confirmation.html": {"app_name": "Books", "name": "Test User", "login_url": "http://localhost:3000/login"},
+    "password-reset.html": {"app_name": "Books", "name": "Test User", "activate_url": "http://localhost:3000/reset/abc"},
+    "password-reset-confirmation.html": {
+        "app_name": "Books", "name": "Test User", "login_url": "http://localhost:3000/login", "support_team_email": "help@example.com",
+    },
+}
+
+
+def test_pre_rendered_segments_match_jinja(tmp_path):
+    """Every template renders exactly like fastapi-mail's environment, for several users in a row."""
+    renderer = EmailTemplateRenderer(conf.TEMPLATE_FOLDER, str(tmp_path))
+    assert renderer.load() == len(CONTEXTS)
+    reference = conf.template_engine()
+
+    for template_name, context in CONTEXTS.items():
+        for name in ("Test User", "Ann O'Neil & Co", "<b>bold</b>"):
+            user_context = {**context, "name": name}
+            assert renderer.render(template_name, user_context) == reference.get_template(template_name).render(**user_context)
+
+    assert len(renderer._segments) == len(CONTEXTS)
+    assert all(renderer._segments.values())
+    assert list(tmp_path.iterdir())
+
+
+def test_static_context_gets_its_own_segments(tmp_path):
+    """A different app name is pre-rendered separately instead of reusing the first one."""
+    renderer = EmailTemplateRenderer(conf.TEMPLATE_FOLDER, str(tmp_path))
+    context = CONTEXTS["account-verification.html"]
+
+    assert "Welcome to Books!" in renderer.render("account-verification.html", context)
+    assert "Welcome to Shelf!" in renderer.render("account-verification.html", {**context, "app_name": "Shelf"})
+    assert len(renderer._segments) == 2
+
+
+def test_templates_transforming_a_dynamic_field_fall_back_to_jinja(tmp_path):
+    """A filter on a dynamic field can't be pre-rendered, so the template is rendered in full."""
+    templates = tmp_path / "templates"
+    templates.mkdir()
+    (templates / "shout.html").write_text("<p>Hi {{ name | upper }} from {{ app_name }}</p>")
+    renderer = EmailTemplateRenderer(templates, str(tmp_path))
+
+    assert renderer.render("shout.html", {"app_name": "Books", "name": "ann"}) == "<p>Hi ANN from Books</p>"
+    assert renderer.render("shout.html", {"app_name": "Books", "name": "bob"}) == "<p>Hi BOB from Books</p>"
+    assert list(renderer._segments.values()) == [False]
@@ -0,0 +1,97 @@
+import re
+
+from unittest.mock import patch
+
+from src.utils import id_generator
+from src.utils.id_generator import SortableIdGenerator, new_id, new_ids
+
+
+CROCKFORD_ID = re.compile(r"^[0-9A-HJKMNP-TV-Z]{26}$")
+
+
+class FakeClock:
+    def __init__(self, milliseconds: int):
+        self.milliseconds = milliseconds
+
+    def __call__(self) -> int:
+        return self.milliseconds * 1_000_000
+
+
+def test_ids_are_url_safe_and_fixed_length():
+    """Every ID is 26 Crockford base32 characters."""
+    for key in SortableIdGenerator().generate_batch(1000):
+        assert CROCKFORD_ID.match(key)
+
+
+def test_encoding_matches_ulid_layout():
+    """The first 10 characters encode the millisecond timestamp, the last 16 the random part."""
+    assert id_generator._encode(0, 0) == "0" * 26
+    assert id_generator._encode(1, 0) == "0" * 9 + "1" + "0" * 16
+    assert id_generator._encode(0, 31) == "0" * 25 + "Z"
+    assert id_generator._encode((1 << 48) - 1, (1 << 80) - 1) == "7" + "Z" * 25
+
+
+def test_ids_sort_by_creation_time():
+    """IDs from a later millisecond sort after IDs from an earlier one, whatever their random part."""
+    clock = FakeClock(1_700_000_000_000)
+    generator = SortableIdGenerator(clock=clock)
+    earlier = generator.generate()
+    clock.milliseconds += 1
+    later = generator.generate()
+
+    assert earlier < later
+    assert earlier[:10] < later[:10]
+
+
+def test_ids_are_monotonic_within_a_millisecond():
+    """IDs from the same millisecond still increase, and never repeat."""
+    generator = SortableIdGenerator(clock=FakeClock(1_700_000_000_000))
+    keys = [generator.generate() for _ in range(1000)]
+
+    assert keys == sorted(keys)
+    assert len(set(keys)) == len(keys)
+    assert len({key[:10] for key in keys}) == 1
+
+
+def test_ids_stay_monotonic_when_the_clock_goes_back():
+    """A clock step backwards does not produce an ID that sorts before the previous one."""
+    clock = FakeClock(1_700_000_000_000)
+    generator = SortableIdGenerator(clock=clock)
+    first = generator.generate()
+    clock.milliseconds -= 5000
+
+    assert generator.generate() > first
+
+
+def test_random_part_overflow_moves_to_the_next_millisecond():
+    """If the random part cannot be incremented any more the timestamp is bumped instead."""
+    generator = SortableIdGenerator(clock=FakeClock(1_700_000_000_000))
+    with patch("src.utils.id_generator.secrets.token_bytes", return_value=b"\xff" * 10):
+        first = generator.generate()
+        second = generator.generate()
+
+    assert first < second
+    assert second[:10] > first[:10]
+
+
+def test_batch_is_ascending_and_reads_randomness_once():
+    """A batch is in ascending order and costs one call to the random source."""
+    generator = SortableIdGenerator(clock=FakeClock(1_700_000_000_000))
+    with patch("src.utils.id_generator.secrets.token_bytes", wraps=id_generator.secrets.token_bytes) as token_bytes:
+        keys = generator.generate_batch(500)
+
+    token_bytes.assert_called_once_with(10 * 500)
+    assert keys == sorted(keys)
+    assert len(set(keys)) == 500
+    assert generator.generate() > keys[-1]
+
+
+def test_new_id_follows_the_configured_strategy():
+    """"sortable" returns time-ordered IDs, "random" the legacy 20-character keys."""
+    with patch("src.utils.id_generator.ID_STRATEGY", "sortable"):
+        assert CROCKFORD_ID.match(new_id())
+        assert all(CROCKFORD_ID.match(key) for key in new_ids(3))
+
+    with patch("src.utils.id_generator.ID_STRATEGY", "random"):
+        assert re.match(r"^[A-Z0-9]{20}$", new_id())
+        assert [len(key) for key in new_ids(3)] == [20, 20, 20]
@@ -0,0 +1,169 @@
+import anyio
+import pytest
+from datetime import timedelta
+from fastapi import FastAPI, HTTPException
+from fastapi.testclient import TestClient
+from prometheus_client import REGISTRY
+from pymongo.monitoring import CommandFailedEvent, CommandStartedEvent, CommandSucceededEvent
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from main import app
+from src.config.email_config import conf
+from src.config.jwt_token import JWTManager
+from src.config.metrics import MetricsMiddleware, MongoCommandMetrics, StatsCollector
+from src.services.email_delivery_worker import EmailDeliveryWorker
+from src.services.email_outbox_services import EMAIL_FAILED
+
+
+MOCK_PAYLOAD = {"user_id": "QSGFEHJ4875YKFBKJHFK", "email": "test@gmail.com", "session_id": "1234"}
+
+
+def sample(name: str, **labels) -> float:
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+@pytest.fixture
+def metrics_app():
+    test_app = FastAPI()
+    test_app.add_middleware(MetricsMiddleware)
+
+    @test_app.get("/metrics-test/items/{item_id}")
+    def get_item(item_id: str):
+        if item_id == "missing":
+            raise HTTPException(status_code=404, detail="Not found")
+        return {"item_id": item_id}
+
+    @test_app.get("/metrics-test/crash")
+    def crash():
+        raise RuntimeError("boom")
+
+    return TestClient(test_app, raise_server_exceptions=False)
+
+
+def test_requests_are_labelled_with_the_route_template(metrics_app):
+    """Different ids of the same route share one series, labelled with the path template and status."""
+    route = "/metrics-test/items/{item_id}"
+    before_ok = sample("http_requests_total", method="GET", route=route, status="200")
+    before_missing = sample("http_requests_total", method="GET", route=route, status="404")
+    before_count = sample("http_request_duration_seconds_count", method="GET", route=route)
+
+    metrics_app.get("/metrics-test/items/1")
+    metrics_app.get("/metrics-test/items/2")
+    metrics_app.get("/metrics-test/items/missing")
+
+    assert sample("http_requests_total", method="GET", route=route, status="200") == before_ok + 2
+    assert sample("http_requests_total", method="GET", route=route, status="404") == before_missing + 1
+    assert sample("http_request_duration_seconds_count", method="GET", route=route) == before_count + 3
+    assert REGISTRY.get_sample_value("http_requests_total", {"method": "GET", "route": "/metrics-test/items/1", "status": "200"}) is None
+
+
+def test_unmatched_paths_and_errors_are_recorded(metrics_app):
+    """Unknown paths share the "unmatched" label and unhandled errors count as 500s."""
+    before_unmatched = sample("http_requests_total", method="GET", route="unmatched", status="404")
+    before_crash = sample("http_requests_total", method="GET", route="/metrics-test/crash", status="500")
+
+    metrics_app.get("/metrics-test/nowhere/123")
+    assert metrics_app.get("/metrics-test/crash").status_code == 500
+
+    assert sample("http_requests_total", method="GET", route="unmatched", status="404") == before_unmatched + 1
+    assert sample("http_requests_total", method="GET", route="/metrics-test/crash", status="500") == before_crash + 1
+    assert sample("http_requests_in_progress") == 0
+
+
+def test_unknown_methods_share_one_label(metrics_app):
+    """Arbitrary method tokens sent by a client are counted as "other" instead of creating new series."""
+    before = sample("http_requests_total", method="other", route="unmatched", status="404")
+
+    for index in range(3):
+        metrics_app.request(f"BREW{index}", "/metrics-test/nowhere")
+
+    assert sample("http_requests_total", method="other", route="unmatched", status="404") == before + 3
+    assert REGISTRY.get_sample_value("http_requests_total", {"method": "BREW0", "route": "unmatched", "status": "404"}) is None
+
+
+def test_metrics_endpoint_serves_the_text_format():
+    """/metrics answers in the Prometheus text format and is not recorded itself."""
+    response = TestClient(app).get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert "http_requests_in_progress" in response.text
+    assert "response_cache_hits" in response.text
+    assert 'route="/metrics"' not in response.text
+
+
+def test_mongo_commands_are_recorded_per_collection_and_command():
+    """The listener carries the collection from the started event to the finished one."""
+    listener = MongoCommandMetrics()
+    before_find = sample("mongodb_command_duration_seconds_count", collection="metrics_books", command="find")
+    before_more = sample("mongodb_command_duration_seconds_count", collection="metrics_books", command="getMore")
+    before_failures = sample("mongodb_command_failures_total", collection="metrics_books", command="insert")
+
+    listener.started(CommandStartedEvent({"find": "metrics_books", "filter": {}}, "db", 1, ("localhost", 27017), 1))
+    listener.succeeded(CommandSucceededEvent(timedelta(milliseconds=2), {"ok": 1}, "find", 1, ("localhost", 27017), 1))
+    listener.started(CommandStartedEvent({"getMore": 123, "collection": "metrics_books"}, "db", 2, ("localhost", 27017), 2))
+    listener.succeeded(CommandSucceededEvent(timedelta(milliseconds=1), {"ok": 1}, "getMore", 2, ("localhost", 27017), 2))
+    listener.started(CommandStartedEvent({"insert": "metrics_books", "documents": []}, "db", 3, ("localhost", 27017), 3))
+    listener.failed(CommandFailedEvent(timedelta(milliseconds=1), {"ok": 0}, "insert", 3, ("localhost", 27017), 3))
+
+    assert sample("mongodb_command_duration_seconds_count", collection="metrics_books", command="find") == before_find + 1
+    assert sample("mongodb_command_duration_seconds_count", collection="metrics_books", command="getMore") == before_more + 1
+    assert sample("mongodb_command_failures_total", collection="metrics_books", command="insert") == before_failures + 1
+    assert listener._collections == {}
+
+
+def test_client_pool_registers_the_command_listener():
+    """The shared MongoClient is created with the metrics listener."""
+    from src.config.database import MongoDBConnection
+    from src.config.metrics import mongo_command_metrics
+
+    with patch("src.config.database.MongoClient") as MockClient:
+        MongoDBConnection.close_client_pool()
+        MongoDBConnection.create_client_pool("mongodb://localhost:27017")
+        MongoDBConnection.close_client_pool()
+
+    assert MockClient.call_args.kwargs["event_listeners"] == [mongo_command_metrics]
+
+
+def test_stats_sources_become_gauges():
+    """Numeric and boolean figures are exported, other values are skipped and a failing source is ignored."""
+    collector = StatsCollector()
+    collector.register("test_source", lambda: {"hits": 3, "enabled": True, "backend": "memory"})
+    collector.register("broken_source", MagicMock(side_effect=RuntimeError("down")))
+
+    families = {family.name: family.samples[0].value for family in collector.collect()}
+
+    assert families == {"test_source_hits": 3.0, "test_source_enabled": 1.0}
+
+
+def test_jwt_operations_are_timed():
+    """Signing and verifying a token are both observed."""
+    before_encode = sample("jwt_duration_seconds_count", operation="encode")
+    before_decode = sample("jwt_duration_seconds_count", operation="decode")
+    manager = JWTManager()
+    manager.verify_cache_enabled = False
+
+    manager.decode_token(manager.create_access_token(dict(MOCK_PAYLOAD)), is_refresh=False)
+
+    assert sample("jwt_duration_seconds_count", operation="encode") == before_encode + 1
+    assert sample("jwt_duration_seconds_count", operation="decode") == before_decode + 1
+
+
+def test_email_delivery_outcomes_are_counted():
+    """Sent and permanently failed deliveries are counted by outcome."""
+    outbox = MagicMock(mark_sent=AsyncMock(), mark_failed=AsyncMock(return_value=EMAIL_FAILED))
+    smtp_pool = MagicMock(send=AsyncMock(), config=conf)
+    worker = EmailDeliveryWorker(outbox=outbox, smtp_pool=smtp_pool)
+    message = {
+        "message_id": "METRICS1", "recipients": ["test@gmail.com"], "subject": "Hi", "attempts": 1,
+        "template_name": "account-verification.html", "context": {"app_name": "App", "name": "Test", "activate_url": "http://x"},
+    }
+    before_sent = sample("email_deliveries_total", outcome="sent")
+    before_failed = sample("email_deliveries_total", outcome="failed")
+
+    anyio.run(worker.deliver, message)
+    smtp_pool.send.side_effect = RuntimeError("rejected")
+    anyio.run(worker.deliver, message)
+
+    assert sample("email_deliveries_total", outcome="sent") == before_sent + 1
+    assert sample("email_deliveries_total", outcome="failed") == before_failed + 1
@@ -0,0 +1,81 @@
+import threading
+
+import anyio
+import pytest
+from fastapi import HTTPException
+
+import src.config.security as security
+from src.config.security import PasswordManager, PasswordHashingPool
+
+
+@pytest.fixture
+def hashing_pool():
+    """Swap in a small thread pool for the duration of a test."""
+    original_pool = security.password_hashing_pool
+    security.password_hashing_pool = PasswordHashingPool("thread", max_workers=2)
+    yield security.password_hashing_pool
+    security.password_hashing_pool.shutdown()
+    security.password_hashing_pool = original_pool
+
+
+def test_async_hash_and_verify_round_trip(hashing_pool):
+    """Hashing through the pool produces a hash the pool can verify."""
+    async def hash_and_verify():
+        hashed_password = await PasswordManager.encode_and_hash_password_async("StrongP@ssw0rd")
+        return (
+            await PasswordManager.verify_password_async("StrongP@ssw0rd", hashed_password),
+            await PasswordManager.verify_password_async("WrongP@ssw0rd", hashed_password),
+        )
+
+    assert anyio.run(hash_and_verify) == (True, False)
+    assert hashing_pool.stats()["completed"] == 3
+
+
+def test_pool_runs_work_off_the_event_loop(hashing_pool):
+    """The hashed function runs in a pool thread, not on the loop thread."""
+    async def run():
+        return await hashing_pool.run(threading.get_ident), threading.get_ident()
+
+    worker_thread, loop_thread = anyio.run(run)
+
+    assert worker_thread != loop_thread
+
+
+def test_pool_rejects_calls_when_queue_is_full():
+    """Calls beyond workers + queue are refused with 503 and counted."""
+    pool = PasswordHashingPool("thread", max_workers=1, max_queue=1)
+    release = threading.Event()
+
+    async def storm():
+        results = []
+
+        async def call():
+            try:
+                await pool.run(release.wait, 5)
+                results.append("done")
+            except HTTPException as e:
+                results.append(e.status_code)
+
+        async with anyio.create_task_group() as task_group:
+            for _ in range(3):
+                task_group.start_soon(call)
+            await anyio.sleep(0.1)
+            release.set()
+        return results
+
+    results = anyio.run(storm)
+    pool.shutdown()
+
+    assert sorted(results, key=str) == [503, "done", "done"]
+    assert pool.stats()["rejected"] == 1
+    assert pool.stats()["max_queue_depth"] == 1
+
+
+def test_hash_uses_requested_cost():
+    """The cost factor is stored in the hash and drives needs_rehash."""
+    hashed_password = PasswordManager.encode_and_hash_password("StrongP@ssw0rd", rounds=4)
+
+    assert PasswordManager.get_hash_rounds(hashed_password) == 4
+    assert PasswordManager.needs_rehash(hashed_password, rounds=4) is False
+    assert PasswordManager.needs_rehash(hashed_password, rounds=5) is True
+    assert PasswordManager.needs_rehash("not-a-bcrypt-hash", rounds=5) is False
@@ -0,0 +1,109 @@
+import anyio
+import pytest
+from fastapi.testclient import TestClient
+from unittest.mock import patch, MagicMock
+
+from main import app
+from src.config.database import AsyncCollection
+from src.config.session_cache import session_cache
+from src.config.response_cache import response_cache
+
+
+MOCK_PAYLOAD = {"user_id": "QSGFEHJ4875YKFBKJHFK", "email": "test@gmail.com", "session_id": "1234"}
+MOCK_BOOK = {
+    "user_id": MOCK_PAYLOAD["user_id"],
+    "book_id": "BOOK",
+    "category": "Fiction",
+    "book_title": "Title",
+    "book_author": "Author",
+    "book_price": 10.5,
+    "publisher": "Publisher",
+    "published_date": "2020-01-01",
+    "page_count": 100,
+    "language": "English",
+    "book_rating": 4.5,
+    "book_image": "https://example.com/image.png",
+    "created_at": "2024-01-01 00:00:00",
+    "updated_at": "2024-01-01 00:00:00",
+}
+BOOK_PAYLOAD = {key: value for key, value in MOCK_BOOK.items() if key not in ("user_id", "book_id", "created_at", "updated_at")}
+
+PROTECTED_ROUTES = [
+    ("post", "/api/v1/book/add-book", BOOK_PAYLOAD),
+    ("get", "/api/v1/book/all-books", None),
+    ("get", "/api/v1/book/all-books?category=Fiction&min_price=5&sort_by=book_price&order=desc", None),
+    ("get", "/api/v1/book/export-books", None),
+    ("get", "/api/v1/book/search?q=title", None),
+    ("get", "/api/v1/book/stats", None),
+    ("get", "/api/v1/book/one-book/BOOK", None),
+    ("put", "/api/v1/book/update-book/BOOK", BOOK_PAYLOAD),
+    ("delete", "/api/v1/book/delete-book/BOOK", None),
+    ("post", "/api/v1/book/bulk/add-books", {"books": [BOOK_PAYLOAD]}),
+    ("put", "/api/v1/book/bulk/update-books", {"books": [{**BOOK_PAYLOAD, "book_id": "BOOK"}]}),
+    ("post", "/api/v1/book/bulk/delete-books", {"book_ids": ["BOOK"]}),
+    ("post", "/api/v1/user/renew-access-token", None),
+]
+
+
+@pytest.fixture
+def mock_collections():
+    """Serve one pymongo collection mock per collection name to every controller and dependency."""
+    collections = {}
+
+    def get_async_collection(self, collection_name):
+        if collection_name not in collections:
+            collection = MagicMock()
+            collection.find_one.return_value = dict(MOCK_BOOK)
+            collection.find_one_and_update.return_value = dict(MOCK_BOOK)
+            collection.find_one_and_delete.return_value = dict(MOCK_BOOK)
+            collection.find.return_value.sort.return_value = collection.find.return_value
+            collection.find.return_value.batch_size.return_value = collection.find.return_value
+            collections[collection_name] = collection
+        return AsyncCollection(collections[collection_name], anyio.CapacityLimiter(4))
+
+    collections["user_sessions"] = MagicMock()
+    collections["user_sessions"].find_one.return_value = {"session_id": "1234", "user_id": MOCK_PAYLOAD["user_id"]}
+    collections["refresh_tokens"] = MagicMock()
+    collections["refresh_tokens"].find_one.return_value = {"refresh_token": "refresh-token"}
+
+    # The session cache is disabled so a second validation would show up as a second lookup
+    with patch.object(session_cache, "enabled", False), \
+         patch.object(response_cache, "enabled", False), \
+         patch("src.config.database.MongoDBConnection.get_async_collection", get_async_collection), \
+         patch("src.config.database.MongoDBConnection.start_connection"), \
+         patch("src.config.jwt_token.JWTManager.decode_token", side_effect=lambda token, is_refresh: dict(MOCK_PAYLOAD)):
+        yield collections
+
+
+@pytest.mark.parametrize("method, path, payload", PROTECTED_ROUTES)
+def test_protected_route_looks_up_session_once(mock_collections, method, path, payload):
+    """Each protected request validates its token once: exactly one session lookup."""
+    client = TestClient(app)
+
+    response = client.request(method, path, json=payload, headers={"Authorization": "Bearer token"})
+
+    assert response.status_code < 400, response.text
+    assert mock_collections["user_sessions"].find_one.call_count == 1
+
+
+def test_all_books_rejects_inverted_ranges(mock_collections):
+    """A minimum above its maximum is a validation error, not a query that silently matches nothing."""
+    client = TestClient(app)
+
+    response = client.get("/api/v1/book/all-books?min_price=20&max_price=10", headers={"Authorization": "Bearer token"})
+
+    assert response.status_code == 422
+    assert "min_price" in response.text
+
+
+def test_one_book_conditional_get(mock_collections):
+    """The ETag of a book can be sent back in If-None-Match to get an empty 304."""
+    client = TestClient(app)
+    headers = {"Authorization": "Bearer token"}
+
+    response = client.get("/api/v1/book/one-book/BOOK", headers=headers)
+    not_modified = client.get("/api/v1/book/one-book/BOOK", headers={**headers, "If-None-Match": response.headers["etag"]})
+
+    assert response.status_code == 200
+    assert not_modified.status_code == 304
+    assert not_modified.content == b""
@@ -0,0 +1,68 @@
+import json
+
+import bson
+import orjson
+import pytest
+from bson.raw_bson import RawBSONDocument
+
+from src.serializers.book_serializer import book_data
+from src.serializers.raw_book_serializer import raw_book_json, raw_books_json
+
+
+def make_book(**overrides) -> dict:
+    """Build a stored book document in `book_data` field order."""
+    book = {
+        "user_id": "QSGFEHJ4875YKFBKJHFK",
+        "book_id": "A",
+        "category": "Fiction",
+        "book_title": "Title",
+        "book_author": "Author",
+        "book_price": 10.5,
+        "publisher": "Publisher",
+        "published_date": "2020-01-01",
+        "page_count": 100,
+        "language": "English",
+        "book_rating": 4.5,
+        "book_image": "https://example.com/image.png",
+        "created_at": "2024-01-01 00:00:00",
+        "updated_at": "2024-01-01 00:00:00",
+    }
+    book.update(overrides)
+    return book
+
+
+@pytest.mark.parametrize("overrides", [
+    {},
+    {"book_title": 'Quote " and \\ backslash\nnewline\ttab\x01'},
+    {"book_author": "Gabriel García Márquez 🦜"},
+    {"category": None, "language": None},
+    {"page_count": 2 ** 40, "book_price": 0.1, "book_rating": -0.0},
+    {"book_price": 19, "book_rating": 1e-7},
+])
+def test_raw_book_json_matches_dict_path(overrides):
+    """Raw BSON serialization produces the same bytes as decoding, `book_data` and orjson."""
+    book = make_book(**overrides)
+    raw = bson.encode(book)
+
+    assert raw_book_json(raw) == orjson.dumps(book_data(bson.decode(raw)))
+
+
+def test_raw_book_json_turns_non_finite_floats_into_null():
+    """NaN and infinity are not valid JSON and are written as null, like orjson does."""
+    raw = bson.encode({"book_price": float("nan"), "book_rating": float("inf")})
+
+    assert json.loads(raw_book_json(raw)) == {"book_price": None, "book_rating": None}
+
+
+def test_raw_book_json_rejects_unsupported_types():
+    """Nested documents are not part of a book and are refused instead of silently dropped."""
+    with pytest.raises(ValueError):
+        raw_book_json(bson.encode({"book_title": "Title", "nested": {"a": 1}}))
+
+
+def test_raw_books_json_builds_an_array():
+    """Raw documents are joined into one JSON array."""
+    documents = [RawBSONDocument(bson.encode(make_book(book_id=book_id))) for book_id in ("A", "B")]
+
+    assert [book["book_id"] for book in json.loads(raw_books_json(documents))] == ["A", "B"]
+    assert raw_books_json([]) == b"[]"
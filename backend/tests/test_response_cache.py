@@ -0,0 +1,156 @@
+import os
+
+import anyio
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from src.config.env_setting import Settings
+from src.config.response_cache import CachedResponse, InMemoryResponseCacheBackend, RedisResponseCacheBackend, ResponseCache
+
+
+def response(size: int = 10, etag: str = '"tag"') -> CachedResponse:
+    return CachedResponse(b"x" * size, etag)
+
+
+def test_memory_backend_is_bounded_by_entries_and_bytes():
+    """The least recently used entries are evicted when either bound is exceeded."""
+    async def scenario():
+        backend = InMemoryResponseCacheBackend(max_entries=2, max_bytes=1000, ttl_seconds=60)
+        await backend.set("user", "a", response(), 0)
+        await backend.set("user", "b", response(), 0)
+        await backend.get("user", "a")
+        await backend.set("user", "c", response(), 0)
+        assert await backend.get("user", "b") is None
+        assert await backend.get("user", "a") is not None
+
+        small = InMemoryResponseCacheBackend(max_entries=100, max_bytes=50, ttl_seconds=60)
+        await small.set("user", "a", response(20), 0)
+        await small.set("user", "b", response(20), 0)
+        assert await small.get("user", "a") is None
+        assert small.stats()["bytes"] <= 50
+        assert await small.set("user", "huge", response(100), 0) is False
+
+    anyio.run(scenario)
+
+
+def test_memory_backend_invalidates_one_user_and_rejects_stale_writes():
+    """Invalidation drops exactly the user's entries and refuses responses computed before it."""
+    async def scenario():
+        backend = InMemoryResponseCacheBackend(max_entries=100, max_bytes=10000, ttl_seconds=60)
+        generation = await backend.generation("alice")
+        await backend.set("alice", "page", response(), generation)
+        await backend.set("bob", "page", response(), await backend.generation("bob"))
+
+        assert await backend.invalidate_user("alice") == 1
+        assert await backend.get("alice", "page") is None
+        assert await backend.get("bob", "page") is not None
+
+        # A read that started before the invalidation must not repopulate the cache
+        assert await backend.set("alice", "page", response(), generation) is False
+        assert await backend.set("alice", "page", response(), await backend.generation("alice")) is True
+
+    anyio.run(scenario)
+
+
+def test_memory_backend_bounds_generations_without_stale_writes():
+    """Generations are dropped with their users' entries, yet a response computed before an invalidation is refused."""
+    async def scenario():
+        backend = InMemoryResponseCacheBackend(max_entries=2, max_bytes=10000, ttl_seconds=60)
+        generation = await backend.generation("alice")
+        await backend.invalidate_user("alice")
+        for index in range(100):
+            user = f"user-{index}"
+            await backend.set(user, "page", response(), await backend.generation(user))
+            await backend.invalidate_user(user)
+            await backend.set(user, "page", response(), await backend.generation(user))
+
+        assert backend.stats()["tracked_generations"] <= 2
+        assert await backend.set("alice", "list", response(), generation) is False
+
+        # A user whose entries were evicted falls back to the floor, which a stale read can never match
+        carol = await backend.generation("carol")
+        await backend.set("carol", "page", response(), carol)
+        await backend.invalidate_user("carol")
+        await backend.set("carol", "page", response(), await backend.generation("carol"))
+        await backend.set("dave", "page", response(), await backend.generation("dave"))
+        await backend.set("erin", "page", response(), await backend.generation("erin"))
+        assert await backend.get("carol", "page") is None
+        assert await backend.set("carol", "page", response(), carol) is False
+        assert await backend.set("carol", "page", response(), await backend.generation("carol")) is True
+
+    anyio.run(scenario)
+
+
+def test_response_cache_reports_hit_ratio():
+    """Hits and misses are counted for the hit ratio."""
+    async def scenario():
+        cache = ResponseCache(backend=InMemoryResponseCacheBackend(100, 10000, 60))
+        await cache.get("user", "page")
+        await cache.set("user", "page", response(), await cache.generation("user"))
+        await cache.get("user", "page")
+        await cache.get("user", "page")
+        return cache.stats()
+
+    stats = anyio.run(scenario)
+
+    assert (stats["hits"], stats["misses"], stats["stores"]) == (2, 1, 1)
+    assert stats["hit_ratio"] == pytest.approx(2 / 3)
+    assert stats["backend"] == "memory"
+
+
+def test_response_cache_treats_backend_errors_as_misses():
+    """A failing backend never fails the read; invalidation listeners still run."""
+    backend = MagicMock()
+    backend.get = AsyncMock(side_effect=ConnectionError("down"))
+    backend.invalidate_user = AsyncMock(side_effect=ConnectionError("down"))
+    backend.stats.return_value = {}
+    cache = ResponseCache(backend=backend)
+    listener = MagicMock()
+    cache.add_invalidation_listener(listener)
+
+    assert anyio.run(cache.get, "user", "page") is None
+    anyio.run(cache.invalidate, "user")
+
+    assert cache.stats()["errors"] == 2
+    listener.assert_called_once_with("user")
+
+
+def test_response_cache_can_be_disabled():
+    """RESPONSE_CACHE_BACKEND=none turns every call into a no-op."""
+    config = Settings()
+    config.RESPONSE_CACHE_BACKEND = "none"
+    cache = ResponseCache(config)
+
+    anyio.run(cache.set, "user", "page", response(), 0)
+
+    assert cache.enabled is False
+    assert anyio.run(cache.get, "user", "page") is None
+
+
+def test_redis_backend_against_a_local_server():
+    """The shared backend behaves like the in-memory one (needs a Redis-compatible server at RESPONSE_CACHE_TEST_URL)."""
+    redis_asyncio = pytest.importorskip("redis.asyncio")
+    url = os.getenv("RESPONSE_CACHE_TEST_URL", "redis://localhost:6379/15")
+
+    async def scenario():
+        client = redis_asyncio.from_url(url, socket_connect_timeout=1)
+        try:
+            await client.ping()
+        except Exception:
+            await client.aclose()
+            pytest.skip(f"No Redis-compatible server at {url}")
+
+        backend = RedisResponseCacheBackend(url, ttl_seconds=60, client=client, prefix="books-cache-test")
+        try:
+            generation = await backend.generation("alice")
+            assert await backend.set("alice", "page", response(), generation) is True
+            assert await backend.get("alice", "page") == response()
+
+            await backend.invalidate_user("alice")
+            assert await backend.get("alice", "page") is None
+            assert await backend.set("alice", "page", response(), generation) is False
+        finally:
+            await backend.clear()
+            await backend.close()
+
+    anyio.run(scenario)
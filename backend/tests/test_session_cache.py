@@ -0,0 +1,91 @@
+import anyio
+import pytest
+from unittest.mock import patch, MagicMock
+from fastapi.security import HTTPAuthorizationCredentials
+
+from src.config.database import AsyncCollection
+from src.config.env_setting import Settings
+from src.config.session_cache import SessionCache, session_cache
+from src.dependencies.user_auth_dependency import TokenValidator
+from src.utils.ttl_cache import TTLCache
+
+
+MOCK_PAYLOAD = {"user_id": "QSGFEHJ4875YKFBKJHFK", "email": "test@gmail.com", "session_id": "1234"}
+
+
+def test_ttl_cache_evicts_least_recently_used():
+    """The oldest untouched entry is evicted once the cache is full."""
+    cache = TTLCache(max_size=2, ttl_seconds=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.stats()["evictions"] == 1
+
+
+def test_ttl_cache_expires_entries():
+    """Entries are not served after their TTL."""
+    cache = TTLCache(max_size=2, ttl_seconds=60)
+    with patch("src.utils.ttl_cache.time.monotonic", return_value=1000.0):
+        cache.set("a", 1)
+    with patch("src.utils.ttl_cache.time.monotonic", return_value=1061.0):
+        assert cache.get("a") is None
+
+    assert cache.stats()["expirations"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_session_cache_ttl_is_capped_below_access_expiry():
+    """A long configured TTL is capped well below the access token lifetime."""
+    config = Settings()
+    config.SESSION_CACHE_TTL_SECONDS = 3600
+    config.JWT_ACCESS_EXPIRY_MINUTES = 15
+
+    assert SessionCache(config).ttl_seconds == 90
+
+
+def test_session_cache_invalidation_notifies_listeners():
+    """Local invalidation drops the entry and calls the cross-worker hook; remote invalidation does not echo."""
+    cache = SessionCache()
+    listener = MagicMock()
+    cache.add_invalidation_listener(listener)
+    cache.set("1234", {"session_id": "1234"})
+
+    cache.invalidate("1234")
+    cache.invalidate("5678", propagate=False)
+
+    assert cache.get("1234") is None
+    listener.assert_called_once_with("1234")
+
+
+@pytest.fixture
+def mock_sessions():
+    """Serve a mocked user_sessions collection to TokenValidator."""
+    session_cache.clear()
+    collection = MagicMock()
+    collection.find_one.return_value = {"session_id": "1234", "user_id": MOCK_PAYLOAD["user_id"]}
+    with patch("src.dependencies.user_auth_dependency.MongoDBConnection.get_async_collection",
+               return_value=AsyncCollection(collection, anyio.CapacityLimiter(2))), \
+         patch("src.dependencies.user_auth_dependency.MongoDBConnection.start_connection"), \
+         patch("src.dependencies.user_auth_dependency.JWTManager.decode_token", return_value=dict(MOCK_PAYLOAD)):
+        yield collection
+    session_cache.clear()
+
+
+def test_token_validator_reads_session_from_cache(mock_sessions):
+    """After the first validation, the same session is served without a database lookup."""
+    validator = TokenValidator(is_refresh=False)
+    credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials="token")
+
+    anyio.run(validator, credentials)
+    anyio.run(validator, credentials)
+
+    assert mock_sessions.find_one.call_count == 1
+
+    session_cache.invalidate("1234")
+    anyio.run(validator, credentials)
+
+    assert mock_sessions.find_one.call_count == 2
@@ -0,0 +1,68 @@
+import anyio
+import pytest
+from fastapi import BackgroundTasks
+from unittest.mock import patch, MagicMock
+
+import src.config.security as security
+from src.config.database import AsyncCollection
+from src.config.security import PasswordManager, PasswordHashingPool
+from src.controllers.user_controller import UserControllersClass
+
+
+MOCK_PASSWORD = "StrongP@ssw0rd"
+
+
+@pytest.fixture
+def mock_collection():
+    """A pymongo collection mock served to the controller through AsyncCollection."""
+    original_pool = security.password_hashing_pool
+    security.password_hashing_pool = PasswordHashingPool("thread", max_workers=2)
+
+    collection = MagicMock()
+    with patch.object(UserControllersClass, "_get_collection", return_value=AsyncCollection(collection, anyio.CapacityLimiter(4))), \
+         patch.object(UserControllersClass, "_start_connection"):
+        yield collection
+
+    security.password_hashing_pool.shutdown()
+    security.password_hashing_pool = original_pool
+
+
+def make_user(hashed_password: str) -> dict:
+    """Build a stored, verified user document."""
+    return {
+        "user_id": "QSGFEHJ4875YKFBKJHFK",
+        "name": "Test User",
+        "email": "test@gmail.com",
+        "password": hashed_password,
+        "is_verified": True,
+    }
+
+
+def test_login_rehashes_outdated_cost_after_response(mock_collection):
+    """A hash with an outdated cost is replaced in a background task, guarded by the old hash."""
+    old_hash = PasswordManager.encode_and_hash_password(MOCK_PASSWORD, rounds=4)
+    mock_collection.find_one.return_value = make_user(old_hash)
+    background_tasks = BackgroundTasks()
+
+    with patch("src.config.security.Config.BCRYPT_ROUNDS", 5):
+        response = anyio.run(UserControllersClass().login_user, {"email": "test@gmail.com", "password": MOCK_PASSWORD}, background_tasks)
+        assert response.status_code == 200
+        mock_collection.update_one.assert_not_called()
+
+        anyio.run(background_tasks)
+
+    query, update = mock_collection.update_one.call_args.args
+    assert query == {"user_id": "QSGFEHJ4875YKFBKJHFK", "password": old_hash}
+    assert PasswordManager.get_hash_rounds(update["$set"]["password"]) == 5
+    assert PasswordManager.verify_password(MOCK_PASSWORD, update["$set"]["password"])
+
+
+def test_login_keeps_hash_with_current_cost(mock_collection):
+    """No rehash is scheduled when the stored cost matches the configured one."""
+    mock_collection.find_one.return_value = make_user(PasswordManager.encode_and_hash_password(MOCK_PASSWORD, rounds=4))
+    background_tasks = BackgroundTasks()
+
+    with patch("src.config.security.Config.BCRYPT_ROUNDS", 4):
+        anyio.run(UserControllersClass().login_user, {"email": "test@gmail.com", "password": MOCK_PASSWORD}, background_tasks)
+
+    assert background_tasks.tasks == []
@@ -0,0 +1,66 @@
+import pytest
+from fastapi import HTTPException
+from unittest.mock import patch
+
+from src.config.jwt_token import JWTManager, verified_token_cache
+
+
+MOCK_PAYLOAD = {"user_id": "QSGFEHJ4875YKFBKJHFK", "email": "test@gmail.com", "session_id": "1234"}
+
+
+@pytest.fixture
+def jwt_manager():
+    """A JWTManager with the verified-token cache enabled and emptied."""
+    verified_token_cache.clear()
+    manager = JWTManager()
+    manager.verify_cache_enabled = True
+    yield manager
+    verified_token_cache.clear()
+
+
+def test_repeated_decode_skips_signature_check(jwt_manager):
+    """The second decode of the same token is served from the cache."""
+    token = jwt_manager.create_access_token(dict(MOCK_PAYLOAD))
+
+    with patch("src.config.jwt_token.jwt.decode", wraps=__import__("jwt").decode) as decode_spy:
+        first = jwt_manager.decode_token(token, is_refresh=False)
+        second = jwt_manager.decode_token(token, is_refresh=False)
+
+    assert first == second
+    assert first["user_id"] == MOCK_PAYLOAD["user_id"]
+    assert decode_spy.call_count == 1
+
+
+def test_tampered_token_never_hits(jwt_manager):
+    """A modified token has a different digest and fails verification."""
+    token = jwt_manager.create_access_token(dict(MOCK_PAYLOAD))
+    jwt_manager.decode_token(token, is_refresh=False)
+
+    tampered = token[:-2] + ("AA" if token[-2:] != "AA" else "BB")
+    with pytest.raises(HTTPException) as excinfo:
+        jwt_manager.decode_token(tampered, is_refresh=False)
+
+    assert excinfo.value.status_code == 401
+
+
+def test_access_token_is_not_accepted_as_refresh_token(jwt_manager):
+    """Entries are scoped to the secret they were verified with."""
+    token = jwt_manager.create_access_token(dict(MOCK_PAYLOAD))
+    jwt_manager.decode_token(token, is_refresh=False)
+
+    with pytest.raises(HTTPException):
+        jwt_manager.decode_token(token, is_refresh=True)
+
+
+def test_expired_token_never_hits(jwt_manager):
+    """Once the token's exp has passed the cached payload is ignored and verification reports expiry."""
+    token = jwt_manager.create_access_token(dict(MOCK_PAYLOAD))
+    payload = jwt_manager.decode_token(token, is_refresh=False)
+
+    with patch("src.config.jwt_token.time.time", return_value=payload["exp"] + 1), \
+         patch("jwt.api_jwt.datetime") as mock_datetime:
+        mock_datetime.now.return_value.timestamp.return_value = payload["exp"] + 1
+        with pytest.raises(HTTPException) as excinfo:
+            jwt_manager.decode_token(token, is_refresh=False)
+
+    assert excinfo.value.detail == "Token has expired!"
@@ -0,0 +1,10 @@
+import AuthService from "./auth.service";
+
+// Authorization header for the protected API routes, empty when nobody is logged in
+export default function authHeader() {
+  const user = AuthService.getCurrentUser();
+  if (user && user.jwt_access_token) {
+    return { Authorization: `Bearer ${user.jwt_access_token}` };
+  }
+  return {};
+}
@@ -1,10 +1,29 @@
 import axios from "axios";
+import { BASE_URL } from "../utils/baseurl.util";
+import authHeader from "./auth-header";
 
-// const API_URL = `${BASE_URL}/api/v1/book`;
 const API_URL = "http://localhost:5000/api/v1/user";
+const BOOK_API_URL = `${BASE_URL}/api/v1/book`;
 
-const getPublicContent = () => {
-  return axios.get(API_URL + "/all-books");
+// Largest page the API serves (BOOK_PAGE_MAX_LIMIT on the backend)
+const BOOK_PAGE_LIMIT = 500;
+
+// `/all-books` returns one page at a time: follow `next_cursor` until it is null so callers
+// still receive every book in a single response, as before the listing was paginated.
+const getPublicContent = async () => {
+  const books = [];
+  let after = null;
+  let response;
+  do {
+    response = await axios.get(BOOK_API_URL + "/all-books", {
+      headers: authHeader(),
+      params: after ? { limit: BOOK_PAGE_LIMIT, after } : { limit: BOOK_PAGE_LIMIT },
+    });
+    books.push(...(response.data.books || []));
+    after = response.data.next_cursor || null;
+  } while (after);
+
+  return { ...response, data: { ...response.data, books, has_more: false, next_cursor: null } };
 };
 
 const getUserBoard = () => {